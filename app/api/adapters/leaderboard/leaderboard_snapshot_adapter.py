@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from typing import List
+
+from api.adapters.leaderboard.read_leaderboard_adapter import ReadLeaderboardAdapter
+from api.schemas.leaderboard.leaderboard_snapshot_schema import *
+from domain.entities.leaderboard_snapshot import LeaderboardSnapshot
+
+
+class LeaderboardSnapshotAdapter:
+    """
+    Class with static methods used for converting between request times and
+    leaderboard snapshots and their responses
+    """
+
+    @staticmethod
+    def to_timestamp(value: datetime) -> int:
+        """Convert a request time to milliseconds, times without a timezone are UTC"""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+
+    @staticmethod
+    def to_snapshot_response(snapshot: LeaderboardSnapshot) -> LeaderboardSnapshotResponse:
+        return LeaderboardSnapshotResponse(
+            taken_at=datetime.fromtimestamp(snapshot.taken_at / 1000, tz=timezone.utc),
+            users=[
+                ReadLeaderboardAdapter.to_entry_response(entry, position + 1)
+                for position, entry in enumerate(snapshot.users)
+            ],
+            groups=[
+                ReadLeaderboardAdapter.to_entry_response(entry, position + 1)
+                for position, entry in enumerate(snapshot.groups)
+            ],
+            user_count=snapshot.user_count,
+            group_count=snapshot.group_count,
+        )
+
+    @staticmethod
+    def to_snapshots_response(snapshots: List[LeaderboardSnapshot]) -> LeaderboardSnapshotsResponse:
+        return LeaderboardSnapshotsResponse(
+            snapshots=[LeaderboardSnapshotAdapter.to_snapshot_response(snapshot) for snapshot in snapshots]
+        )
@@ -0,0 +1,65 @@
+from typing import Optional, Union
+
+from api.schemas.leaderboard.read_leaderboard_schema import *
+from domain.entities.leaderboard import Leaderboard, LeaderboardDiff, LeaderboardRank
+from domain.entities.leaderboard_entry import LeaderboardEntry
+
+
+class ReadLeaderboardAdapter:
+    """
+    Class with static methods used for converting domain objects to response
+    for the leaderboard endpoint
+    """
+
+    @staticmethod
+    def to_entry_response(entry: LeaderboardEntry, rank: int) -> LeaderboardEntryResponse:
+        return LeaderboardEntryResponse(
+            id=entry.entry_id,
+            name=entry.name,
+            color=entry.color,
+            score=entry.score,
+            rank=rank
+        )
+
+    @staticmethod
+    def to_rank_response(rank: Optional[LeaderboardRank]) -> Optional[LeaderboardEntryResponse]:
+        if rank is None:
+            return None
+        return ReadLeaderboardAdapter.to_entry_response(rank.entry, rank.rank)
+
+    @staticmethod
+    def to_get_leaderboard_response(leaderboard: Leaderboard) -> GetLeaderboardResponse:
+        return GetLeaderboardResponse(
+            users=[
+                ReadLeaderboardAdapter.to_entry_response(entry, position + 1)
+                for position, entry in enumerate(leaderboard.top_users)
+            ],
+            groups=[
+                ReadLeaderboardAdapter.to_entry_response(entry, position + 1)
+                for position, entry in enumerate(leaderboard.top_groups)
+            ],
+            user_count=leaderboard.user_count,
+            group_count=leaderboard.group_count,
+            me=ReadLeaderboardAdapter.to_rank_response(leaderboard.user_rank),
+            my_group=ReadLeaderboardAdapter.to_rank_response(leaderboard.group_rank),
+        )
+
+    @staticmethod
+    def to_leaderboard_diff_response(diff: LeaderboardDiff) -> LeaderboardDiffResponse:
+        return LeaderboardDiffResponse(
+            users=[ReadLeaderboardAdapter.to_rank_response(rank) for rank in diff.users],
+            groups=[ReadLeaderboardAdapter.to_rank_response(rank) for rank in diff.groups],
+            removed_users=diff.removed_users,
+            removed_groups=diff.removed_groups,
+            me=ReadLeaderboardAdapter.to_rank_response(diff.user_rank),
+            my_group=ReadLeaderboardAdapter.to_rank_response(diff.group_rank),
+        )
+
+    @staticmethod
+    def to_server_sent_event(update: Union[Leaderboard, LeaderboardDiff]) -> str:
+        """Convert a stream update to a Server-Sent Event: `snapshot` for the first one, then `diff`"""
+        if isinstance(update, Leaderboard):
+            event, data = "snapshot", ReadLeaderboardAdapter.to_get_leaderboard_response(update)
+        else:
+            event, data = "diff", ReadLeaderboardAdapter.to_leaderboard_diff_response(update)
+        return f"event: {event}\ndata: {data.model_dump_json()}\n\n"
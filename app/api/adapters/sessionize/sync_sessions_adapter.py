@@ -1,5 +1,6 @@
 from api.schemas.sessionize.sync_sessions_schema import SessionResponse, SyncSessionsResponse
 from domain.entities.session import Session
+from domain.entities.session_sync import SessionSync
 
 
 class SyncSessionsAdapter:
@@ -21,13 +22,14 @@ class SyncSessionsAdapter:
         )
 
     @staticmethod
-    def to_sync_sessions_response(sessions: list[Session]) -> SyncSessionsResponse:
-        """Convert list of Session domain objects to SyncSessionsResponse"""
+    def to_sync_sessions_response(session_sync: SessionSync) -> SyncSessionsResponse:
+        """Convert SessionSync domain object to SyncSessionsResponse"""
         return SyncSessionsResponse(
             sessions=[
                 SyncSessionsAdapter.to_session_response(session)
-                for session in sessions
+                for session in session_sync.sessions
             ],
-            session_count=len(sessions)
+            session_count=len(session_sync.sessions),
+            updated_quiz_count=session_sync.updated_quizzes
         )
 
@@ -0,0 +1,59 @@
+from fastapi import Request, Response, status
+
+from core.settings import settings
+from infrastructure.clients.sessionize_client import CachedView
+
+
+class ViewResponseAdapter:
+    """
+    Class with static methods used for converting cached Sessionize views to
+    responses, honoring conditional requests and the accepted encodings
+    """
+
+    @staticmethod
+    def _etag_matches(if_none_match: str, etag: str) -> bool:
+        """Check the If-None-Match header against the view ETag (weak comparison)"""
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+    @staticmethod
+    def _accepted_encodings(accept_encoding: str) -> set[str]:
+        """Parse the Accept-Encoding header, skipping encodings explicitly refused with q=0"""
+        encodings = set()
+        for part in accept_encoding.split(","):
+            name, _, params = part.partition(";")
+            quality = 1.0
+            for param in params.split(";"):
+                key, _, value = param.strip().partition("=")
+                if key == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if name.strip() and quality > 0:
+                encodings.add(name.strip().lower())
+        return encodings
+
+    @staticmethod
+    def to_response(view: CachedView, request: Request) -> Response:
+        """Convert a CachedView to a JSON response, or to a 304 if the client copy is current"""
+        headers = {
+            "ETag": view.etag,
+            "Cache-Control": f"public, max-age={settings.sessionize_cache_max_age}",
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and ViewResponseAdapter._etag_matches(if_none_match, view.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        accepted = ViewResponseAdapter._accepted_encodings(request.headers.get("accept-encoding", ""))
+        body = view.body
+        if view.brotli_body is not None and "br" in accepted:
+            body = view.brotli_body
+            headers["Content-Encoding"] = "br"
+        elif "gzip" in accepted:
+            body = view.gzip_body
+            headers["Content-Encoding"] = "gzip"
+
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -1,5 +1,6 @@
 from api.routers.groups import router as groups_router
 from api.routers.health.health import router as health_router
+from api.routers.leaderboard import router as leaderboard_router
 from api.routers.quizzes import router as quiz_router
 from api.routers.sessionize import router as sessionize_router
 from api.routers.tags import router as tags_router
@@ -16,8 +17,17 @@ def include_routers(app: FastAPI) -> None:
     api_router.include_router(quiz_router)
     api_router.include_router(sessionize_router)
     api_router.include_router(tags_router)
+    api_router.include_router(leaderboard_router)
     
     from api.routers.admin.reset_data import router as admin_router
+    from api.routers.admin.backfill_tag_secrets import router as backfill_tag_secrets_router
+    from api.routers.admin.backfill_quiz_state import router as backfill_quiz_state_router
+    from api.routers.admin.read_job import router as read_job_router
+    from api.routers.admin.replay_score_ledger import router as replay_score_ledger_router
     api_router.include_router(admin_router)
+    api_router.include_router(backfill_tag_secrets_router)
+    api_router.include_router(backfill_quiz_state_router)
+    api_router.include_router(read_job_router)
+    api_router.include_router(replay_score_ledger_router)
 
     app.include_router(api_router)
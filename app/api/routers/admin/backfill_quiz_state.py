@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, status
+from core.dependencies import AdminServiceDep
+from domain.entities.user import User
+from core.authorization import verify_id_token, check_user_role
+from domain.entities.role import Role
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.post(
+    "/backfill-quiz-state",
+    status_code=status.HTTP_200_OK,
+    description="Backfill the user_quiz_state documents from the quiz results and start times subcollections",
+    responses={
+        200: {"description": "Quiz state backfilled successfully"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Forbidden - Insufficient privileges"},
+        500: {"description": "Internal server error"},
+    }
+)
+def backfill_quiz_state(
+    admin_service: AdminServiceDep,
+    user_token: User = Depends(verify_id_token),
+) -> dict:
+    """
+    Writes the user_quiz_state document of every user with quiz results or start times.
+    Safe to run more than once.
+    """
+    check_user_role(user_token, min_role=Role.ADMIN)
+
+    users = admin_service.backfill_quiz_state()
+
+    return {"message": "Quiz state backfilled", "users": users}
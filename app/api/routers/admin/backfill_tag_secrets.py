@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, status
+from core.dependencies import TagServiceDep
+from domain.entities.user import User
+from core.authorization import verify_id_token, check_user_role
+from domain.entities.role import Role
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.post(
+    "/backfill-tag-secrets",
+    status_code=status.HTTP_200_OK,
+    description="Backfill the tag_secrets index from the existing tags",
+    responses={
+        200: {"description": "Index backfilled successfully"},
+        400: {"description": "Bad request - Firestore operation failed"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Forbidden - Insufficient privileges"},
+        500: {"description": "Internal server error"},
+    }
+)
+def backfill_tag_secrets(
+    tag_service: TagServiceDep,
+    user_token: User = Depends(verify_id_token),
+) -> dict:
+    """
+    Writes the tag_secrets index entry for every existing tag.
+    Safe to run more than once.
+    """
+    check_user_role(user_token, min_role=Role.ADMIN)
+
+    indexed = tag_service.backfill_secret_index()
+
+    return {"message": "Tag secrets index backfilled", "indexed": indexed}
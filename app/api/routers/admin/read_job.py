@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, status
+from core.dependencies import AdminServiceDep
+from domain.entities.user import User
+from core.authorization import verify_id_token, check_user_role
+from domain.entities.role import Role
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get(
+    "/jobs/{job_id}",
+    status_code=status.HTTP_200_OK,
+    description="Read the status and progress of an administration job",
+    responses={
+        200: {"description": "Job read successfully"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Forbidden - Insufficient privileges"},
+        404: {"description": "Job not found"},
+        500: {"description": "Internal server error"},
+    }
+)
+def read_job(
+    job_id: str,
+    admin_service: AdminServiceDep,
+    user_token: User = Depends(verify_id_token),
+) -> dict:
+    """
+    Returns the status of a job, the users processed so far and, once done, the leaderboard reset summary.
+    """
+    check_user_role(user_token, min_role=Role.ADMIN)
+
+    job = admin_service.read_job(job_id)
+
+    return job.model_dump(mode="json", exclude={"lease_owner", "lease_expires_at"})
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from core.dependencies import AdminServiceDep
+from domain.entities.user import User
+from core.authorization import verify_id_token, check_user_role
+from domain.entities.role import Role
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.post(
+    "/replay-score-ledger",
+    status_code=status.HTTP_200_OK,
+    description="Rebuild the leaderboard user and group scores from the score ledger",
+    responses={
+        200: {"description": "Scores rebuilt successfully"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Forbidden - Insufficient privileges"},
+        500: {"description": "Internal server error"},
+    }
+)
+def replay_score_ledger(
+    admin_service: AdminServiceDep,
+    dry_run: bool = Query(default=False, description="Only report what would change"),
+    epoch: Optional[int] = Query(default=None, ge=0, description="Score epoch to replay, the current one by default"),
+    user_token: User = Depends(verify_id_token),
+) -> dict:
+    """
+    Recomputes every score as the sum of its ledger entries in the epoch and rewrites the ones that differ.
+    Replaying the epoch before a reset restores the scores it cleared.
+    Points recorded while it runs may be lost: close the leaderboard first.
+    """
+    check_user_role(user_token, min_role=Role.ADMIN)
+
+    summary = admin_service.replay_score_ledger(dry_run, epoch)
+
+    return {"message": "Score ledger replayed", "summary": summary.model_dump()}
@@ -9,10 +9,10 @@ router = APIRouter(prefix="/admin", tags=["Admin"])
 
 @router.post(
     "/reset-data",
-    status_code=status.HTTP_200_OK,
-    description="Reset all data: leaderboard, tags, quiz results",
+    status_code=status.HTTP_202_ACCEPTED,
+    description="Start resetting all data: leaderboard, tags, quiz results",
     responses={
-        200: {"description": "Data reset successfully"},
+        202: {"description": "Reset job started"},
         401: {"description": "Unauthorized"},
         403: {"description": "Forbidden - Insufficient privileges"},
         500: {"description": "Internal server error"},
@@ -23,11 +23,12 @@ def reset_data(
     user_token: User = Depends(verify_id_token),
 ) -> dict:
     """
-    Resets all data in the system.
+    Starts resetting all data in the system, in a background job.
+    Its progress is available at /admin/jobs/{job_id}.
     """
     # Check if user is admin
-    check_user_role(user_token, min_role=Role.OWNER)
+    check_user_role(user_token, min_role=Role.ADMIN)
 
-    admin_service.reset_all_data()
+    job = admin_service.start_reset_all_data()
 
-    return {"message": "All data has been reset successfully"}
+    return {"message": "Data reset started", "job_id": job.job_id, "status": job.status.value}
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from .read_leaderboard import router as read_leaderboard_router
+from .read_leaderboard_snapshots import router as read_leaderboard_snapshots_router
+from .stream_leaderboard import router as stream_leaderboard_router
+
+router = APIRouter()
+
+router.include_router(read_leaderboard_router)
+router.include_router(read_leaderboard_snapshots_router)
+router.include_router(stream_leaderboard_router)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query, status
+
+from api.adapters.leaderboard.read_leaderboard_adapter import ReadLeaderboardAdapter
+from api.schemas.leaderboard.read_leaderboard_schema import GetLeaderboardResponse
+from core.authorization import verify_id_token
+from core.dependencies import LeaderboardServiceDep
+from domain.entities.user import User
+
+router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
+
+
+@router.get(
+    "",
+    description="Get the top users and groups of the leaderboard, with the rank of the caller and of their group",
+    response_model=GetLeaderboardResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Leaderboard retrieved successfully"},
+        401: {"description": "Unauthorized - Invalid or expired token"},
+        403: {"description": "Forbidden - Leaderboard is closed"},
+        500: {"description": "Internal server error"},
+    },
+)
+def read_leaderboard(
+    leaderboard_service: LeaderboardServiceDep,
+    limit: int = Query(default=10, ge=1, le=100),
+    user_token: User = Depends(verify_id_token),
+) -> GetLeaderboardResponse:
+    """
+    Get the top `limit` users and groups. Staff can read it also while closed.
+    """
+    leaderboard = leaderboard_service.read_leaderboard(user_token, limit)
+    return ReadLeaderboardAdapter.to_get_leaderboard_response(leaderboard)
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, status
+
+from api.adapters.leaderboard.leaderboard_snapshot_adapter import LeaderboardSnapshotAdapter
+from api.schemas.leaderboard.leaderboard_snapshot_schema import LeaderboardSnapshotResponse, LeaderboardSnapshotsResponse
+from core.authorization import verify_id_token, check_user_role
+from core.dependencies import LeaderboardServiceDep
+from domain.entities.role import Role
+from domain.entities.user import User
+
+router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
+
+
+@router.get(
+    "/snapshots/at",
+    description="Get the leaderboard as it was at a given time, from the last snapshot taken at or before it",
+    response_model=LeaderboardSnapshotResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Leaderboard snapshot retrieved successfully"},
+        401: {"description": "Unauthorized - Invalid or expired token"},
+        403: {"description": "Forbidden - Insufficient privileges"},
+        404: {"description": "No snapshot taken at or before the given time"},
+        500: {"description": "Internal server error"},
+    },
+)
+def read_leaderboard_snapshot_at(
+    leaderboard_service: LeaderboardServiceDep,
+    timestamp: datetime = Query(description="ISO 8601 time, UTC if no timezone is given"),
+    limit: int = Query(default=10, ge=1, le=1000),
+    user_token: User = Depends(verify_id_token),
+) -> LeaderboardSnapshotResponse:
+    """
+    Get the top `limit` users and groups at the given time. Staff only.
+    """
+    check_user_role(user_token, min_role=Role.STAFF)
+
+    snapshot = leaderboard_service.read_snapshot_at(LeaderboardSnapshotAdapter.to_timestamp(timestamp), limit)
+    return LeaderboardSnapshotAdapter.to_snapshot_response(snapshot)
+
+
+@router.get(
+    "/snapshots",
+    description="Get the leaderboard snapshots taken in an interval, oldest first",
+    response_model=LeaderboardSnapshotsResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Leaderboard snapshots retrieved successfully"},
+        401: {"description": "Unauthorized - Invalid or expired token"},
+        403: {"description": "Forbidden - Insufficient privileges"},
+        500: {"description": "Internal server error"},
+    },
+)
+def read_leaderboard_snapshots(
+    leaderboard_service: LeaderboardServiceDep,
+    start: datetime = Query(description="ISO 8601 time, UTC if no timezone is given"),
+    end: datetime = Query(description="ISO 8601 time, UTC if no timezone is given"),
+    limit: int = Query(default=10, ge=1, le=100),
+    max_snapshots: int = Query(default=100, ge=1, le=500),
+    user_token: User = Depends(verify_id_token),
+) -> LeaderboardSnapshotsResponse:
+    """
+    Get the top `limit` users and groups of each snapshot taken between start and end. Staff only.
+    """
+    check_user_role(user_token, min_role=Role.STAFF)
+
+    snapshots = leaderboard_service.read_snapshots(
+        LeaderboardSnapshotAdapter.to_timestamp(start),
+        LeaderboardSnapshotAdapter.to_timestamp(end),
+        limit,
+        max_snapshots
+    )
+    return LeaderboardSnapshotAdapter.to_snapshots_response(snapshots)
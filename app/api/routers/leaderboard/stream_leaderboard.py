@@ -0,0 +1,63 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import StreamingResponse
+
+from api.adapters.leaderboard.read_leaderboard_adapter import ReadLeaderboardAdapter
+from core.authorization import verify_id_token
+from core.dependencies import LeaderboardBroadcasterDep, LeaderboardServiceDep
+from domain.entities.user import User
+
+router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
+
+# Comment lines keep idle connections open through proxies
+KEEPALIVE_SECONDS: float = 15.0
+
+
+@router.get(
+    "/stream",
+    description="Stream the leaderboard as Server-Sent Events: a `snapshot` event, then `diff` events",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Leaderboard event stream", "content": {"text/event-stream": {}}},
+        401: {"description": "Unauthorized - Invalid or expired token"},
+        403: {"description": "Forbidden - Leaderboard is closed"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def stream_leaderboard(
+    request: Request,
+    leaderboard_service: LeaderboardServiceDep,
+    broadcaster: LeaderboardBroadcasterDep,
+    user_token: User = Depends(verify_id_token),
+) -> StreamingResponse:
+    """
+    Streams the top users and groups and the rank of the caller and of their group.
+    Slow consumers are disconnected and get a fresh snapshot when they reconnect.
+    Streams of users who are not staff end when the leaderboard is closed.
+    """
+    await asyncio.to_thread(leaderboard_service.check_leaderboard_access, user_token)
+    subscription = await broadcaster.subscribe(
+        user_token.uid, (user_token.group or {}).get("gid"), leaderboard_service.is_staff(user_token)
+    )
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    update = await asyncio.wait_for(subscription.queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if update is None:
+                    break
+                yield ReadLeaderboardAdapter.to_server_sent_event(update)
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
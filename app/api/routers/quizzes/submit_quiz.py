@@ -27,6 +27,7 @@ router = APIRouter(prefix="/quizzes", tags=["Quizzes"])
         409: {"description": "Conflict - Quiz already submitted"},
         423: {"description": "Locked - Quiz is not open"},
         500: {"description": "Internal server error"},
+        503: {"description": "Service Unavailable - Session slots not synced yet"},
     },
 )
 async def submit_quiz(
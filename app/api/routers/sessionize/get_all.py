@@ -1,4 +1,6 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, Response, status
+from core.dependencies import SessionizeClientDep
+from api.adapters.sessionize.view_response_adapter import ViewResponseAdapter
 from infrastructure.clients.sessionize_client import SessionizeClient
 
 router = APIRouter()
@@ -8,7 +10,12 @@ router = APIRouter()
     "/all",
     description="Get all data from Sessionize",
     status_code=status.HTTP_200_OK,
+    response_class=Response,
+    responses={
+        200: {"description": "View data, gzip or brotli encoded when accepted"},
+        304: {"description": "Not modified - the view matches If-None-Match"},
+    }
 )
-async def get_all():
-    client = SessionizeClient()
-    return await client.get_all()
+async def get_all(request: Request, client: SessionizeClientDep) -> Response:
+    view = await client.get_view(SessionizeClient.VIEW_ALL)
+    return ViewResponseAdapter.to_response(view, request)
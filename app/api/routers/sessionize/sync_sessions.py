@@ -11,18 +11,18 @@ router = APIRouter()
 
 @router.post(
     "/sync-sessions",
-    description="Sync Sessionize sessions with quizzes and update quiz sessions field",
+    description="Sync Sessionize sessions with quizzes right away and update quiz sessions field",
     status_code=status.HTTP_200_OK,
     response_model=SyncSessionsResponse,
 )
 async def sync_sessions(
     session_service: SessionServiceDep,
     user_token: User = Depends(verify_id_token),
-) -> None:
+) -> SyncSessionsResponse:
     """
-    Manually trigger session sync from Sessionize.
+    Manually trigger session sync from Sessionize, without waiting for the background sync.
     """
     check_user_role(user_token, min_role=Role.STAFF)
     
-    await session_service.sync_sessions()
-    return None
+    session_sync = await session_service.sync_sessions()
+    return SyncSessionsAdapter.to_sync_sessions_response(session_sync)
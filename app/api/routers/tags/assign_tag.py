@@ -69,7 +69,7 @@ def assign_tag_by_secret(
 ) -> AssignTagResponse:
     """
     Assign a tag to the logged-in user by secret.
-    Finds the tag by secret (using read_all and filtering), adds it to user's tags list
+    Finds the tag by secret (through the tag_secrets index), adds it to user's tags list
     and updates leaderboard scores.
     """
     # Get the user ID from the authenticated token
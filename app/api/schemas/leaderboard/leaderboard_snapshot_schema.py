@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from api.schemas.leaderboard.read_leaderboard_schema import LeaderboardEntryResponse
+
+
+class LeaderboardSnapshotResponse(BaseModel):
+    """Schema for the leaderboard as it was at a point in time"""
+
+    taken_at: datetime
+    users: list[LeaderboardEntryResponse]
+    groups: list[LeaderboardEntryResponse]
+    user_count: int
+    group_count: int
+
+
+class LeaderboardSnapshotsResponse(BaseModel):
+    """Schema for the leaderboard snapshots of an interval"""
+
+    snapshots: list[LeaderboardSnapshotResponse]
@@ -0,0 +1,35 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntryResponse(BaseModel):
+    """Schema for a user or group in the leaderboard"""
+
+    id: str
+    name: str
+    color: Optional[str] = None
+    score: int
+    rank: int
+
+
+class GetLeaderboardResponse(BaseModel):
+    """Schema for leaderboard response"""
+
+    users: list[LeaderboardEntryResponse]
+    groups: list[LeaderboardEntryResponse]
+    user_count: int
+    group_count: int
+    me: Optional[LeaderboardEntryResponse] = None
+    my_group: Optional[LeaderboardEntryResponse] = None
+
+
+class LeaderboardDiffResponse(BaseModel):
+    """Schema for the leaderboard changes pushed by the stream"""
+
+    users: list[LeaderboardEntryResponse]
+    groups: list[LeaderboardEntryResponse]
+    removed_users: list[str]
+    removed_groups: list[str]
+    me: Optional[LeaderboardEntryResponse] = None
+    my_group: Optional[LeaderboardEntryResponse] = None
@@ -17,4 +17,5 @@ class SyncSessionsResponse(BaseModel):
     """Response schema for sync sessions endpoint"""
     sessions: List[SessionResponse] = Field(..., description="List of filtered sessions")
     session_count: int = Field(..., description="Total number of sessions")
+    updated_quiz_count: int = Field(..., description="Number of quizzes whose sessions changed")
 
@@ -0,0 +1,123 @@
+"""
+Benchmark of the group assignment strategies at check-in, under concurrency.
+
+Runs the same burst of check-ins with each GroupAssignmentStrategy and reports the
+transaction attempts (retries included), errors, latencies and the final balance
+of the groups. Use the Firestore emulator, groups are written in a scratch collection:
+
+    export FIRESTORE_EMULATOR_HOST=localhost:8080 GOOGLE_CLOUD_PROJECT=demo-benchmark
+    python benchmark_group_assignment.py --groups 6 --check-ins 600 --concurrency 32 --processes 4
+"""
+import argparse
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from domain.entities.group_assignment_strategy import GroupAssignmentStrategy
+from infrastructure.caches.group_allocator import GroupAllocator
+from infrastructure.clients.firestore_client import FirestoreClient
+from infrastructure.repositories import group_repository
+from infrastructure.repositories.group_repository import GroupRepository
+
+
+class AttemptCounter:
+    """Counts the calls of the transactional functions: one per attempt, retries included"""
+
+    def __init__(self):
+        self.attempts = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def patch(self):
+        transactional = group_repository.firestore.transactional
+
+        def counting_transactional(to_wrap):
+            def counted(*args, **kwargs):
+                with self._lock:
+                    self.attempts += 1
+                return to_wrap(*args, **kwargs)
+            return transactional(counted)
+
+        group_repository.firestore.transactional = counting_transactional
+        try:
+            yield self
+        finally:
+            group_repository.firestore.transactional = transactional
+
+
+def reset_groups(firestore_client: FirestoreClient, collection: str, groups: int) -> None:
+    collection_ref = firestore_client.db.collection(collection)
+    firestore_client.db.recursive_delete(collection_ref)
+    for index in range(groups):
+        collection_ref.document(f"group-{index}").set({
+            "name": f"Group {index}", "color": "black", "image_url": "", "user_count": 0
+        })
+
+
+def run(strategy: GroupAssignmentStrategy, args, firestore_client: FirestoreClient, collection: str) -> None:
+    reset_groups(firestore_client, collection, args.groups)
+    # One allocator per simulated process: each only sees its own assignments between refreshes
+    allocators = [GroupAllocator(refresh_interval=args.refresh_interval) for _ in range(args.processes)]
+
+    def check_in(index: int) -> float:
+        repository = GroupRepository(
+            firestore_client,
+            assignment_strategy=strategy,
+            group_allocator=allocators[index % args.processes],
+            counter_shards=args.shards
+        )
+        repository.GROUP_COLLECTION = collection
+        started_at = time.perf_counter()
+        repository.increment_group_counter()
+        return (time.perf_counter() - started_at) * 1000
+
+    latencies, errors = [], 0
+    counter = AttemptCounter()
+    started_at = time.perf_counter()
+    with counter.patch(), ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(check_in, index) for index in range(args.check_ins)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    elapsed = time.perf_counter() - started_at
+
+    repository = GroupRepository(firestore_client, counter_shards=args.shards)
+    repository.GROUP_COLLECTION = collection
+    counts = {gid: group["user_count"] for gid, group in repository._read_groups().items()}
+    retries = max(counter.attempts - len(latencies) - errors, 0)
+
+    print(f"\n{strategy.value}")
+    print(f"  check-ins: {len(latencies)} ok, {errors} failed in {elapsed:.1f}s ({len(latencies) / elapsed:.0f}/s)")
+    print(f"  transaction attempts: {counter.attempts}, retries: {retries} ({retries / args.check_ins:.2f} per check-in)")
+    if latencies:
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f"  latency ms: p50 {quantiles[49]:.0f}, p95 {quantiles[94]:.0f}, max {max(latencies):.0f}")
+    print(f"  users per group: {sorted(counts.values())} (spread {max(counts.values()) - min(counts.values())})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=6)
+    parser.add_argument("--check-ins", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--processes", type=int, default=4, help="Simulated workers for the allocator")
+    parser.add_argument("--refresh-interval", type=float, default=2.0)
+    parser.add_argument("--shards", type=int, default=4)
+    args = parser.parse_args()
+
+    firestore_client = FirestoreClient()
+    collection = f"benchmark_groups_{uuid.uuid4().hex[:8]}"
+    try:
+        for strategy in GroupAssignmentStrategy:
+            run(strategy, args, firestore_client, collection)
+    finally:
+        firestore_client.db.recursive_delete(firestore_client.db.collection(collection))
+
+
+if __name__ == "__main__":
+    main()
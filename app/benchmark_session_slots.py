@@ -0,0 +1,135 @@
+"""
+Benchmark of the slot generation of SessionService on a synthetic GridSmart payload.
+
+Builds a multi-day, multi-room schedule with service sessions (breaks, plenums)
+spread over each day, then times the previous per-slot scan against the
+interval sweep of SessionService._calculate_and_map_slots and checks that both
+give the same slots. Runs offline:
+
+    python benchmark_session_slots.py --days 3 --rooms 40 --services-per-day 8
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+from unittest.mock import MagicMock
+
+from domain.entities.session import Session
+from domain.entities.slot import Slot
+from domain.services.session_service import SessionService
+
+
+def build_grid_smart(days: int, rooms: int, services_per_day: int, seed: int) -> List[dict]:
+    """
+    Returns a GridSmart-like payload: days of rooms of sessions, with 30 to 120 minute
+    talks from 9:00 to 19:00 and service sessions in a dedicated room.
+    """
+    rng = random.Random(seed)
+    session_id = 0
+    grid = []
+    for day in range(days):
+        day_start = datetime(2025, 10, 1 + day, 9, 0)
+        day_end = day_start.replace(hour=19)
+        day_rooms = []
+        for room in range(rooms):
+            sessions, current = [], day_start
+            while True:
+                duration = timedelta(minutes=rng.choice([30, 45, 60, 90, 120]))
+                if current + duration > day_end:
+                    break
+                session_id += 1
+                sessions.append({
+                    "id": str(session_id),
+                    "startsAt": current.isoformat(),
+                    "endsAt": (current + duration).isoformat(),
+                    "isServiceSession": False,
+                    "isPlenumSession": False,
+                })
+                current += duration + timedelta(minutes=rng.choice([0, 0, 15]))
+            day_rooms.append({"id": room, "name": f"Room {room}", "sessions": sessions})
+
+        services = []
+        for _ in range(services_per_day):
+            start = day_start + timedelta(minutes=15 * rng.randrange(0, 38))
+            session_id += 1
+            services.append({
+                "id": str(session_id),
+                "startsAt": start.isoformat(),
+                "endsAt": (start + timedelta(minutes=rng.choice([15, 30, 60]))).isoformat(),
+                "isServiceSession": True,
+                "isPlenumSession": rng.random() < 0.2,
+            })
+        day_rooms.append({"id": rooms, "name": "Services", "sessions": services})
+        grid.append({"date": day_start.date().isoformat(), "rooms": day_rooms})
+    return grid
+
+
+def parse_sessions(grid: List[dict]) -> List[Session]:
+    return [
+        Session.from_dict(session)
+        for day in grid
+        for room in day["rooms"]
+        for session in room["sessions"]
+    ]
+
+
+def scan_slots(sessions: List[Session]) -> Dict[str, List[Slot]]:
+    """
+    The previous implementation: every candidate slot is checked against every service session.
+    """
+    non_service_sessions = [s for s in sessions if not s.is_service_session and not s.is_plenum_session]
+    service_sessions = [s for s in sessions if s.is_service_session or s.is_plenum_session]
+    min_duration = min(s.ends_at - s.starts_at for s in non_service_sessions)
+
+    session_slots_map = {}
+    for session in non_service_sessions:
+        session_slots = []
+        current = session.starts_at
+        while current + min_duration <= session.ends_at:
+            slot = Slot(start=current, end=current + min_duration)
+            overlapping = next((ss for ss in service_sessions if slot.start < ss.ends_at and slot.end > ss.starts_at), None)
+            if overlapping is None:
+                session_slots.append(slot)
+                current += min_duration
+            else:
+                current = overlapping.ends_at
+        if session_slots:
+            session_slots_map[session.id] = session_slots
+    return session_slots_map
+
+
+def timed(function, sessions: List[Session], repeat: int):
+    timings, result = [], None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = function(sessions)
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return result, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--services-per-day", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sessions = parse_sessions(build_grid_smart(args.days, args.rooms, args.services_per_day, args.seed))
+    service = SessionService(MagicMock(), MagicMock())
+    services = sum(1 for s in sessions if s.is_service_session or s.is_plenum_session)
+    print(f"{len(sessions)} sessions, {services} service sessions")
+
+    scanned, scan_timings = timed(scan_slots, sessions, args.repeat)
+    swept, sweep_timings = timed(service._calculate_and_map_slots, sessions, args.repeat)
+    slots = sum(len(session_slots) for session_slots in swept.values())
+    print(f"  {slots} slots in {len(swept)} sessions, same as the scan: {scanned == swept}")
+    print(f"  scan  ms: median {statistics.median(scan_timings):.1f}, min {min(scan_timings):.1f}")
+    print(f"  sweep ms: median {statistics.median(sweep_timings):.1f}, min {min(sweep_timings):.1f}")
+
+
+if __name__ == "__main__":
+    main()
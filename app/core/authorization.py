@@ -1,6 +1,6 @@
 from typing import Optional
 
-from core.dependencies import UserRepositoryDep
+from core.dependencies import TokenCacheDep, UserRepositoryDep
 from domain.entities.role import Role
 from domain.entities.user import User
 from fastapi import Depends, HTTPException, status
@@ -15,13 +15,31 @@ token_auth_scheme = HTTPBearer()
 
 def verify_id_token(
     user_repository: UserRepositoryDep,
+    token_cache: TokenCacheDep,
     creds: HTTPAuthorizationCredentials = Depends(token_auth_scheme),
 ) -> User:
     """
     Verify firebase token ID, if valid gets back user data from Firestore, otherwise throw HTTPException.
+
+    Verified tokens are cached together with the resolved user, so repeated requests
+    skip both the Firebase revocation round-trip and the Firestore read. Revocation is
+    re-checked once the configured interval has elapsed.
     """
 
     token = creds.credentials
+
+    cached = token_cache.get(token)
+    if cached is not None:
+        if token_cache.needs_revocation_check(cached):
+            try:
+                auth.verify_id_token(token, check_revoked=True)
+            except Exception:
+                token_cache.discard(token)
+                raise UnauthorizedError
+            token_cache.mark_revocation_checked(cached)
+        # Return a copy so callers can't alter the cached user
+        return cached.user.model_copy()
+
     try:
         decoded_token = auth.verify_id_token(token, check_revoked=True)
         uid = decoded_token.get("uid")
@@ -33,12 +51,14 @@ def verify_id_token(
         # That should be enough for authorization checks (role, checked_in).
         try:
             user = user_repository.read(uid)
-            return user
         except Exception:
             # If user not found in Firestore (e.g. during creation or inconsistency)
             # we might want to handle it. But for now, if not in Firestore, unauthorized.
             raise UnauthorizedError
 
+        token_cache.put(token, decoded_token, user)
+        return user.model_copy()
+
     except HTTPException:
         raise
     except Exception:
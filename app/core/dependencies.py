@@ -6,20 +6,37 @@ from fastapi import Depends
 from domain.services.check_in_service import CheckInService
 from domain.services.config_service import ConfigService
 from domain.services.group_service import GroupService
+from domain.services.leaderboard_broadcaster import LeaderboardBroadcaster
 from domain.services.leaderboard_service import LeaderboardService
 from domain.services.quiz_service import QuizService
+from domain.services.score_aggregator import ScoreAggregator
 from domain.services.user_service import UserService
+from core.settings import settings
 from infrastructure.clients.firebase_auth_client import FirebaseAuthClient
+from infrastructure.caches.group_allocator import GroupAllocator
+from infrastructure.caches.group_cache import GroupCache
+from infrastructure.caches.leaderboard_cache import LeaderboardCache
+from infrastructure.caches.quiz_catalog import QuizCatalog
+from infrastructure.caches.score_epoch_cache import ScoreEpochCache
+from infrastructure.caches.session_slot_cache import SessionSlotCache
+from infrastructure.caches.sessionize_snapshot_store import SessionizeSnapshotStore
+from infrastructure.caches.tag_cache import TagCache
+from infrastructure.caches.token_cache import TokenCache
+from infrastructure.clients.async_firestore_client import AsyncFirestoreClient
 from infrastructure.clients.firestore_client import FirestoreClient
 from infrastructure.repositories.firebase_auth_repository import \
     FirebaseAuthRepository
+from infrastructure.repositories.check_in_repository import CheckInRepository
 from infrastructure.repositories.config_repository import ConfigRepository
 from infrastructure.repositories.firestore_repository import \
     FirestoreRepository
 from infrastructure.repositories.group_repository import GroupRepository
 from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
 from infrastructure.repositories.quiz_repository import QuizRepository
+from infrastructure.repositories.quiz_state_repository import QuizStateRepository
+from infrastructure.repositories.session_slot_repository import SessionSlotRepository
 from infrastructure.repositories.tags_repository import TagsRepository
+from infrastructure.repositories.token_invalidation_repository import TokenInvalidationRepository
 from infrastructure.repositories.user_repository import UserRepository
 from domain.services.tag_service import TagService
 from domain.services.session_service import SessionService
@@ -46,6 +63,36 @@ def get_firestore_client() -> FirestoreClient:
 
 FirestoreClientDep = Annotated[FirestoreClient, Depends(get_firestore_client)]
 
+@lru_cache()
+def get_async_firestore_client() -> AsyncFirestoreClient:
+    """
+    Dependency to get AsyncFirestoreClient singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return AsyncFirestoreClient()
+
+AsyncFirestoreClientDep = Annotated[AsyncFirestoreClient, Depends(get_async_firestore_client)]
+
+def get_token_invalidation_repository(firestore_client: FirestoreClientDep) -> TokenInvalidationRepository:
+    """Dependency to get TokenInvalidationRepository instance"""
+    return TokenInvalidationRepository(firestore_client, retention=settings.token_cache_ttl)
+
+@lru_cache()
+def get_token_cache() -> TokenCache:
+    """
+    Dependency to get TokenCache singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return TokenCache(
+        maxsize=settings.token_cache_maxsize,
+        ttl=settings.token_cache_ttl,
+        revocation_check_interval=settings.token_revocation_check_interval,
+        token_invalidation_repository=get_token_invalidation_repository(get_firestore_client()),
+        use_listener=settings.token_invalidation_listener,
+    )
+
+TokenCacheDep = Annotated[TokenCache, Depends(get_token_cache)]
+
 def get_auth_repository(
     auth_client: AuthClientDep
 ) -> FirebaseAuthRepository:
@@ -54,53 +101,189 @@ def get_auth_repository(
 
 AuthRepositoryDep = Annotated[FirebaseAuthRepository, Depends(get_auth_repository)]
 
+@lru_cache()
+def get_group_cache() -> GroupCache:
+    """
+    Dependency to get GroupCache singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return GroupCache(maxsize=settings.group_cache_maxsize, ttl=settings.group_cache_ttl)
+
+GroupCacheDep = Annotated[GroupCache, Depends(get_group_cache)]
+
 def get_firestore_repository(
-    firestore_client: FirestoreClientDep
+    firestore_client: FirestoreClientDep,
+    async_firestore_client: AsyncFirestoreClientDep,
+    group_cache: GroupCacheDep
 ) -> FirestoreRepository:
     """Dependency to get FirestoreRepository instance"""
-    return FirestoreRepository(firestore_client)
+    return FirestoreRepository(firestore_client, async_firestore_client, group_cache)
 
 FirestoreRepositoryDep = Annotated[FirestoreRepository, Depends(get_firestore_repository)]
 
 def get_leaderboard_repository(
-    firestore_client: FirestoreClientDep
+    firestore_client: FirestoreClientDep,
+    async_firestore_client: AsyncFirestoreClientDep
 ) -> LeaderboardRepository:
     """Dependency to get LeaderboardRepository instance"""
-    return LeaderboardRepository(firestore_client)
+    return LeaderboardRepository(firestore_client, async_firestore_client, settings.leaderboard_group_shards)
 
 LeaderboardRepositoryDep = Annotated[LeaderboardRepository, Depends(get_leaderboard_repository)]
 
+@lru_cache()
+def get_score_aggregator() -> ScoreAggregator:
+    """
+    Dependency to get ScoreAggregator singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return ScoreAggregator(
+        get_leaderboard_repository(get_firestore_client(), get_async_firestore_client()),
+        flush_interval=settings.score_aggregator_flush_interval,
+        max_pending=settings.score_aggregator_max_pending,
+        recovery_age=settings.score_outbox_recovery_age,
+    )
+
+@lru_cache()
+def get_score_epoch_cache() -> ScoreEpochCache:
+    """
+    Dependency to get ScoreEpochCache singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return ScoreEpochCache(
+        get_leaderboard_repository(get_firestore_client(), get_async_firestore_client()),
+        ttl=settings.score_epoch_ttl,
+        use_listener=settings.score_epoch_listener,
+    )
+
+ScoreEpochCacheDep = Annotated[ScoreEpochCache, Depends(get_score_epoch_cache)]
+
+def get_config_repository(
+    firestore_client: FirestoreClientDep
+) -> ConfigRepository:
+    """Dependency to get ConfigRepository instance"""
+    return ConfigRepository(firestore_client)
+
+ConfigRepositoryDep = Annotated[ConfigRepository, Depends(get_config_repository)]
+
+@lru_cache()
+def get_leaderboard_cache() -> LeaderboardCache:
+    """
+    Dependency to get LeaderboardCache singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return LeaderboardCache(
+        get_firestore_client(),
+        ttl=settings.leaderboard_cache_ttl,
+        use_listener=settings.leaderboard_cache_listener,
+    )
+
+LeaderboardCacheDep = Annotated[LeaderboardCache, Depends(get_leaderboard_cache)]
+
 def get_leaderboard_service(
-    leaderboard_repository: LeaderboardRepositoryDep
+    leaderboard_repository: LeaderboardRepositoryDep,
+    leaderboard_cache: LeaderboardCacheDep,
+    config_repository: ConfigRepositoryDep,
+    score_epoch_cache: ScoreEpochCacheDep
 ) -> LeaderboardService:
     """Dependency to get LeaderboardService with injected repository"""
-    return LeaderboardService(leaderboard_repository)
+    score_aggregator = get_score_aggregator() if settings.score_aggregator_enabled else None
+    return LeaderboardService(leaderboard_repository, score_aggregator, leaderboard_cache, config_repository, score_epoch_cache)
 
 LeaderboardServiceDep = Annotated[LeaderboardService, Depends(get_leaderboard_service)]
 
+@lru_cache()
+def get_leaderboard_broadcaster() -> LeaderboardBroadcaster:
+    """
+    Dependency to get LeaderboardBroadcaster singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return LeaderboardBroadcaster(
+        get_leaderboard_cache(),
+        get_leaderboard_repository(get_firestore_client(), get_async_firestore_client()),
+        interval=settings.leaderboard_stream_interval,
+        queue_size=settings.leaderboard_stream_queue_size,
+        top_k=settings.leaderboard_stream_top_k,
+        leaderboard_service=LeaderboardService(
+            get_leaderboard_repository(get_firestore_client(), get_async_firestore_client()),
+            config_repository=get_config_repository(get_firestore_client()),
+        ),
+    )
+
+LeaderboardBroadcasterDep = Annotated[LeaderboardBroadcaster, Depends(get_leaderboard_broadcaster)]
+
+def get_quiz_state_repository(
+    firestore_client: FirestoreClientDep,
+    async_firestore_client: AsyncFirestoreClientDep
+) -> QuizStateRepository:
+    """Dependency to get QuizStateRepository instance"""
+    return QuizStateRepository(firestore_client, async_firestore_client)
+
+QuizStateRepositoryDep = Annotated[QuizStateRepository, Depends(get_quiz_state_repository)]
+
 def get_user_repository(
     auth_repository: AuthRepositoryDep,
     firestore_repository: FirestoreRepositoryDep,
-    leaderboard_repository: LeaderboardRepositoryDep
+    leaderboard_repository: LeaderboardRepositoryDep,
+    quiz_state_repository: QuizStateRepositoryDep
 ) -> UserRepository:
     """Dependency to get UserRepository instance"""
-    return UserRepository(auth_repository, firestore_repository, leaderboard_repository)
+    return UserRepository(
+        auth_repository,
+        firestore_repository,
+        leaderboard_repository,
+        quiz_state_repository,
+        settings.quiz_state_mode
+    )
 
 UserRepositoryDep = Annotated[UserRepository, Depends(get_user_repository)]
 
+@lru_cache()
+def get_group_allocator() -> GroupAllocator:
+    """
+    Dependency to get GroupAllocator singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return GroupAllocator(refresh_interval=settings.group_allocator_refresh_interval)
+
+GroupAllocatorDep = Annotated[GroupAllocator, Depends(get_group_allocator)]
+
 def get_group_repository(
-    firestore_client: FirestoreClientDep
+    firestore_client: FirestoreClientDep,
+    group_cache: GroupCacheDep,
+    group_allocator: GroupAllocatorDep
 ) -> GroupRepository:
     """Dependency to get GroupRepository instance"""
-    return GroupRepository(firestore_client)
+    return GroupRepository(
+        firestore_client,
+        group_cache,
+        settings.group_assignment_strategy,
+        group_allocator,
+        settings.group_counter_shards
+    )
 
 GroupRepositoryDep = Annotated[GroupRepository, Depends(get_group_repository)]
 
+@lru_cache()
+def get_tag_cache() -> TagCache:
+    """
+    Dependency to get TagCache singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    return TagCache(
+        maxsize=settings.tag_cache_maxsize,
+        ttl=settings.tag_cache_ttl,
+        firestore_client=get_firestore_client(),
+        use_listener=settings.tag_cache_listener,
+    )
+
+TagCacheDep = Annotated[TagCache, Depends(get_tag_cache)]
+
 def get_tags_repository(
-    firestore_client: FirestoreClientDep
+    firestore_client: FirestoreClientDep,
+    tag_cache: TagCacheDep
 ) -> TagsRepository:
     """Dependency to get TagsRepository instance"""
-    return TagsRepository(firestore_client)
+    return TagsRepository(firestore_client, tag_cache)
 
 TagsRepositoryDep = Annotated[TagsRepository, Depends(get_tags_repository)]
 
@@ -117,22 +300,15 @@ GroupServiceDep = Annotated[GroupService, Depends(get_group_service)]
 def get_user_service(
     user_repository: UserRepositoryDep,
     group_service: GroupServiceDep,
-    tags_repository: TagsRepositoryDep
+    tags_repository: TagsRepositoryDep,
+    token_cache: TokenCacheDep
 ) -> UserService:
     """Dependency to get UserService with injected repositories"""
-    return UserService(user_repository, group_service, tags_repository)
+    return UserService(user_repository, group_service, tags_repository, token_cache)
 
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
 
 
-def get_config_repository(
-    firestore_client: FirestoreClientDep
-) -> ConfigRepository:
-    """Dependency to get ConfigRepository instance"""
-    return ConfigRepository(firestore_client)
-
-ConfigRepositoryDep = Annotated[ConfigRepository, Depends(get_config_repository)]
-
 
 def get_config_service(
     config_repository: ConfigRepositoryDep
@@ -143,45 +319,99 @@ def get_config_service(
 ConfigServiceDep = Annotated[ConfigService, Depends(get_config_service)]
 
 
+def get_check_in_repository(
+    firestore_client: FirestoreClientDep,
+    group_repository: GroupRepositoryDep
+) -> CheckInRepository:
+    """Dependency to get CheckInRepository instance"""
+    return CheckInRepository(firestore_client, group_repository)
+
+CheckInRepositoryDep = Annotated[CheckInRepository, Depends(get_check_in_repository)]
+
+
 def get_check_in_service(
-    group_service: GroupServiceDep,
     user_service: UserServiceDep,
     config_service: ConfigServiceDep,
-    leaderboard_repository: LeaderboardRepositoryDep
+    check_in_repository: CheckInRepositoryDep
 ) -> CheckInService:
     """Dependency to get CheckInService with injected services"""
     return CheckInService(
         user_service=user_service,
-        group_service=group_service,
         config_service=config_service,
-        leaderboard_repository=leaderboard_repository
+        check_in_repository=check_in_repository
     )
 
 CheckInServiceDep = Annotated[CheckInService, Depends(get_check_in_service)]
 
 
+@lru_cache()
+def get_quiz_catalog() -> QuizCatalog:
+    """
+    Dependency to get QuizCatalog singleton instance.
+    The lru_cache decorator ensures only one instance (and one listener) is created.
+    """
+    return QuizCatalog(
+        get_firestore_client(),
+        ttl=settings.quiz_catalog_ttl,
+        use_listener=settings.quiz_catalog_listener,
+    )
+
+QuizCatalogDep = Annotated[QuizCatalog, Depends(get_quiz_catalog)]
+
+
 def get_quiz_repository(
-    firestore_client: FirestoreClientDep
+    firestore_client: FirestoreClientDep,
+    async_firestore_client: AsyncFirestoreClientDep,
+    quiz_catalog: QuizCatalogDep
 ) -> QuizRepository:
     """Dependency to get QuizRepository instance"""
-    return QuizRepository(firestore_client)
+    return QuizRepository(firestore_client, async_firestore_client, quiz_catalog)
 
 QuizRepositoryDep = Annotated[QuizRepository, Depends(get_quiz_repository)]
 
 
+@lru_cache()
 def get_sessionize_client() -> SessionizeClient:
-    """Dependency to get SessionizeClient instance"""
-    return SessionizeClient()
+    """
+    Dependency to get SessionizeClient singleton instance.
+    The lru_cache decorator ensures only one instance is created.
+    """
+    snapshot_store = None
+    if settings.sessionize_snapshot_dir:
+        snapshot_store = SessionizeSnapshotStore(settings.sessionize_snapshot_dir, settings.sessionize_id)
+    return SessionizeClient(snapshot_store=snapshot_store)
 
 SessionizeClientDep = Annotated[SessionizeClient, Depends(get_sessionize_client)]
 
 
+def get_session_slot_repository(firestore_client: FirestoreClientDep) -> SessionSlotRepository:
+    """Dependency to get SessionSlotRepository instance"""
+    return SessionSlotRepository(firestore_client)
+
+SessionSlotRepositoryDep = Annotated[SessionSlotRepository, Depends(get_session_slot_repository)]
+
+
+@lru_cache()
+def get_session_slot_cache() -> SessionSlotCache:
+    """
+    Dependency to get SessionSlotCache singleton instance.
+    The lru_cache decorator ensures only one instance (and one listener) is created.
+    """
+    return SessionSlotCache(
+        get_session_slot_repository(get_firestore_client()),
+        use_listener=settings.session_slots_listener,
+    )
+
+SessionSlotCacheDep = Annotated[SessionSlotCache, Depends(get_session_slot_cache)]
+
+
 def get_session_service(
     sessionize_client: SessionizeClientDep,
-    quiz_repository: QuizRepositoryDep
+    quiz_repository: QuizRepositoryDep,
+    session_slot_cache: SessionSlotCacheDep
 ) -> SessionService:
     """Dependency to get SessionService with injected clients and repositories"""
-    return SessionService(sessionize_client, quiz_repository)
+    return SessionService(sessionize_client, quiz_repository, session_slot_cache, settings.session_sync_interval)
 
 SessionServiceDep = Annotated[SessionService, Depends(get_session_service)]
 
@@ -211,12 +441,49 @@ TagServiceDep = Annotated[TagService, Depends(get_tag_service)]
 
 
 from domain.services.admin_service import AdminService
+from infrastructure.repositories.admin_job_repository import AdminJobRepository
+
+def get_admin_job_repository(
+    firestore_client: FirestoreClientDep
+) -> AdminJobRepository:
+    """Dependency to get AdminJobRepository instance"""
+    return AdminJobRepository(firestore_client)
+
+AdminJobRepositoryDep = Annotated[AdminJobRepository, Depends(get_admin_job_repository)]
 
 def get_admin_service(
     user_repository: UserRepositoryDep,
-    leaderboard_repository: LeaderboardRepositoryDep
+    leaderboard_repository: LeaderboardRepositoryDep,
+    admin_job_repository: AdminJobRepositoryDep
 ) -> AdminService:
     """Dependency to get AdminService with injected repositories"""
-    return AdminService(user_repository, leaderboard_repository)
+    return AdminService(
+        user_repository,
+        leaderboard_repository,
+        admin_job_repository,
+        page_size=settings.admin_job_page_size,
+        parallelism=settings.admin_job_parallelism,
+        lease_seconds=settings.admin_job_lease
+    )
 
 AdminServiceDep = Annotated[AdminService, Depends(get_admin_service)]
+
+
+from domain.services.lease_service import LeaseService
+from infrastructure.repositories.lease_repository import LeaseRepository
+
+def get_lease_repository(
+    firestore_client: FirestoreClientDep
+) -> LeaseRepository:
+    """Dependency to get LeaseRepository instance"""
+    return LeaseRepository(firestore_client)
+
+LeaseRepositoryDep = Annotated[LeaseRepository, Depends(get_lease_repository)]
+
+def get_lease_service(
+    lease_repository: LeaseRepositoryDep
+) -> LeaseService:
+    """Dependency to get LeaseService with injected repositories"""
+    return LeaseService(lease_repository)
+
+LeaseServiceDep = Annotated[LeaseService, Depends(get_lease_service)]
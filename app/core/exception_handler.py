@@ -6,6 +6,8 @@ from infrastructure.errors.group_errors import *
 from infrastructure.errors.config_errors import *
 from infrastructure.errors.quiz_errors import *
 from infrastructure.errors.tag_errors import *
+from infrastructure.errors.admin_errors import *
+from infrastructure.errors.leaderboard_errors import *
 
 def register_exception_handlers(app: FastAPI):
     """Register all global exception handlers"""
@@ -80,6 +82,10 @@ def register_exception_handlers(app: FastAPI):
     async def check_in_not_open_error_handler(request: Request, exc: CheckInNotOpenError):
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
 
+    @app.exception_handler(LeaderboardNotOpenError)
+    async def leaderboard_not_open_error_handler(request: Request, exc: LeaderboardNotOpenError):
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
     @app.exception_handler(CreateQuizError)
     async def create_quiz_error_handler(request: Request, exc: CreateQuizError):
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
@@ -120,6 +126,10 @@ def register_exception_handlers(app: FastAPI):
     async def quiz_all_sessions_already_completed_error_handler(request: Request, exc: QuizAllSessionsAlreadyCompletedError):
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
 
+    @app.exception_handler(SessionSlotsNotReadyError)
+    async def session_slots_not_ready_error_handler(request: Request, exc: SessionSlotsNotReadyError):
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
     @app.exception_handler(CreateTagError)
     async def create_tag_error_handler(request: Request, exc: CreateTagError):
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
@@ -140,6 +150,18 @@ def register_exception_handlers(app: FastAPI):
     async def assign_tag_error_handler(request: Request, exc: AssignTagError):
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
 
+    @app.exception_handler(AdminJobNotFoundError)
+    async def admin_job_not_found_error_handler(request: Request, exc: AdminJobNotFoundError):
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+    @app.exception_handler(AdminJobLeaseLostError)
+    async def admin_job_lease_lost_error_handler(request: Request, exc: AdminJobLeaseLostError):
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+    @app.exception_handler(LeaderboardSnapshotNotFoundError)
+    async def leaderboard_snapshot_not_found_error_handler(request: Request, exc: LeaderboardSnapshotNotFoundError):
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
     @app.exception_handler(Exception)
     async def generic_exception_handler(request: Request, exc: Exception):
         raise HTTPException(status_code=500, detail="Internal server error")
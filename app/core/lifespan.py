@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from core.dependencies import (
+    get_admin_job_repository,
+    get_admin_service,
+    get_async_firestore_client,
+    get_auth_client,
+    get_auth_repository,
+    get_firestore_client,
+    get_firestore_repository,
+    get_group_allocator,
+    get_group_cache,
+    get_group_repository,
+    get_leaderboard_broadcaster,
+    get_leaderboard_repository,
+    get_lease_repository,
+    get_lease_service,
+    get_quiz_catalog,
+    get_quiz_repository,
+    get_quiz_state_repository,
+    get_score_aggregator,
+    get_session_service,
+    get_session_slot_cache,
+    get_sessionize_client,
+    get_user_repository,
+)
+from core.settings import settings
+from domain.entities.group_assignment_strategy import GroupAssignmentStrategy
+from domain.services.group_service import GroupService
+from domain.services.leaderboard_service import LeaderboardService
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: starts the background jobs and releases the
+    resources held by the singletons on shutdown.
+    """
+    background_tasks: list[asyncio.Task] = []
+    firestore_client, async_firestore_client = get_firestore_client(), get_async_firestore_client()
+    leaderboard_repository = get_leaderboard_repository(firestore_client, async_firestore_client)
+    leaderboard_service = LeaderboardService(leaderboard_repository)
+    # Every worker starts the loops below, only the holder of each lease runs them
+    lease_service = get_lease_service(get_lease_repository(firestore_client))
+
+    if settings.score_aggregator_enabled:
+        get_score_aggregator().start()
+
+    if settings.leaderboard_group_shards > 1:
+        background_tasks.append(asyncio.create_task(
+            leaderboard_service.run_group_score_rollup(settings.leaderboard_rollup_interval, lease_service)
+        ))
+
+    if (
+        settings.group_assignment_strategy == GroupAssignmentStrategy.ALLOCATOR
+        and settings.group_counter_shards > 1
+    ):
+        group_service = GroupService(
+            get_group_repository(firestore_client, get_group_cache(), get_group_allocator())
+        )
+        background_tasks.append(asyncio.create_task(
+            group_service.run_user_count_rollup(settings.group_counter_rollup_interval, lease_service)
+        ))
+
+    if settings.leaderboard_snapshot_interval > 0:
+        background_tasks.append(asyncio.create_task(
+            leaderboard_service.run_snapshots(
+                settings.leaderboard_snapshot_interval,
+                settings.leaderboard_snapshot_max_users,
+                lease_service
+            )
+        ))
+
+    # Resumes the admin jobs left unfinished by stopped instances
+    admin_service = get_admin_service(
+        get_user_repository(
+            get_auth_repository(get_auth_client()),
+            get_firestore_repository(firestore_client, async_firestore_client, get_group_cache()),
+            leaderboard_repository,
+            get_quiz_state_repository(firestore_client, async_firestore_client),
+        ),
+        leaderboard_repository,
+        get_admin_job_repository(firestore_client),
+    )
+    background_tasks.append(asyncio.create_task(
+        admin_service.run_job_recovery(settings.admin_job_lease)
+    ))
+
+    # Serves the Sessionize views saved on disk until they're fetched again
+    await asyncio.to_thread(get_sessionize_client().load_snapshots)
+
+    # Loads the session slots synced by any instance, then keeps them fresh with the listener
+    try:
+        await asyncio.to_thread(get_session_slot_cache().load)
+    except Exception:
+        logger.warning("Session slots not loaded at startup", exc_info=True)
+
+    # Syncs the Sessionize sessions in background, requests only read the result
+    if settings.session_sync_interval > 0:
+        session_service = get_session_service(
+            get_sessionize_client(),
+            get_quiz_repository(firestore_client, async_firestore_client, get_quiz_catalog()),
+            get_session_slot_cache(),
+        )
+        background_tasks.append(asyncio.create_task(
+            session_service.run_sync_scheduler(settings.session_sync_jitter)
+        ))
+
+    yield
+
+    # Ends the open leaderboard streams, so that shutdown doesn't wait for them
+    if get_leaderboard_broadcaster.cache_info().currsize:
+        await get_leaderboard_broadcaster().close()
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    if settings.score_aggregator_enabled:
+        # Drain the pending points before exiting
+        await asyncio.to_thread(get_score_aggregator().close)
+    await get_sessionize_client().aclose()
@@ -1,4 +1,8 @@
+import logging
+import time
+
 from core.settings import settings
+from core.timing import format_server_timing, start_request_timings
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -23,6 +27,42 @@ async def remove_trailing_slash(request: Request, call_next):
     return await call_next(request)
 
 
+logger = logging.getLogger(__name__)
+
+
+async def add_server_timing(request: Request, call_next):
+    """
+    Middleware to expose a per-request timing breakdown.
+
+    Services record their phases through core.timing; the collected durations are
+    returned in the `Server-Timing` header and logged, so that latency percentiles
+    can be computed per endpoint and per phase.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        call_next (Callable): The next middleware or route handler.
+
+    Returns:
+        Response: The response with the `Server-Timing` header set.
+    """
+    timings = start_request_timings()
+    started_at = time.perf_counter()
+    response = await call_next(request)
+    total_ms = (time.perf_counter() - started_at) * 1000
+
+    response.headers["Server-Timing"] = format_server_timing(timings, total_ms)
+    if timings:
+        logger.info(
+            "%s %s %d total=%.1fms %s",
+            request.method,
+            request.url.path,
+            response.status_code,
+            total_ms,
+            " ".join(f"{name}={duration:.1f}ms" for name, duration in timings.items()),
+        )
+    return response
+
+
 def add_middlewares(app: FastAPI) -> None:
     """
     Register all HTTP middlewares with the FastAPI application.
@@ -49,6 +89,7 @@ def add_middlewares(app: FastAPI) -> None:
 
     middlewares = [
         remove_trailing_slash,
+        add_server_timing,
     ]
 
     for middleware in middlewares:
@@ -1,6 +1,9 @@
 from typing import Optional
 from pydantic_settings import BaseSettings
 
+from domain.entities.group_assignment_strategy import GroupAssignmentStrategy
+from domain.entities.quiz_state_mode import QuizStateMode
+
 
 class Settings(BaseSettings):
     firebase_service_account_path: Optional[str] = None
@@ -9,6 +12,82 @@ class Settings(BaseSettings):
     version: str = "1.0.0"
     sessionize_id: str
 
+    # Verified ID token cache (seconds)
+    token_cache_maxsize: int = 10000
+    token_cache_ttl: int = 300
+    token_revocation_check_interval: int = 60
+    # Drops the tokens of users invalidated by other instances, listening to Firestore
+    token_invalidation_listener: bool = True
+
+    # In-memory quiz catalog
+    quiz_catalog_listener: bool = True
+    quiz_catalog_ttl: int = 60
+
+    # Shared tag cache, invalidated by a Firestore listener
+    tag_cache_maxsize: int = 1024
+    tag_cache_ttl: int = 300
+    tag_cache_listener: bool = True
+
+    # Group cache used to resolve the users' group references
+    group_cache_maxsize: int = 32
+    group_cache_ttl: int = 60
+
+    # Group assignment at check-in: transaction or allocator, the allocator's
+    # counts refresh interval and user count shards (seconds)
+    group_assignment_strategy: GroupAssignmentStrategy = GroupAssignmentStrategy.TRANSACTION
+    group_allocator_refresh_interval: float = 2.0
+    group_counter_shards: int = 1
+    group_counter_rollup_interval: float = 5.0
+
+    # Sessionize views cache (seconds)
+    sessionize_cache_ttl: int = 600
+    sessionize_timeout: float = 10.0
+    sessionize_cache_max_age: int = 60
+    # Directory of the last good Sessionize views, empty disables the snapshots
+    sessionize_snapshot_dir: Optional[str] = "/tmp/sessionize_snapshots"
+
+    # Session slot map shared by the instances, kept fresh with a Firestore listener
+    session_slots_listener: bool = True
+
+    # Background Sessionize sync: seconds between syncs (0 disables the scheduler), random extra delay
+    session_sync_interval: float = 600
+    session_sync_jitter: float = 60.0
+
+    # Sharded group scores: 1 disables sharding, rollup interval in seconds
+    leaderboard_group_shards: int = 1
+    leaderboard_rollup_interval: float = 5.0
+
+    # In-memory leaderboard ranking
+    leaderboard_cache_listener: bool = True
+    leaderboard_cache_ttl: int = 10
+
+    # Leaderboard stream (Server-Sent Events)
+    leaderboard_stream_interval: float = 1.0
+    leaderboard_stream_queue_size: int = 16
+    leaderboard_stream_top_k: int = 10
+
+    # Leaderboard snapshots: seconds between snapshots (0 disables them), users kept per snapshot
+    leaderboard_snapshot_interval: int = 900
+    leaderboard_snapshot_max_users: int = 1000
+
+    # Current score epoch, kept fresh with a Firestore listener or re-read every ttl seconds
+    score_epoch_listener: bool = True
+    score_epoch_ttl: int = 5
+
+    # Write-behind score aggregator (seconds)
+    score_aggregator_enabled: bool = False
+    score_aggregator_flush_interval: float = 0.3
+    score_aggregator_max_pending: int = 100
+    score_outbox_recovery_age: int = 60
+
+    # Background admin jobs: users per checkpoint, parallel deletes, lease in seconds
+    admin_job_page_size: int = 100
+    admin_job_parallelism: int = 8
+    admin_job_lease: int = 120
+
+    # Per-user quiz state storage: subcollections, dual_write (migration) or document
+    quiz_state_mode: QuizStateMode = QuizStateMode.SUBCOLLECTIONS
+
     class Config:
         env_file = "app/.env"
 
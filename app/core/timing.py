@@ -0,0 +1,59 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Per-request phase durations in milliseconds, populated by the server timing middleware
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> Dict[str, float]:
+    """
+    Starts collecting phase timings for the current request and returns the
+    dict that measure() and measure_async() will fill.
+    """
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def _record(name: str, started_at: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started_at) * 1000
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    """
+    Records how long the wrapped block takes under the given phase name.
+    Outside of a request this is a no-op.
+    """
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, started_at)
+
+
+async def measure_async(name: str, awaitable: Awaitable[T]) -> T:
+    """
+    Awaits the given awaitable and records its duration under the given phase name.
+    Meant to wrap the single coroutines passed to asyncio.gather.
+    """
+    started_at = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        _record(name, started_at)
+
+
+def format_server_timing(timings: Dict[str, float], total_ms: float) -> str:
+    """
+    Formats the collected timings as a Server-Timing header value.
+    """
+    metrics = [f"{name};dur={duration:.1f}" for name, duration in timings.items()]
+    metrics.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(metrics)
@@ -0,0 +1,70 @@
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel
+
+from domain.entities.score_reset_summary import ScoreResetSummary
+
+
+class AdminJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AdminJob(BaseModel):
+    """
+    Domain object representing a long running administration task and its progress.
+    The cursor is the last processed user id: a resumed job starts right after it.
+    """
+    job_id: str
+    job_type: str
+    status: AdminJobStatus = AdminJobStatus.PENDING
+    phase: Optional[str] = None
+    total_users: int = 0
+    processed_users: int = 0
+    cursor: Optional[str] = None
+    leaderboard: Optional[ScoreResetSummary] = None
+    error: Optional[str] = None
+    created_at: int  # milliseconds
+    updated_at: int  # milliseconds
+    lease_owner: Optional[str] = None
+    lease_expires_at: int = 0  # milliseconds
+
+    def is_finished(self) -> bool:
+        return self.status in (AdminJobStatus.COMPLETED, AdminJobStatus.FAILED)
+
+    @staticmethod
+    def from_dict(data: dict) -> "AdminJob":
+        leaderboard = data.get("leaderboard")
+        return AdminJob(
+            job_id=data["job_id"],
+            job_type=data["job_type"],
+            status=AdminJobStatus(data.get("status", AdminJobStatus.PENDING.value)),
+            phase=data.get("phase"),
+            total_users=data.get("total_users", 0),
+            processed_users=data.get("processed_users", 0),
+            cursor=data.get("cursor"),
+            leaderboard=ScoreResetSummary(**leaderboard) if leaderboard else None,
+            error=data.get("error"),
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+            lease_owner=data.get("lease_owner"),
+            lease_expires_at=data.get("lease_expires_at", 0)
+        )
+
+    def to_firestore_data(self) -> dict:
+        return {
+            "job_type": self.job_type,
+            "status": self.status.value,
+            "phase": self.phase,
+            "total_users": self.total_users,
+            "processed_users": self.processed_users,
+            "cursor": self.cursor,
+            "leaderboard": self.leaderboard.model_dump() if self.leaderboard else None,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "lease_owner": self.lease_owner,
+            "lease_expires_at": self.lease_expires_at
+        }
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class GroupAssignmentStrategy(Enum):
+    """
+    How check-in picks the group of a user.
+
+    - TRANSACTION: a transaction reads every group and increments the least populated one.
+      Exact, but concurrent check-ins contend on all the group documents and retry.
+    - ALLOCATOR: each process picks the least populated group from its in-memory counts,
+      refreshed periodically, and increments it without a transaction. Balancing is
+      approximate across processes, and nothing is retried.
+    """
+    TRANSACTION = "transaction"
+    ALLOCATOR = "allocator"
@@ -0,0 +1,46 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from domain.entities.leaderboard_entry import LeaderboardEntry
+
+
+class LeaderboardRank(BaseModel):
+    """
+    Domain object representing the 1-based position of an entry in the leaderboard
+    """
+    rank: int
+    entry: LeaderboardEntry
+
+
+class Leaderboard(BaseModel):
+    """
+    Domain object representing the top of the users and groups leaderboards,
+    with the positions of the caller and of their group
+    """
+    top_users: List[LeaderboardEntry]
+    top_groups: List[LeaderboardEntry]
+    user_count: int
+    group_count: int
+    user_rank: Optional[LeaderboardRank] = None
+    group_rank: Optional[LeaderboardRank] = None
+
+
+class LeaderboardDiff(BaseModel):
+    """
+    Domain object representing the changes to a leaderboard since the previous update:
+    top entries that changed or entered the top, top entries that left it, and the
+    new ranks of the subscriber and of their group, when changed
+    """
+    users: List[LeaderboardRank] = []
+    groups: List[LeaderboardRank] = []
+    removed_users: List[str] = []
+    removed_groups: List[str] = []
+    user_rank: Optional[LeaderboardRank] = None
+    group_rank: Optional[LeaderboardRank] = None
+
+    def is_empty(self) -> bool:
+        return not (
+            self.users or self.groups or self.removed_users or self.removed_groups
+            or self.user_rank or self.group_rank
+        )
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    """
+    Domain object representing a user or a group in the leaderboard
+    """
+    entry_id: str
+    name: str
+    color: Optional[str] = None
+    score: int = 0
+    updated_at: int = 0  # milliseconds
+
+    @staticmethod
+    def from_user_dict(entry_id: str, data: dict) -> "LeaderboardEntry":
+        return LeaderboardEntry(
+            entry_id=entry_id,
+            name=data.get("nickname", ""),
+            color=data.get("group_color"),
+            score=data.get("score", 0),
+            updated_at=data.get("updated_at", 0)
+        )
+
+    @staticmethod
+    def from_group_dict(entry_id: str, data: dict) -> "LeaderboardEntry":
+        return LeaderboardEntry(
+            entry_id=entry_id,
+            name=data.get("name", ""),
+            color=data.get("color"),
+            score=data.get("score", 0),
+            updated_at=data.get("updated_at", 0)
+        )
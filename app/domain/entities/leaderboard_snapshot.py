@@ -0,0 +1,83 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from domain.entities.leaderboard_entry import LeaderboardEntry
+
+
+class LeaderboardSnapshot(BaseModel):
+    """
+    Domain object representing the ranked users and groups of the leaderboard
+    at a point in time. The rank of an entry is its position + 1.
+    """
+    taken_at: int  # milliseconds
+    users: List[LeaderboardEntry]
+    groups: List[LeaderboardEntry]
+    user_count: int
+    group_count: int
+
+    @staticmethod
+    def rank(entries: List[LeaderboardEntry]) -> List[LeaderboardEntry]:
+        """
+        Sorts the entries as the live leaderboard does: by score (descending),
+        then by updated_at, so that on equal score who got there first ranks higher.
+        """
+        return sorted(entries, key=lambda entry: (-entry.score, entry.updated_at, entry.entry_id))
+
+    @staticmethod
+    def from_entries(
+        taken_at: int,
+        users: List[LeaderboardEntry],
+        groups: List[LeaderboardEntry],
+        max_users: Optional[int] = None
+    ) -> "LeaderboardSnapshot":
+        ranked_users = LeaderboardSnapshot.rank(users)
+        return LeaderboardSnapshot(
+            taken_at=taken_at,
+            users=ranked_users[:max_users] if max_users else ranked_users,
+            groups=LeaderboardSnapshot.rank(groups),
+            user_count=len(users),
+            group_count=len(groups)
+        )
+
+    @staticmethod
+    def _entries_from_columns(columns: dict) -> List[LeaderboardEntry]:
+        return [
+            LeaderboardEntry(entry_id=entry_id, name=name, color=color, score=score)
+            for entry_id, name, color, score in zip(
+                columns.get("ids", []),
+                columns.get("names", []),
+                columns.get("colors", []),
+                columns.get("scores", [])
+            )
+        ]
+
+    @staticmethod
+    def _entries_to_columns(entries: List[LeaderboardEntry]) -> dict:
+        return {
+            "ids": [entry.entry_id for entry in entries],
+            "names": [entry.name for entry in entries],
+            "colors": [entry.color for entry in entries],
+            "scores": [entry.score for entry in entries]
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "LeaderboardSnapshot":
+        return LeaderboardSnapshot(
+            taken_at=data["taken_at"],
+            users=LeaderboardSnapshot._entries_from_columns(data.get("users") or {}),
+            groups=LeaderboardSnapshot._entries_from_columns(data.get("groups") or {}),
+            user_count=data.get("user_count", 0),
+            group_count=data.get("group_count", 0)
+        )
+
+    def to_firestore_data(self) -> dict:
+        # Stored as columns: one array per field instead of one map per entry keeps
+        # the field names out of every entry and the document well below 1 MiB
+        return {
+            "taken_at": self.taken_at,
+            "users": self._entries_to_columns(self.users),
+            "groups": self._entries_to_columns(self.groups),
+            "user_count": self.user_count,
+            "group_count": self.group_count
+        }
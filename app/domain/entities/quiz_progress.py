@@ -0,0 +1,16 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from domain.entities.quiz_result import QuizResult
+from domain.entities.quiz_start_time import QuizStartTime
+
+
+class QuizProgress(BaseModel):
+    """
+    Domain object representing the state of a quiz for a user,
+    together with the ids of all the quizzes the user has completed
+    """
+    result: Optional[QuizResult] = None
+    start_time: Optional[QuizStartTime] = None
+    completed_quiz_ids: List[str] = []
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class QuizStateMode(Enum):
+    """
+    Where the per-user quiz state (start times and results) is stored.
+
+    - SUBCOLLECTIONS: users/{uid}/quiz_start_times and users/{uid}/quiz_results only
+    - DUAL_WRITE: migration period, reads the subcollections and writes both storages
+    - DOCUMENT: reads and writes the single user_quiz_state/{uid} document
+    """
+    SUBCOLLECTIONS = "subcollections"
+    DUAL_WRITE = "dual_write"
+    DOCUMENT = "document"
@@ -0,0 +1,55 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class ScoreEvent(BaseModel):
+    """
+    Domain object representing points awarded to a user (and to their group).
+    Every event is recorded once per score epoch in the score ledger, keyed by its
+    event id, which is the idempotency key of what awarded the points (see
+    quiz_event_id and tag_event_id). A leaderboard reset starts a new epoch, so
+    the same points can be earned again while the previous entries are kept.
+    With the score aggregator its ledger entry is the outbox: it's marked as pending
+    until the event is applied to the leaderboard.
+    """
+    event_id: str
+    uid: str
+    gid: Optional[str] = None
+    points: int
+    created_at: int  # milliseconds
+    epoch: int = 0
+
+    @staticmethod
+    def from_dict(data: dict) -> "ScoreEvent":
+        return ScoreEvent(
+            event_id=data["event_id"],
+            uid=data["uid"],
+            gid=data.get("gid"),
+            points=data["points"],
+            created_at=data["created_at"],
+            epoch=data.get("epoch", 0)
+        )
+
+    def to_firestore_data(self) -> dict:
+        return {
+            "uid": self.uid,
+            "gid": self.gid,
+            "points": self.points,
+            "created_at": self.created_at,
+            "epoch": self.epoch
+        }
+
+    def ledger_id(self) -> str:
+        """
+        Document id of the event in the score ledger: the event id scoped to its epoch.
+        Epoch 0 keeps the bare event id of the entries recorded before epochs existed.
+        """
+        return f"{self.epoch}:{self.event_id}" if self.epoch else self.event_id
+
+    @staticmethod
+    def quiz_event_id(uid: str, quiz_id: str) -> str:
+        return f"{uid}:quiz:{quiz_id}"
+
+    @staticmethod
+    def tag_event_id(uid: str, tag_id: str) -> str:
+        return f"{uid}:tag:{tag_id}"
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class ScoreReplaySummary(BaseModel):
+    """
+    Domain object representing the outcome of a leaderboard rebuild from the score ledger
+    """
+    epoch: int = 0
+    ledger_entries: int = 0
+    users_updated: int = 0
+    groups_updated: int = 0
+    shards: int = 0
+    outbox_events: int = 0
+    dry_run: bool = False
+    duration_ms: int = 0
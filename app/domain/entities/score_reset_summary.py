@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ScoreResetSummary(BaseModel):
+    """
+    Domain object representing the documents touched by a leaderboard reset
+    """
+    users: int = 0
+    groups: int = 0
+    shards: int = 0
+    outbox_events: int = 0
+    epoch: int = 0
+    duration_ms: int = 0
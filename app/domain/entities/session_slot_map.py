@@ -0,0 +1,50 @@
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping
+
+from pydantic import BaseModel
+
+from domain.entities.slot import Slot
+
+
+class SessionSlotMap(BaseModel):
+    """
+    Domain object representing the slots of each session, as computed by the last
+    Sessionize sync, shared by all the instances.
+    """
+    slots: Dict[str, List[Slot]] = {}
+    synced_at: int = 0  # milliseconds, 0 if never synced
+
+    @staticmethod
+    def from_dict(data: dict) -> "SessionSlotMap":
+        # Datetimes are stored as ISO strings, so that their timezone is kept as parsed from Sessionize
+        return SessionSlotMap(
+            slots={
+                session_id: [
+                    Slot(start=datetime.fromisoformat(slot["start"]), end=datetime.fromisoformat(slot["end"]))
+                    for slot in session_slots
+                ]
+                for session_id, session_slots in (data.get("slots") or {}).items()
+            },
+            synced_at=data.get("synced_at", 0)
+        )
+
+    def to_firestore_data(self) -> dict:
+        return {
+            "slots": {
+                session_id: [
+                    {"start": slot.start.isoformat(), "end": slot.end.isoformat()}
+                    for slot in session_slots
+                ]
+                for session_id, session_slots in self.slots.items()
+            },
+            "synced_at": self.synced_at
+        }
+
+    def index(self) -> Mapping[str, FrozenSet[Slot]]:
+        """
+        Returns a read-only session_id -> slots index, for O(1) lookups.
+        """
+        return MappingProxyType({
+            session_id: frozenset(session_slots) for session_id, session_slots in self.slots.items()
+        })
@@ -0,0 +1,14 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from domain.entities.session import Session
+
+
+class SessionSync(BaseModel):
+    """
+    Domain object representing the result of a sync of the Sessionize sessions with the quizzes.
+    """
+    sessions: List[Session]
+    updated_quizzes: int  # quizzes whose session tags changed
+    synced_at: int  # milliseconds
@@ -1,42 +1,200 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from domain.entities.admin_job import AdminJob, AdminJobStatus
+from domain.entities.score_replay_summary import ScoreReplaySummary
+from domain.services.lease_service import WORKER_ID
+from infrastructure.errors.admin_errors import AdminJobLeaseLostError
+from infrastructure.repositories.admin_job_repository import AdminJobRepository
 from infrastructure.repositories.user_repository import UserRepository
 from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
 
+logger = logging.getLogger(__name__)
+
+
 class AdminService:
     """
     Service for administration tasks.
     """
 
+    # Job types
+    RESET_ALL_DATA_JOB: str = "reset_all_data"
+
+    # Reset phases
+    PHASE_LEADERBOARD: str = "leaderboard"
+    PHASE_USERS: str = "users"
+
     def __init__(
         self,
         user_repository: UserRepository,
-        leaderboard_repository: LeaderboardRepository
+        leaderboard_repository: LeaderboardRepository,
+        admin_job_repository: Optional[AdminJobRepository] = None,
+        page_size: int = 100,
+        parallelism: int = 8,
+        lease_seconds: float = 120
     ):
         self.user_repository = user_repository
         self.leaderboard_repository = leaderboard_repository
+        self.admin_job_repository = admin_job_repository
+        self.page_size = page_size
+        self.parallelism = parallelism
+        self.lease_seconds = lease_seconds
+
+    def start_reset_all_data(self) -> AdminJob:
+        """
+        Starts resetting all data in a background job and returns it right away.
+        Its progress is checkpointed after each page of users, so that the job can
+        be resumed by resume_jobs if the process stops midway.
+        """
+        now = int(time.time() * 1000)
+        job = AdminJob(
+            job_id=uuid.uuid4().hex,
+            job_type=self.RESET_ALL_DATA_JOB,
+            created_at=now,
+            updated_at=now,
+            lease_owner=WORKER_ID,
+            lease_expires_at=now + int(self.lease_seconds * 1000)
+        )
+        self.admin_job_repository.create(job)
+        self._start_job_thread(job)
+        return job
+
+    def read_job(self, job_id: str) -> AdminJob:
+        """
+        Reads an administration job and its progress.
+
+        Raises:
+            AdminJobNotFoundError: if the job does not exist
+        """
+        return self.admin_job_repository.read(job_id)
+
+    def resume_jobs(self) -> List[str]:
+        """
+        Resumes the reset jobs left unfinished by stopped processes, from their last checkpoint.
+        Returns the ids of the resumed jobs.
+        """
+        resumed = []
+        for job_id in self.admin_job_repository.read_unfinished_ids(self.RESET_ALL_DATA_JOB):
+            job = self.admin_job_repository.acquire_lease(job_id, WORKER_ID, self.lease_seconds)
+            if job is None:
+                continue
+            logger.info("Resuming job %s after user %s", job.job_id, job.cursor)
+            self._start_job_thread(job)
+            resumed.append(job.job_id)
+        return resumed
+
+    async def run_job_recovery(self, interval: float) -> None:
+        """
+        Looks for unfinished jobs to resume every `interval` seconds, until cancelled.
+        Failures are logged and retried at the next round.
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.resume_jobs)
+            except Exception:
+                logger.warning("Admin job recovery failed", exc_info=True)
+            await asyncio.sleep(interval)
 
-    def reset_all_data(self) -> None:
-        """
-        Resets all data:
-        - Leaderboard scores (users and groups)
-        - User tags
-        - User quiz results
-        - User quiz start times
-        """
-        # 1. Reset leaderboard scores
-        self.leaderboard_repository.reset_all_scores()
-
-        # 2. Get all users
-        users = self.user_repository.read_all_raw()
-
-        # 3. Iterate users and clear data
-        for user in users:
-            uid = user["uid"]
-            
-            # Clear tags
-            self.user_repository.clear_tags(uid)
-            
-            # Clear quiz results
-            self.user_repository.clear_quiz_results(uid)
-            
-            # Clear quiz start times
-            self.user_repository.clear_quiz_start_times(uid)
+    def _start_job_thread(self, job: AdminJob) -> None:
+        # Daemon thread: on shutdown the job stops and its lease expires, then it's resumed
+        threading.Thread(
+            target=self._run_reset_all_data,
+            args=(job,),
+            name=f"admin-job-{job.job_id}",
+            daemon=True
+        ).start()
+
+    def _checkpoint(self, job: AdminJob) -> None:
+        self.admin_job_repository.save(job, WORKER_ID, self.lease_seconds)
+
+    def _renew_lease_until(self, job: AdminJob, stopped: threading.Event) -> None:
+        """
+        Heartbeat of a running job: renews its lease three times per lease period, so
+        that a long step such as the leaderboard reset doesn't let it expire.
+        Stops when `stopped` is set or the lease is lost.
+        """
+        while not stopped.wait(self.lease_seconds / 3):
+            try:
+                if not self.admin_job_repository.renew_lease(job.job_id, WORKER_ID, self.lease_seconds):
+                    logger.warning("Lost the lease of job %s", job.job_id)
+                    return
+            except Exception:
+                logger.warning("Failed to renew the lease of job %s", job.job_id, exc_info=True)
+
+    def _run_reset_all_data(self, job: AdminJob) -> None:
+        """
+        Runs a reset job from its checkpoint, renewing its lease in background. Each step
+        is idempotent, so the work done after the last checkpoint is safely redone on resume.
+        If the lease is lost, the job is left to the process that took it over.
+        """
+        stopped = threading.Event()
+        threading.Thread(
+            target=self._renew_lease_until,
+            args=(job, stopped),
+            name=f"admin-job-{job.job_id}-heartbeat",
+            daemon=True
+        ).start()
+        try:
+            self._run_reset_steps(job)
+        finally:
+            stopped.set()
+
+    def _run_reset_steps(self, job: AdminJob) -> None:
+        try:
+            job.status = AdminJobStatus.RUNNING
+            if job.leaderboard is None:
+                job.phase = self.PHASE_LEADERBOARD
+                self._checkpoint(job)
+                job.leaderboard = self.leaderboard_repository.reset_all_scores()
+
+            job.phase = self.PHASE_USERS
+            if not job.total_users:
+                job.total_users = self.user_repository.count_all()
+            self._checkpoint(job)
+
+            while True:
+                uids = self.user_repository.read_ids_page(job.cursor, self.page_size)
+                if not uids:
+                    break
+                self.user_repository.reset_users_data(uids, self.parallelism)
+                job.cursor = uids[-1]
+                job.processed_users += len(uids)
+                self._checkpoint(job)
+
+            job.status = AdminJobStatus.COMPLETED
+            job.phase = None
+        except AdminJobLeaseLostError:
+            logger.warning("Job %s was taken over by another process, stopping", job.job_id)
+            return
+        except Exception as e:
+            logger.error("Job %s failed", job.job_id, exc_info=True)
+            job.status = AdminJobStatus.FAILED
+            job.error = str(e)
+
+        job.lease_owner = None
+        try:
+            self._checkpoint(job)
+        except Exception:
+            logger.error("Failed to save the final state of job %s", job.job_id, exc_info=True)
+
+    def replay_score_ledger(self, dry_run: bool = False, epoch: Optional[int] = None) -> ScoreReplaySummary:
+        """
+        Rebuilds the leaderboard scores from the score ledger of an epoch, the current one
+        by default, e.g. after a bad write, or from the previous epoch to undo a reset.
+        Close the leaderboard while it runs.
+        With dry_run only reports what would change.
+        """
+        return self.leaderboard_repository.replay_score_ledger(dry_run, epoch)
+
+    def backfill_quiz_state(self) -> int:
+        """
+        Migration to the user quiz state documents: copies the existing quiz
+        results and start times. Run it during the dual-write period, before
+        switching the quiz state mode to document.
+        Returns the number of users written.
+        """
+        return self.user_repository.backfill_quiz_state()
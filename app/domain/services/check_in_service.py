@@ -1,8 +1,7 @@
 from domain.entities.user import User
-from domain.services.group_service import GroupService
 from domain.services.user_service import UserService
 from domain.services.config_service import ConfigService
-from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+from infrastructure.repositories.check_in_repository import CheckInRepository
 from infrastructure.errors.config_errors import CheckInNotOpenError
 from infrastructure.errors.auth_errors import ForbiddenError
 
@@ -15,19 +14,19 @@ class CheckInService:
     def __init__(
         self,
         user_service: UserService,
-        group_service: GroupService,
         config_service: ConfigService,
-        leaderboard_repository: LeaderboardRepository
+        check_in_repository: CheckInRepository
     ):
         self.user_service = user_service
-        self.group_service = group_service
         self.config_service = config_service
-        self.leaderboard_repository = leaderboard_repository
+        self.check_in_repository = check_in_repository
 
 
     def check_in(self, uid: str) -> User:
         """
         Performs check-in assigning a group to the user to be checked in.
+        The group selection, the user update and the leaderboard entries are written
+        together, and the returned user is built from the data already read.
 
         Raises:
             CheckInNotOpenError: If check-in is currently closed
@@ -39,7 +38,7 @@ class CheckInService:
         if user.group is not None:
             # If user already has a group, ensure checked_in is True and return user
             if not user.checked_in:
-                self.user_service.update_user(uid, {"checked_in": True})
+                self.user_service.mark_checked_in(uid)
                 user.checked_in = True
             return user
 
@@ -47,31 +46,10 @@ class CheckInService:
         if not self.config_service.is_check_in_open():
             raise CheckInNotOpenError()
 
-        # Atomically find group and increment counter to prevent race conditions
-        selected_gid = self.group_service.increment_group_counter()
+        group = self.check_in_repository.check_in(uid, user.nickname)
+        if group is None:
+            # Checked in concurrently by another request
+            return self.user_service.read_user(uid)
 
-        # Assign the group to the user and update custom claims
-        updated_user = self.user_service.assign_group_to_user(uid, selected_gid)
-
-        # Create and update leaderboard entries using group data from updated_user
-        self._create_leaderboard_entries(updated_user, selected_gid)
-
-        return updated_user
-
-
-    def _create_leaderboard_entries(self, user: User, gid: str) -> None:
-        """
-        Helper method to create or update leaderboard entries for a user and a group.
-        """
-        if user.group:
-            group_name = user.group.get("name")
-            group_color = user.group.get("color")
-
-            if group_name and group_color:
-                self.leaderboard_repository.create_group_entry(
-                    group_id=gid,
-                    group_name=group_name,
-                    group_color=group_color
-                )
-
-                self.leaderboard_repository.update_user_group_color(user.uid, group_color)
+        self.user_service.invalidate_cached_tokens(uid)
+        return user.model_copy(update={"group": group, "checked_in": True})
@@ -1,14 +1,23 @@
+import asyncio
+import logging
 import random
+from typing import Optional
 
 from domain.entities.group import Group
+from domain.services.lease_service import LeaseService
 from infrastructure.repositories.group_repository import GroupRepository
 
+logger = logging.getLogger(__name__)
+
 
 class GroupService:
     """
     Service that manages all the operations related with a group
     """
 
+    # Lease of the user count rollup, run by a single process
+    USER_COUNT_ROLLUP_LEASE = "group_user_count_rollup"
+
     def __init__(
         self,
         group_repository: GroupRepository
@@ -64,3 +73,17 @@ class GroupService:
         """
         return self.group_repository.increment_group_counter()
 
+    async def run_user_count_rollup(self, interval: float, lease_service: Optional[LeaseService] = None) -> None:
+        """
+        Rolls the sharded group user counts up into the groups every `interval` seconds,
+        until cancelled. Failures are logged and retried at the next round.
+        With a lease service, only the process holding the rollup lease runs it.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if lease_service is not None and not await lease_service.holds(self.USER_COUNT_ROLLUP_LEASE, interval):
+                continue
+            try:
+                await asyncio.to_thread(self.group_repository.rollup_user_counts)
+            except Exception:
+                logger.warning("Group user count rollup failed", exc_info=True)
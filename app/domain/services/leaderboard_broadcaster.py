@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set, Union
+
+from domain.entities.leaderboard import Leaderboard, LeaderboardDiff, LeaderboardRank
+from domain.services.leaderboard_service import LeaderboardService
+from infrastructure.caches.leaderboard_cache import LeaderboardCache
+from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+
+logger = logging.getLogger(__name__)
+
+LeaderboardUpdate = Union[Leaderboard, LeaderboardDiff]
+
+
+class LeaderboardSubscription:
+    """
+    A subscriber of the leaderboard stream, with its bounded queue of updates.
+    A None in the queue means the subscription was closed.
+    Staff subscribers keep streaming while the leaderboard is closed.
+    """
+
+    def __init__(self, uid: Optional[str], gid: Optional[str], queue_size: int, is_staff: bool = False):
+        self.uid = uid
+        self.gid = gid
+        self.is_staff = is_staff
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.user_rank: Optional[LeaderboardRank] = None
+        self.group_rank: Optional[LeaderboardRank] = None
+        self.closed = False
+
+    def close(self) -> None:
+        """
+        Drops the queued updates and wakes up the consumer with the closing None.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class LeaderboardBroadcaster:
+    """
+    Fans the leaderboard out to the stream subscribers.
+
+    The leaderboard cache is fed by a single set of Firestore listeners per process.
+    Every `interval` seconds, if the cache changed, the broadcaster computes one diff of
+    the top `top_k` users and groups, adds the rank changes of each subscriber, and
+    queues it. Subscribers whose queue is full are too slow and get disconnected.
+    With a leaderboard service, the subscribers that are not staff are disconnected as
+    soon as the leaderboard is closed, like the readers of the leaderboard.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    def __init__(
+        self,
+        leaderboard_cache: LeaderboardCache,
+        leaderboard_repository: LeaderboardRepository,
+        interval: float,
+        queue_size: int,
+        top_k: int,
+        leaderboard_service: Optional[LeaderboardService] = None
+    ):
+        self.leaderboard_cache = leaderboard_cache
+        self.leaderboard_repository = leaderboard_repository
+        self.leaderboard_service = leaderboard_service
+        self.interval = interval
+        self.queue_size = queue_size
+        self.top_k = top_k
+        self._subscriptions: Set[LeaderboardSubscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._version: Optional[int] = None
+        self._top_users: Dict[str, LeaderboardRank] = {}
+        self._top_groups: Dict[str, LeaderboardRank] = {}
+
+    async def _ensure_fresh(self) -> None:
+        if not self.leaderboard_cache.is_fresh():
+            users, groups = await asyncio.gather(
+                asyncio.to_thread(self.leaderboard_repository.read_user_entries),
+                asyncio.to_thread(self.leaderboard_repository.read_group_entries),
+            )
+            self.leaderboard_cache.replace_all(users, groups)
+
+    async def subscribe(self, uid: Optional[str], gid: Optional[str], is_staff: bool = False) -> LeaderboardSubscription:
+        """
+        Registers a subscriber and queues the current leaderboard as its first update.
+        """
+        await self._ensure_fresh()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        subscription = LeaderboardSubscription(uid, gid, self.queue_size, is_staff)
+        leaderboard = self.leaderboard_cache.read(self.top_k, uid=uid, gid=gid)
+        if self._version is None:
+            # First subscriber: the next diffs start from this leaderboard
+            self._version = self.leaderboard_cache.version
+            self._top_users = self._ranked(leaderboard.top_users)
+            self._top_groups = self._ranked(leaderboard.top_groups)
+        subscription.user_rank = leaderboard.user_rank
+        subscription.group_rank = leaderboard.group_rank
+        subscription.queue.put_nowait(leaderboard)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LeaderboardSubscription) -> None:
+        self._subscriptions.discard(subscription)
+        subscription.close()
+        if not self._subscriptions:
+            # The ticks are skipped until the next subscriber, which sets a new base for the diffs
+            self._version = None
+
+    async def close(self) -> None:
+        """
+        Disconnects all the subscribers and stops broadcasting. Called on shutdown.
+        """
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @staticmethod
+    def _ranked(leaderboard_top: List, start: int = 1) -> Dict[str, LeaderboardRank]:
+        return {
+            entry.entry_id: LeaderboardRank(rank=position, entry=entry)
+            for position, entry in enumerate(leaderboard_top, start=start)
+        }
+
+    @staticmethod
+    def _changed(previous: Dict[str, LeaderboardRank], current: Dict[str, LeaderboardRank]) -> List[LeaderboardRank]:
+        return [rank for entry_id, rank in current.items() if previous.get(entry_id) != rank]
+
+    def _broadcast(self) -> None:
+        """
+        Computes the shared top diff once, then the personal rank changes of each subscriber.
+        """
+        leaderboard = self.leaderboard_cache.read(self.top_k)
+        top_users = self._ranked(leaderboard.top_users)
+        top_groups = self._ranked(leaderboard.top_groups)
+        users = self._changed(self._top_users, top_users)
+        groups = self._changed(self._top_groups, top_groups)
+        removed_users = [entry_id for entry_id in self._top_users if entry_id not in top_users]
+        removed_groups = [entry_id for entry_id in self._top_groups if entry_id not in top_groups]
+        self._top_users, self._top_groups = top_users, top_groups
+
+        for subscription in list(self._subscriptions):
+            personal = self.leaderboard_cache.read(0, uid=subscription.uid, gid=subscription.gid)
+            diff = LeaderboardDiff(
+                users=users,
+                groups=groups,
+                removed_users=removed_users,
+                removed_groups=removed_groups,
+                user_rank=personal.user_rank if personal.user_rank != subscription.user_rank else None,
+                group_rank=personal.group_rank if personal.group_rank != subscription.group_rank else None,
+            )
+            subscription.user_rank = personal.user_rank
+            subscription.group_rank = personal.group_rank
+            if diff.is_empty():
+                continue
+            try:
+                subscription.queue.put_nowait(diff)
+            except asyncio.QueueFull:
+                logger.info("Dropping slow leaderboard subscriber %s", subscription.uid)
+                self.unsubscribe(subscription)
+
+    async def _close_unauthorized(self) -> None:
+        """
+        Disconnects the subscribers that are not staff if the leaderboard was closed.
+        """
+        if self.leaderboard_service is None:
+            return
+        audience = [subscription for subscription in self._subscriptions if not subscription.is_staff]
+        if audience and not await asyncio.to_thread(self.leaderboard_service.is_leaderboard_open):
+            for subscription in audience:
+                self.unsubscribe(subscription)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._subscriptions:
+                continue
+            try:
+                await self._close_unauthorized()
+                if not self._subscriptions:
+                    continue
+                await self._ensure_fresh()
+                version = self.leaderboard_cache.version
+                if version == self._version:
+                    continue
+                self._version = version
+                self._broadcast()
+            except Exception:
+                logger.warning("Leaderboard broadcast failed", exc_info=True)
@@ -1,25 +1,237 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import List, Optional
+
+from cachetools import TTLCache
+
+from infrastructure.caches.leaderboard_cache import LeaderboardCache
+from infrastructure.caches.score_epoch_cache import ScoreEpochCache
+from infrastructure.errors.config_errors import LeaderboardNotOpenError
+from infrastructure.errors.leaderboard_errors import LeaderboardSnapshotNotFoundError
+from infrastructure.repositories.config_repository import ConfigRepository
 from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+from domain.entities.leaderboard import Leaderboard
+from domain.entities.leaderboard_snapshot import LeaderboardSnapshot
+from domain.entities.role import Role
+from domain.entities.score_event import ScoreEvent
 from domain.entities.user import User
+from domain.services.lease_service import LeaseService
+from domain.services.score_aggregator import ScoreAggregator
+
+logger = logging.getLogger(__name__)
 
 class LeaderboardService:
 
+    # The leaderboard_open flag is polled together with the leaderboard, cache it for a few seconds
+    LEADERBOARD_OPEN_CACHE_KEY = "leaderboard_open"
+    leaderboard_open_cache = TTLCache(maxsize=1, ttl=10)
+
+    # Leases of the background loops run by a single process
+    GROUP_SCORE_ROLLUP_LEASE = "group_score_rollup"
+    SNAPSHOT_LEASE = "leaderboard_snapshots"
+
     def __init__(
         self,
-        leaderboard_repository: LeaderboardRepository
+        leaderboard_repository: LeaderboardRepository,
+        score_aggregator: Optional[ScoreAggregator] = None,
+        leaderboard_cache: Optional[LeaderboardCache] = None,
+        config_repository: Optional[ConfigRepository] = None,
+        score_epoch_cache: Optional[ScoreEpochCache] = None
     ):
         self.leaderboard_repository = leaderboard_repository
+        self.score_aggregator = score_aggregator
+        self.leaderboard_cache = leaderboard_cache
+        self.config_repository = config_repository
+        self.score_epoch_cache = score_epoch_cache
+
+
+    def _current_epoch(self) -> int:
+        if self.score_epoch_cache is not None:
+            return self.score_epoch_cache.get()
+        return self.leaderboard_repository.read_score_epoch()
+
 
+    async def _current_epoch_async(self) -> int:
+        if self.score_epoch_cache is not None:
+            return await self.score_epoch_cache.get_async()
+        return await self.leaderboard_repository.read_score_epoch_async()
 
-    def add_points(self, user: User, score: int) -> None:
+
+    def _new_score_event(self, user: User, score: int, epoch: int, event_id: Optional[str]) -> ScoreEvent:
+        return ScoreEvent(
+            event_id=event_id or uuid.uuid4().hex,
+            uid=user.uid,
+            gid=(user.group or {}).get("gid"),
+            points=score,
+            created_at=int(time.time() * 1000),
+            epoch=epoch
+        )
+
+
+    def add_points(self, user: User, score: int, event_id: Optional[str] = None) -> bool:
         """
         Updates leaderboard scores for user and group atomically.
 
         Args:
             user (User): The user to add points to
             score (int): The points to add
+            event_id (str): Idempotency key of what awarded the points, e.g. ScoreEvent.quiz_event_id
+
+        The points are recorded in the score ledger of the current epoch under `event_id`:
+        points already recorded for the same key since the last reset are not added again,
+        and False is returned. No points record nothing and return False as well.
+        With the score aggregator the ledger entry is recorded as pending
+        and applied to the leaderboard in the next batched flush.
+        """
+        if score == 0:
+            return False
+        epoch = self._current_epoch()
+        if self.score_aggregator is not None:
+            return self.score_aggregator.add(user.uid, (user.group or {}).get("gid"), score, epoch, event_id)
+
+        return self.leaderboard_repository.record_score_event(self._new_score_event(user, score, epoch, event_id))
+
+
+    async def add_points_async(self, user: User, score: int, event_id: Optional[str] = None) -> bool:
+        """
+        Async variant of add_points, for use inside async endpoints.
+
+        Args:
+            user (User): The user to add points to
+            score (int): The points to add
+            event_id (str): Idempotency key of what awarded the points, e.g. ScoreEvent.quiz_event_id
+        """
+        if score == 0:
+            return False
+        epoch = await self._current_epoch_async()
+        if self.score_aggregator is not None:
+            return await self.score_aggregator.add_async(user.uid, (user.group or {}).get("gid"), score, epoch, event_id)
+
+        return await self.leaderboard_repository.record_score_event_async(self._new_score_event(user, score, epoch, event_id))
+
+
+    def is_leaderboard_open(self) -> bool:
+        if self.LEADERBOARD_OPEN_CACHE_KEY not in self.leaderboard_open_cache:
+            self.leaderboard_open_cache[self.LEADERBOARD_OPEN_CACHE_KEY] = self.config_repository.read_config().leaderboard_open
+        return self.leaderboard_open_cache[self.LEADERBOARD_OPEN_CACHE_KEY]
+
+
+    @staticmethod
+    def is_staff(user: User) -> bool:
+        return user.role is not None and user.role.is_authorized(Role.STAFF)
+
+
+    def check_leaderboard_access(self, user: User) -> None:
+        """
+        While the leaderboard is closed only staff can read it.
+
+        Raises:
+            LeaderboardNotOpenError: if the leaderboard is closed and the user is not staff
         """
-        self.leaderboard_repository.increment_user_score(user.uid, score)
+        if not self.is_staff(user) and not self.is_leaderboard_open():
+            raise LeaderboardNotOpenError()
+
+
+    def read_leaderboard(self, user: User, limit: int) -> Leaderboard:
+        """
+        Returns the top `limit` users and groups, with the rank of the user and of their group.
+
+        Raises:
+            LeaderboardNotOpenError: if the leaderboard is closed and the user is not staff
+        """
+        self.check_leaderboard_access(user)
+
+        if not self.leaderboard_cache.is_fresh():
+            self.leaderboard_cache.replace_all(
+                self.leaderboard_repository.read_user_entries(),
+                self.leaderboard_repository.read_group_entries()
+            )
+
+        return self.leaderboard_cache.read(limit, uid=user.uid, gid=(user.group or {}).get("gid"))
+
+
+    async def run_group_score_rollup(self, interval: float, lease_service: Optional[LeaseService] = None) -> None:
+        """
+        Rolls the sharded group scores up into the groups every `interval` seconds,
+        until cancelled. Failures are logged and retried at the next round.
+        With a lease service, only the process holding the rollup lease runs it.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if lease_service is not None and not await lease_service.holds(self.GROUP_SCORE_ROLLUP_LEASE, interval):
+                continue
+            try:
+                await asyncio.to_thread(self.leaderboard_repository.rollup_group_scores)
+            except Exception:
+                logger.warning("Group score rollup failed", exc_info=True)
+
+
+    def take_snapshot(self, interval: float, max_users: Optional[int] = None) -> Optional[LeaderboardSnapshot]:
+        """
+        Stores a ranked snapshot of the leaderboard, timed at the start of the current
+        `interval`. Each interval gets one snapshot, whichever instance takes it first.
+        Ranking is a single sort, O(n log n) in the number of entries.
+        Returns the stored snapshot, or None if the interval already had one.
+        """
+        interval_ms = int(interval * 1000)
+        taken_at = int(time.time() * 1000) // interval_ms * interval_ms
+        if self.leaderboard_repository.snapshot_exists(taken_at):
+            return None
+
+        snapshot = LeaderboardSnapshot.from_entries(
+            taken_at,
+            self.leaderboard_repository.read_user_entries(),
+            self.leaderboard_repository.read_group_entries(),
+            max_users=max_users
+        )
+        return snapshot if self.leaderboard_repository.create_snapshot(snapshot) else None
+
+
+    async def run_snapshots(
+        self, interval: float, max_users: Optional[int] = None, lease_service: Optional[LeaseService] = None
+    ) -> None:
+        """
+        Takes a leaderboard snapshot at the start of every `interval` seconds, until cancelled.
+        Failures are logged and retried at the next round.
+        With a lease service, only the process holding the snapshot lease takes them.
+        """
+        while True:
+            if lease_service is None or await lease_service.holds(self.SNAPSHOT_LEASE, interval):
+                try:
+                    await asyncio.to_thread(self.take_snapshot, interval, max_users)
+                except Exception:
+                    logger.warning("Leaderboard snapshot failed", exc_info=True)
+            await asyncio.sleep(interval - time.time() % interval)
+
+
+    def read_snapshot_at(self, timestamp: int, limit: int) -> LeaderboardSnapshot:
+        """
+        Returns the leaderboard as it was at the given time (milliseconds), from the last
+        snapshot taken at or before it, with its top `limit` users and groups.
+
+        Raises:
+            LeaderboardSnapshotNotFoundError: if no snapshot was taken before that time
+        """
+        snapshot = self.leaderboard_repository.read_snapshot_at(timestamp)
+        if snapshot is None:
+            raise LeaderboardSnapshotNotFoundError()
+        return self._truncated(snapshot, limit)
+
+
+    def read_snapshots(self, start: int, end: int, limit: int, max_snapshots: int) -> List[LeaderboardSnapshot]:
+        """
+        Returns the first `max_snapshots` snapshots taken between start and end
+        (milliseconds, inclusive), oldest first, with their top `limit` users and groups.
+        """
+        return [
+            self._truncated(snapshot, limit)
+            for snapshot in self.leaderboard_repository.read_snapshots(start, end, max_snapshots)
+        ]
+
+
+    @staticmethod
+    def _truncated(snapshot: LeaderboardSnapshot, limit: int) -> LeaderboardSnapshot:
+        return snapshot.model_copy(update={"users": snapshot.users[:limit], "groups": snapshot.groups[:limit]})
 
-        if user.group and user.group.get("gid"):
-            group_id = user.group.get("gid")
-            self.leaderboard_repository.increment_group_score(group_id, score)
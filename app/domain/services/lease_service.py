@@ -0,0 +1,43 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+from infrastructure.repositories.lease_repository import LeaseRepository
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process as the owner of the leases
+WORKER_ID: str = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class LeaseService:
+    """
+    Service that elects a single runner for the background loops started by every
+    worker, such as the rollups and the leaderboard snapshots.
+
+    Each round, a loop asks whether this process holds its lease, which takes or renews
+    it: the holder keeps it by running every round, and when it stops, another
+    process takes over once the lease expired.
+    """
+
+    # Lease duration, in rounds of the loop: a stopped holder is replaced after one or two rounds
+    LEASE_ROUNDS: float = 1.5
+
+    def __init__(self, lease_repository: LeaseRepository, owner: str = WORKER_ID):
+        self.lease_repository = lease_repository
+        self.owner = owner
+
+    async def holds(self, name: str, interval: float) -> bool:
+        """
+        Whether this process should run the round of the `name` loop, which runs every
+        `interval` seconds. Failures are logged and skip the round.
+        """
+        try:
+            return await asyncio.to_thread(
+                self.lease_repository.acquire, name, self.owner, interval * self.LEASE_ROUNDS
+            )
+        except Exception:
+            logger.warning("Failed to acquire the %s lease", name, exc_info=True)
+            return False
@@ -1,3 +1,4 @@
+import asyncio
 import time
 import uuid
 from typing import Optional
@@ -5,13 +6,17 @@ from typing import Optional
 from domain.entities.quiz import Quiz
 from domain.entities.quiz_result import QuizResult
 from domain.entities.quiz_start_time import QuizStartTime
+from domain.entities.score_event import ScoreEvent
+from core.timing import measure, measure_async
 from fastapi import status
 from infrastructure.errors.quiz_errors import (
     InvalidAnswerListError,
     QuizAlreadySubmittedError,
     QuizTimeUpError,
+    QuizStartTimeNotFoundError,
     ReadQuizError,
     QuizAllSessionsAlreadyCompletedError,
+    SessionSlotsNotReadyError,
 )
 from infrastructure.repositories.config_repository import ConfigRepository
 from infrastructure.repositories.quiz_repository import QuizRepository
@@ -103,7 +108,7 @@ class QuizService:
 
         return points
 
-    def _read_quiz(
+    async def _read_quiz(
         self, quiz_id: str, not_open_status: int = status.HTTP_403_FORBIDDEN
     ) -> Quiz:
         """
@@ -115,7 +120,7 @@ class QuizService:
             not_open_status: HTTP status code to use when quiz is not open (default: 403)
         """
 
-        quiz = self.quiz_repository.read(quiz_id)
+        quiz = await self.quiz_repository.read_async(quiz_id)
 
         # Check if quiz is open
         #if not quiz.is_open:
@@ -180,20 +185,25 @@ class QuizService:
             QuizTimeUpError: if timer has expired (timer_duration is 0)
             QuizAllSessionsAlreadyCompletedError: if user already has all quiz sessions
         """
-        # Ensure sessions are synced (cached for TTL period)
-        await self.session_service.ensure_sessions_synced()
-
-        # Read quiz (checks if open)
-        quiz = self._read_quiz(quiz_id)
+        # Sessions are synced in background, only make sure the slots are loaded.
+        # Before the first sync there are none, and reading is not restricted.
+        with measure("session_slots"):
+            await self.session_service.ensure_slots_loaded()
+
+        # Quiz, user quiz progress and the quiz -> session map don't depend
+        # on each other: read them concurrently
+        with measure("reads"):
+            quiz, progress, quiz_session_map = await asyncio.gather(
+                measure_async("quiz", self._read_quiz(quiz_id)),
+                measure_async("quiz_progress", self.user_repository.get_quiz_progress_async(user_id, quiz_id)),
+                measure_async("session_map", self.quiz_repository.read_session_map_async()),
+            )
+        start_time = progress.start_time
+        completed_slots = self._get_completed_slots(progress.completed_quiz_ids, quiz_session_map)
 
         # Check if user has already submitted this quiz
-        existing_result = self.user_repository.get_quiz_result(user_id, quiz_id)
-        if existing_result:
-            raise QuizAlreadySubmittedError("You have already submitted this quiz")
+        self._validate_submission(progress.result)
 
-        # Check if user already has a start time
-        start_time = self.user_repository.get_quiz_start_time(user_id, quiz_id)
-        
         # Check if user has already completed all slots for this quiz session
         # Only check if user hasn't started the quiz yet (start_time is None)
         # If they started, they should be allowed to continue/finish even if slots are taken (edge case?)
@@ -202,7 +212,6 @@ class QuizService:
         # So we should check it.
         
         current_session_slots = self.session_service.get_slots_for_session(quiz.session_id)
-        completed_slots = self._get_user_completed_slots(user_id)
         
         # Filter current slots excluding those in completed slots
         new_slots = [s for s in current_session_slots if s not in completed_slots]
@@ -216,7 +225,8 @@ class QuizService:
         if not start_time:
             # First time: create start time
             start_time = QuizStartTime(started_at=current_time)
-            self.user_repository.save_quiz_start_time(user_id, quiz_id, start_time)
+            with measure("save_start_time"):
+                await self.user_repository.save_quiz_start_time_async(user_id, quiz_id, start_time)
         else:
             # Calculate remaining time and update quiz timer_duration
             elapsed_time = current_time - start_time.started_at
@@ -241,15 +251,39 @@ class QuizService:
 
         Validations:
         - Quiz must be open (returns 423 if not open)
-        - User must not have already submitted
+        - User must not have already submitted, unless the points of the saved result
+          were never recorded: a retry after a failed leaderboard update records them
         - Answer list length must match question count
         - Timer must not have expired (with backoff grace period)
+        - Session slots must have been synced at least once (returns 503 if not)
         """
-        # Read quiz and run all validations (use 423 for not open during submit)
-        quiz = self._read_quiz(quiz_id, not_open_status=status.HTTP_423_LOCKED)
-        self._validate_submission(user_id, quiz_id)
+        # Issue all independent reads concurrently (use 423 for not open during submit)
+        with measure("reads"):
+            quiz, progress, quiz_session_map, user, slots_loaded = await asyncio.gather(
+                measure_async("quiz", self._read_quiz(quiz_id, not_open_status=status.HTTP_423_LOCKED)),
+                measure_async("quiz_progress", self.user_repository.get_quiz_progress_async(user_id, quiz_id)),
+                measure_async("session_map", self.quiz_repository.read_session_map_async()),
+                measure_async("user", self.user_repository.read_async(user_id)),
+                # Submits don't sync, but the slots are needed for the multiplier
+                measure_async("session_slots", self.session_service.ensure_slots_loaded()),
+            )
+        completed_slots = self._get_completed_slots(progress.completed_quiz_ids, quiz_session_map)
+
+        # Without slots the multiplier would be zero: don't record a zero score
+        if not slots_loaded:
+            raise SessionSlotsNotReadyError()
+
+        if progress.result is not None:
+            # A previous submit may have failed after saving its result: award its points now,
+            # the score ledger records them at most once
+            event_id = ScoreEvent.quiz_event_id(user_id, quiz_id)
+            if await self.leaderboard_service.add_points_async(user, progress.result.score, event_id):
+                return progress.result.score, progress.result.max_score
+
+        # Run all validations
+        self._validate_submission(progress.result)
         self._validate_answers(answers, quiz)
-        current_time = self._validate_timer(user_id, quiz_id, quiz)
+        current_time = self._validate_timer(progress.start_time, quiz)
 
         # Calculate base score
         score, max_score = self._calculate_score(quiz, answers)
@@ -258,9 +292,7 @@ class QuizService:
         # 1. Get slots for current session
         current_session_slots = self.session_service.get_slots_for_session(quiz.session_id)
         
-        # 2. Get slots for all completed quizzes
-        completed_slots = self._get_user_completed_slots(user_id)
-        
+        # 2. Compare with slots for all completed quizzes
         new_slots = []
         for slot in current_session_slots:
             if slot not in completed_slots:
@@ -279,34 +311,25 @@ class QuizService:
             quiz_title=quiz.title,
             submitted_at=current_time,
         )
-        self.user_repository.save_quiz_result(user_id, quiz_id, result)
+        with measure("save_result"):
+            await self.user_repository.save_quiz_result_async(user_id, quiz_id, result)
 
         # Update leaderboard scores atomically
-        self._update_leaderboard_scores(user_id, score)
+        with measure("leaderboard"):
+            await self.leaderboard_service.add_points_async(user, score, ScoreEvent.quiz_event_id(user_id, quiz_id))
 
         return score, max_score
 
 
 
-    def _update_leaderboard_scores(self, user_id: str, score: int) -> None:
-        """
-        Updates leaderboard scores for user and group atomically.
-
-        Args:
-            user_id (str): The user's UID
-            score (int): The points to add
-        """
-        user = self.user_repository.read(user_id)
-        self.leaderboard_service.add_points(user, score)
-
-    def _validate_submission(self, user_id: str, quiz_id: str) -> None:
+    def _validate_submission(self, existing_result: Optional[QuizResult]) -> None:
         """
-        Validates that the user hasn't already submitted this quiz.
+        Validates that the user hasn't already submitted this quiz,
+        given the result read for the user and quiz.
 
         Raises:
             QuizAlreadySubmittedError: if quiz was already submitted by this user
         """
-        existing_result = self.user_repository.get_quiz_result(user_id, quiz_id)
         if existing_result:
             raise QuizAlreadySubmittedError("You have already submitted this quiz")
 
@@ -323,9 +346,10 @@ class QuizService:
                 f"question count ({len(quiz.question_list)})"
             )
 
-    def _validate_timer(self, user_id: str, quiz_id: str, quiz: Quiz) -> int:
+    def _validate_timer(self, start_time: Optional[QuizStartTime], quiz: Quiz) -> int:
         """
-        Validates that the quiz timer hasn't expired (with backoff grace period).
+        Validates that the quiz timer hasn't expired (with backoff grace period),
+        given the start time read for the user and quiz.
         Returns the current time in milliseconds.
 
         Raises:
@@ -333,7 +357,6 @@ class QuizService:
             QuizTimeUpError: if the timer has expired
         """
         # Check quiz start time exists
-        start_time = self.user_repository.get_quiz_start_time(user_id, quiz_id)
         if not start_time:
             raise QuizStartTimeNotFoundError(
                 "Quiz start time not found. Please access the quiz first."
@@ -366,22 +389,14 @@ class QuizService:
             
         return score, max_score
 
-    def _get_user_completed_slots(self, user_id: str) -> set:
+    def _get_completed_slots(self, completed_quiz_ids: list[str], quiz_session_map: dict[str, str]) -> set:
         """
-        Retrieves all slots from sessions of quizzes completed by the user.
+        Retrieves all slots from sessions of the quizzes completed by the user,
+        given the completed quiz ids and the quiz -> session map.
         """
-        completed_quiz_ids = self.user_repository.get_completed_quiz_ids(user_id)
-        
-        # Optimization: Read all quizzes once
-        all_quizzes = self.quiz_repository.read_all()
-        quiz_session_map = {q.quiz_id: q.session_id for q in all_quizzes}
-        
         completed_slots = set()
         for c_quiz_id in completed_quiz_ids:
             if c_quiz_id in quiz_session_map:
-                s_id = quiz_session_map[c_quiz_id]
-                s_slots = self.session_service.get_slots_for_session(s_id)
-                for slot in s_slots:
-                    completed_slots.add(slot)
+                completed_slots |= self.session_service.get_slots_for_session(quiz_session_map[c_quiz_id])
         return completed_slots
 
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from domain.entities.score_event import ScoreEvent
+from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+
+logger = logging.getLogger(__name__)
+
+# Each event costs up to 3 writes in the flush transaction (its ledger entry, its user
+# and its group) and Firestore transactions are limited to 500 writes
+MAX_EVENTS_PER_FLUSH: int = 150
+
+
+class ScoreAggregator:
+    """
+    Write-behind aggregator for leaderboard points.
+
+    Points are first recorded as pending entries of the score ledger, one write on the
+    request path, so they survive a crash, and then applied in batches by a background
+    thread: every `flush_interval` seconds or as soon as `max_pending` events are waiting.
+    A flush sums the events per user and per group, so each hot leaderboard document,
+    above all the group ones, is written once per flush instead of once per event.
+    It doesn't save writes: each event is still written twice, once when recorded and
+    once when its pending marker is cleared, plus one increment per user and per group
+    of the flush.
+
+    Pending events left by a stopped process are applied by any running
+    aggregator once they are older than `recovery_age` seconds.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    def __init__(
+        self,
+        leaderboard_repository: LeaderboardRepository,
+        flush_interval: float,
+        max_pending: int,
+        recovery_age: int
+    ):
+        self.leaderboard_repository = leaderboard_repository
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.recovery_age = recovery_age
+        self._pending: List[ScoreEvent] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._recovered_at = 0.0
+
+    def start(self) -> None:
+        """
+        Starts the flushing thread, if not running yet.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="score-aggregator", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """
+        Stops the flushing thread after draining the pending events. Called on shutdown.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _new_event(self, uid: str, gid: Optional[str], points: int, epoch: int, event_id: Optional[str]) -> ScoreEvent:
+        return ScoreEvent(
+            event_id=event_id or uuid.uuid4().hex,
+            uid=uid,
+            gid=gid,
+            points=points,
+            created_at=int(time.time() * 1000),
+            epoch=epoch
+        )
+
+    def _enqueue(self, event: ScoreEvent) -> None:
+        with self._lock:
+            self._pending.append(event)
+            pending = len(self._pending)
+        if pending >= self.max_pending:
+            self._wakeup.set()
+
+    def add(self, uid: str, gid: Optional[str], points: int, epoch: int = 0, event_id: Optional[str] = None) -> bool:
+        """
+        Records points for a user and their group in the given score epoch, the current one.
+        Returns once the event is durable. An `event_id` already recorded in the score
+        ledger of the epoch is ignored and False is returned.
+        """
+        self.start()
+        event = self.leaderboard_repository.create_score_event(self._new_event(uid, gid, points, epoch, event_id))
+        if event is None:
+            return False
+        self._enqueue(event)
+        return True
+
+    async def add_async(self, uid: str, gid: Optional[str], points: int, epoch: int = 0, event_id: Optional[str] = None) -> bool:
+        """
+        Async variant of add.
+        """
+        self.start()
+        event = await self.leaderboard_repository.create_score_event_async(self._new_event(uid, gid, points, epoch, event_id))
+        if event is None:
+            return False
+        self._enqueue(event)
+        return True
+
+    def flush(self) -> int:
+        """
+        Applies all the pending events. Events of a failed batch are kept for the next flush.
+        Returns the number of events applied.
+        """
+        with self._lock:
+            events, self._pending = self._pending, []
+
+        applied = 0
+        for start in range(0, len(events), MAX_EVENTS_PER_FLUSH):
+            batch = events[start:start + MAX_EVENTS_PER_FLUSH]
+            try:
+                applied += self.leaderboard_repository.apply_score_events([event.ledger_id() for event in batch])
+            except Exception:
+                logger.warning("Failed to flush %d score events, retrying later", len(batch), exc_info=True)
+                with self._lock:
+                    self._pending.extend(batch)
+        return applied
+
+    def recover(self) -> int:
+        """
+        Applies the pending events older than `recovery_age`, left behind by stopped processes.
+        Returns the number of events applied.
+        """
+        created_before = int((time.time() - self.recovery_age) * 1000)
+        applied = 0
+        while True:
+            event_ids = self.leaderboard_repository.read_pending_score_event_ids(created_before, MAX_EVENTS_PER_FLUSH)
+            if not event_ids:
+                return applied
+            count = self.leaderboard_repository.apply_score_events(event_ids)
+            applied += count
+            if count == 0:
+                # Someone else applied them in the meantime
+                return applied
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if time.time() - self._recovered_at >= self.recovery_age:
+                self._recovered_at = time.time()
+                try:
+                    self.recover()
+                except Exception:
+                    logger.warning("Pending score events recovery failed", exc_info=True)
+
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
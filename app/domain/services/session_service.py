@@ -1,67 +1,112 @@
 from datetime import datetime, timedelta
-from typing import Dict, List
+from bisect import bisect_right
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from math import ceil
 from collections import defaultdict
 import asyncio
-from cachetools import TTLCache
+import logging
+import random
+import time
 
+from infrastructure.caches.session_slot_cache import SessionSlotCache
 from infrastructure.clients.sessionize_client import SessionizeClient
 from domain.entities.session import Session
+from domain.entities.session_slot_map import SessionSlotMap
+from domain.entities.session_sync import SessionSync
 from domain.entities.slot import Slot
 from infrastructure.repositories.quiz_repository import QuizRepository
 from infrastructure.errors.quiz_errors import UpdateQuizError
 
+logger = logging.getLogger(__name__)
+
 class SessionService:
     """
     Service that syncs Sessionize sessions with quizzes
     """
 
-    # Cache with 10 minutes TTL (600 seconds)
-    SYNC_CACHE_KEY = "sessions_synced"
-    sync_cache = TTLCache(maxsize=1, ttl=600)
-    sync_lock = asyncio.Lock()  # Lock to prevent concurrent syncs
-    
-    _session_slots_map: Dict[str, List[Slot]] = {}
+    sync_lock = asyncio.Lock()  # Lock to prevent concurrent syncs in this process
+    # Seconds before a failed background sync is retried
+    SYNC_RETRY_DELAY: float = 30.0
 
     def __init__(
         self,
         sessionize_client: SessionizeClient,
-        quiz_repository: QuizRepository
+        quiz_repository: QuizRepository,
+        session_slot_cache: Optional[SessionSlotCache] = None,
+        sync_interval: float = 600
     ):
         self.sessionize_client = sessionize_client
         self.quiz_repository = quiz_repository
+        # Without the shared cache, the slots only live in this service
+        self.session_slot_cache = session_slot_cache if session_slot_cache is not None else SessionSlotCache()
+        self.sync_interval = sync_interval
 
-    async def ensure_sessions_synced(self) -> None:
+    def _sync_age(self) -> float:
         """
-        Ensures sessions are synced with quizzes. Uses cache to avoid repeated syncs.
-        First call triggers sync, subsequent calls within TTL period are cached.
+        Seconds since the last sync by any instance, as told by the shared slot map.
         """
-        # Check cache first
-        if self.SYNC_CACHE_KEY in self.sync_cache:
-            return  # Already synced recently
+        return time.time() - self.session_slot_cache.synced_at / 1000
 
-        # Acquire lock to prevent concurrent syncs
+    async def sync_sessions(self) -> SessionSync:
+        """
+        Syncs the Sessionize sessions with the quizzes right away, e.g. after the
+        schedule changed. The other instances pick the new slots up from the shared map.
+        """
         async with self.sync_lock:
-            # Double-check cache after acquiring lock (another request might have synced)
-            if self.SYNC_CACHE_KEY in self.sync_cache:
-                return
+            return await self.map_sessions_to_quizzes()
 
-            # Perform sync
+    async def _sync_if_stale(self) -> None:
+        """
+        Syncs unless any instance synced within the sync interval.
+        """
+        if self._sync_age() < self.sync_interval:
+            return
+        async with self.sync_lock:
+            # Double-check after acquiring lock (another task or instance might have synced)
+            if self._sync_age() < self.sync_interval:
+                return
+            await asyncio.to_thread(self.session_slot_cache.load)
+            if self._sync_age() < self.sync_interval:
+                return
             await self.map_sessions_to_quizzes()
 
-            # Mark as synced in cache (TTL automatically handles expiration)
-            self.sync_cache[self.SYNC_CACHE_KEY] = True
+    async def run_sync_scheduler(self, jitter: float) -> None:
+        """
+        Syncs in background every sync interval, plus a random delay of up to `jitter`
+        seconds so that the instances don't all sync at once: the first one due syncs,
+        the others see its result in the shared map and wait for the next round.
+        Failures are logged and retried after SYNC_RETRY_DELAY seconds, until cancelled.
+        """
+        while True:
+            try:
+                await self._sync_if_stale()
+                delay = max(self.sync_interval - self._sync_age(), 0)
+            except Exception:
+                logger.warning("Sessionize sync failed", exc_info=True)
+                delay = self.SYNC_RETRY_DELAY
+            await asyncio.sleep(delay + random.uniform(0, jitter))
+
+    async def ensure_slots_loaded(self) -> bool:
+        """
+        Ensures the session slots synced by any instance are available to the request
+        paths, reading the shared map if this process has none yet. Never syncs: until
+        the background scheduler publishes the first map there are no slots.
+        Returns whether slots are loaded.
+        """
+        if self.session_slot_cache.is_loaded():
+            return True
+        return await asyncio.to_thread(self.session_slot_cache.load)
 
 
-    async def map_sessions_to_quizzes(self) -> List[Session]:
+    async def map_sessions_to_quizzes(self) -> SessionSync:
         """
         Maps Sessionize sessions to quizzes by updating quiz sessions field.
 
         Returns:
-            List of sessions
+            The sessions and the number of updated quizzes
         """
-        # Get all sessions from all groups
-        grid_smart_data = await self.sessionize_client.get_grid_smart()
+        # Get all sessions from all groups, fetched now rather than a cached copy
+        grid_smart_data = await self.sessionize_client.get_grid_smart(fresh=True)
         # Extract all sessions from all groups
         all_raw_sessions = []
         for day_data in grid_smart_data:
@@ -70,13 +115,16 @@ class SessionService:
         # Parse sessions
         sessions = [Session.from_dict(session) for session in all_raw_sessions]
 
-        # Update quizzes with sessions
-        self._update_quizzes_with_sessions(sessions)
+        # Update quizzes with sessions (sync Firestore calls, kept off the event loop)
+        updated_quizzes = await asyncio.to_thread(self._update_quizzes_with_sessions, sessions)
+        logger.info("Synced %d sessions, %d quizzes updated", len(sessions), updated_quizzes)
 
-        # Calculate and map slots
-        self._calculate_and_map_slots(sessions)
+        # Calculate and map slots, then share them with the other instances
+        synced_at = int(time.time() * 1000)
+        slot_map = SessionSlotMap(slots=self._calculate_and_map_slots(sessions), synced_at=synced_at)
+        await asyncio.to_thread(self.session_slot_cache.publish, slot_map)
 
-        return sessions
+        return SessionSync(sessions=sessions, updated_quizzes=updated_quizzes, synced_at=synced_at)
 
 
     def _filter_sessions(self, sessions: List[Session]) -> List[Session]:
@@ -149,9 +197,11 @@ class SessionService:
 
         return sessions
 
-    def _update_quizzes_with_sessions(self, sessions: List[Session]):
+    def _update_quizzes_with_sessions(self, sessions: List[Session]) -> int:
         """
         Updates quizzes with session tags based on session_id.
+        Only the quizzes whose stored tags differ are written, in a single batch.
+        Returns the number of updated quizzes.
         """
         # Read all quizzes
         all_quizzes = self.quiz_repository.read_all()
@@ -162,96 +212,92 @@ class SessionService:
             for session in sessions
         }
 
-        # Update each quiz that has a matching session_id
-        # Update each quiz that has a matching session_id
-        for quiz in all_quizzes:
-            if quiz.session_id in session_mapping:
-                sessions_tags = session_mapping[quiz.session_id]
-                self.quiz_repository.update(
-                    quiz.quiz_id,
-                    {"sessions": sessions_tags}
-                )
-
-    def get_slots_for_session(self, session_id: str) -> List[Slot]:
+        # Diff each quiz that has a matching session_id with its stored tags
+        changed = {
+            quiz.quiz_id: session_mapping[quiz.session_id]
+            for quiz in all_quizzes
+            if quiz.session_id in session_mapping and quiz.sessions != session_mapping[quiz.session_id]
+        }
+        self.quiz_repository.update_sessions(all_quizzes, changed)
+        return len(changed)
+
+    def get_slots_for_session(self, session_id: str) -> FrozenSet[Slot]:
         """
-        Returns the list of slots associated with a session.
+        Returns the set of slots associated with a session.
         """
-        return self._session_slots_map.get(session_id, [])
+        return self.session_slot_cache.get(session_id)
 
-    def _calculate_and_map_slots(self, sessions: List[Session]):
+    @staticmethod
+    def _merge_intervals(sessions: List[Session]) -> List[Tuple[datetime, datetime]]:
+        """
+        Merges the overlapping or touching time intervals of the sessions into
+        disjoint intervals, sorted by start.
+        """
+        merged: List[Tuple[datetime, datetime]] = []
+        for session in sorted(sessions, key=lambda s: s.starts_at):
+            if merged and session.starts_at <= merged[-1][1]:
+                if session.ends_at > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], session.ends_at)
+            else:
+                merged.append((session.starts_at, session.ends_at))
+        return merged
+
+    def _calculate_and_map_slots(self, sessions: List[Session]) -> Dict[str, List[Slot]]:
         """
         Calculates slots based on minimum session duration and maps them to sessions.
+        Returns the session_id -> slots map.
+
+        Slots are laid from each session's start, in steps of the minimum duration,
+        skipping the service sessions: these are merged into disjoint sorted intervals
+        once, then each session is swept against them, so the cost is linear in the
+        number of slots plus a binary search per session.
         """
         # 0. Clean session times (strip seconds/microseconds) for accurate slot calculation
         for s in sessions:
-            s.starts_at = s.starts_at.replace(second=0, microsecond=0)
-            s.ends_at = s.ends_at.replace(second=0, microsecond=0)
+            if s.starts_at.second or s.starts_at.microsecond:
+                s.starts_at = s.starts_at.replace(second=0, microsecond=0)
+            if s.ends_at.second or s.ends_at.microsecond:
+                s.ends_at = s.ends_at.replace(second=0, microsecond=0)
 
         # 1. Find minimum session duration (excluding service sessions)
         # We consider service sessions as those marked as is_service_session or is_plenum_session
         non_service_sessions = [
-            s for s in sessions 
+            s for s in sessions
             if not s.is_service_session and not s.is_plenum_session
         ]
-        
         if not non_service_sessions:
-            return
-
-        durations = [(s.ends_at - s.starts_at).total_seconds() for s in non_service_sessions]
-        if not durations:
-            return
-            
-        min_duration_seconds = min(durations)
-        if min_duration_seconds <= 0:
-            return
-            
-        min_duration = timedelta(seconds=min_duration_seconds)
-
-        # 2. Generate slots for each session
-        # Instead of a global grid, we generate slots starting from each session's start time.
-        # This ensures alignment even if there are gaps (service sessions).
-        
-        # Collect service sessions for filtering
-        service_sessions = [
-            s for s in sessions 
-            if s.is_service_session or s.is_plenum_session
-        ]
+            return {}
 
-        print("SERVICES", sessions)
-
-        self._session_slots_map.clear()
-        
-        all_generated_slots = set()
+        min_duration = min(s.ends_at - s.starts_at for s in non_service_sessions)
+        if min_duration <= timedelta(0):
+            return {}
 
+        # 2. Merge the service sessions into disjoint intervals
+        service_intervals = self._merge_intervals([
+            s for s in sessions
+            if s.is_service_session or s.is_plenum_session
+        ])
+        service_ends = [end for _, end in service_intervals]
 
-        for session in non_service_sessions:            
+        # 3. Sweep each session against the service intervals
+        session_slots_map: Dict[str, List[Slot]] = {}
+        for session in non_service_sessions:
             session_slots = []
             current = session.starts_at
-            
-            # Generate slots within the session duration
-            while current + min_duration <= session.ends_at:
-                slot = Slot(start=current, end=current + min_duration)
-                
-                # Check if slot overlaps with ANY service session
-                service_session_ptr = None
-                for ss in service_sessions:
-                    if slot.start < ss.ends_at and slot.end > ss.starts_at:
-                        service_session_ptr = ss
-                        break
-
-                if not service_session_ptr:
-                    session_slots.append(slot)
-                    all_generated_slots.add(slot)    
-                    current += min_duration
-                else:
-                    current = service_session_ptr.ends_at
-            
-            if session_slots:
-                self._session_slots_map[session.id] = session_slots
-                print(f"DEBUG: Mapped {len(session_slots)} slots to session {session.id} ({session.starts_at} - {session.ends_at})")
+            # First service interval that ends after the session start
+            index = bisect_right(service_ends, current)
 
-        print(f"DEBUG: Total unique slots generated: {len(all_generated_slots)}")
-        for slot in sorted(list(all_generated_slots), key=lambda s: s.start):
-            print(f"DEBUG: Slot: {slot}")
+            while current + min_duration <= session.ends_at:
+                while index < len(service_intervals) and service_ends[index] <= current:
+                    index += 1
+                if index < len(service_intervals) and service_intervals[index][0] < current + min_duration:
+                    # The slot would overlap a service session: resume after it
+                    current = service_ends[index]
+                    continue
+                session_slots.append(Slot(start=current, end=current + min_duration))
+                current += min_duration
 
+            if session_slots:
+                session_slots_map[session.id] = session_slots
 
+        return session_slots_map
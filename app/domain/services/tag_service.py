@@ -1,9 +1,10 @@
 import secrets
+from domain.entities.score_event import ScoreEvent
 from domain.entities.tag import Tag
 from infrastructure.repositories.tags_repository import TagsRepository
 from domain.services.user_service import UserService
 from domain.services.leaderboard_service import LeaderboardService
-from infrastructure.errors.tag_errors import AssignTagError
+from infrastructure.errors.tag_errors import AssignTagError, ReadTagError
 
 
 class TagService:
@@ -75,7 +76,7 @@ class TagService:
             tuple[str, int]: (tag_id, points)
 
         Raises:
-            AssignTagError: if tag is already assigned or operation fails
+            AssignTagError: if tag is already assigned, with its points, or operation fails
         """
         tag_id = tag.tag_id
 
@@ -91,6 +92,13 @@ class TagService:
 
         # Verify tag is not already assigned
         if tag_id in user_tag_ids:
+            # A previous assignment may have failed after saving the tag: award its points now,
+            # the score ledger records them at most once
+            awarded = tag.points > 0 and self.leaderboard_service.add_points(
+                user, tag.points, ScoreEvent.tag_event_id(uid, tag_id)
+            )
+            if awarded:
+                return tag.points
             raise AssignTagError(
                 message=f"Tag {tag_id} is already assigned to user",
                 http_status=409
@@ -101,7 +109,7 @@ class TagService:
 
         # Update leaderboard scores atomically
         if tag.points > 0:
-            self.leaderboard_service.add_points(updated_user, tag.points)
+            self.leaderboard_service.add_points(updated_user, tag.points, ScoreEvent.tag_event_id(uid, tag_id))
 
         return tag.points
 
@@ -116,8 +124,8 @@ class TagService:
         Raises:
             AssignTagError: if tag is already assigned or operation fails
         """
-        # Read tag from database
-        tag = self.tags_repository.read(tag_id)
+        # Read tag from database, not from the cache: its points are awarded
+        tag = self.tags_repository.read(tag_id, use_cache=False)
 
         # Use internal method to handle assignment
         return self._assign_tag_to_user_internal(tag, uid)
@@ -125,7 +133,7 @@ class TagService:
     def assign_tag_by_secret(self, secret: str, uid: str) -> tuple[str, int]:
         """
         Assigns a tag to a user by secret:
-        1. Reading all tags and finding the one with matching secret
+        1. Looking up the tag in the tag_secrets index (single point read)
         2. Verifying the tag is not already assigned to the user
         3. Adding the tag to user's tags list
         4. Updating leaderboard scores (user and group)
@@ -136,23 +144,22 @@ class TagService:
         Raises:
             AssignTagError: if tag not found, already assigned, or operation fails
         """
-        # Read all tags and find the one with matching secret
-        all_tags = self.tags_repository.read_all()
-        matching_tags = [tag for tag in all_tags if tag.secret == secret]
-
-        if not matching_tags:
-            raise AssignTagError(
-                message="Tag not found with the provided secret",
-                http_status=404
-            )
-
-        if len(matching_tags) > 1:
-            raise AssignTagError(
-                message="Multiple tags found with the same secret",
-                http_status=400
-            )
-
-        tag = matching_tags[0]
+        try:
+            tag = self.tags_repository.read_by_secret(secret)
+        except ReadTagError as e:
+            if e.status_code == 404:
+                raise AssignTagError(
+                    message="Tag not found with the provided secret",
+                    http_status=404
+                )
+            raise
 
         # Use internal method to handle assignment
         return self._assign_tag_to_user_internal(tag, uid)
+
+    def backfill_secret_index(self) -> int:
+        """
+        Backfills the tag_secrets index from the existing tags.
+        Returns the number of indexed tags.
+        """
+        return self.tags_repository.backfill_secret_index()
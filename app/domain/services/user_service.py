@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from domain.entities.user import User
 from domain.entities.tag import Tag
 from infrastructure.repositories.user_repository import UserRepository
 from infrastructure.repositories.tags_repository import TagsRepository
 from domain.services.group_service import GroupService
+from infrastructure.caches.token_cache import TokenCache
 
 class UserService:
     """"
@@ -15,11 +16,13 @@ class UserService:
         self,
         user_repository: UserRepository,
         group_service: GroupService,
-        tags_repository: TagsRepository
+        tags_repository: TagsRepository,
+        token_cache: Optional[TokenCache] = None
     ):
         self.user_repository = user_repository
         self.group_service = group_service
         self.tags_repository = tags_repository
+        self.token_cache = token_cache
 
 
     def create_user(self, user: User) -> User:
@@ -34,20 +37,23 @@ class UserService:
         Reads a user from database and loads associated tags.
         """
         user_data = self.user_repository.read_raw(uid)
-        tags = self._load_user_tags(user_data.get("tags"))
-        return User.from_dict(user_data, tags=tags)
+        tags_by_id = self.tags_repository.read_many(user_data.get("tags") or [])
+        return User.from_dict(user_data, tags=self._load_user_tags(user_data.get("tags"), tags_by_id))
 
 
     def read_all_users(self) -> list[User]:
         """
         Reads all users in database and loads associated tags.
+        Tags of all users are hydrated with a single batched read.
         """
         users_data = self.user_repository.read_all_raw()
-        users = []
-        for user_data in users_data:
-            tags = self._load_user_tags(user_data.get("tags"))
-            users.append(User.from_dict(user_data, tags=tags))
-        return users
+        tags_by_id = self.tags_repository.read_many(
+            tag_id for user_data in users_data for tag_id in (user_data.get("tags") or [])
+        )
+        return [
+            User.from_dict(user_data, tags=self._load_user_tags(user_data.get("tags"), tags_by_id))
+            for user_data in users_data
+        ]
 
 
     def update_user(self, uid: str, user_update: dict) -> User:
@@ -55,7 +61,9 @@ class UserService:
         Recover a user from uid in database and the updates it.
         """
         current_user: User = self.read_user(uid)
-        return self.user_repository.update(user_update=user_update, current_user=current_user)
+        updated_user = self.user_repository.update(user_update=user_update, current_user=current_user)
+        self.invalidate_cached_tokens(uid)
+        return updated_user
 
 
     def delete_user(self, uid: str) -> None:
@@ -71,6 +79,7 @@ class UserService:
                 self.group_service.decrement_user_count(group_id)
 
         self.user_repository.delete(uid, user.nickname)
+        self.invalidate_cached_tokens(uid)
 
 
     def assign_group_to_user(self, uid: str, gid: str) -> User:
@@ -78,8 +87,16 @@ class UserService:
         Assigns a specific group to a user.
         """
         self.user_repository.assign_group(uid, gid)
+        self.invalidate_cached_tokens(uid)
         return self.read_user(uid)
 
+    def mark_checked_in(self, uid: str) -> None:
+        """
+        Marks a user as checked in, without reading it back.
+        """
+        self.user_repository.mark_checked_in(uid)
+        self.invalidate_cached_tokens(uid)
+
     def add_tags(self, uid: str, tags: List[str]) -> User:
         """
         Adds tags to user's tags list.
@@ -94,13 +111,24 @@ class UserService:
         """
         return self.user_repository.get_all_quiz_results(uid)
 
-    def _load_user_tags(self, tag_ids: Optional[List[str]]) -> Optional[List[Tag]]:
+    def invalidate_cached_tokens(self, uid: str) -> None:
+        """
+        Drops the verified tokens cached for the user, so that authorization
+        sees role, group and check-in changes on the next request.
         """
-        Loads Tag objects from tags collection using tag_ids.
+        if self.token_cache is not None:
+            self.token_cache.invalidate_user(uid)
+
+    def _load_user_tags(
+        self, tag_ids: Optional[List[str]], tags_by_id: Dict[str, Tag]
+    ) -> Optional[List[Tag]]:
+        """
+        Picks the user's Tag objects, in order, from the tags already read in bulk.
         If a tag doesn't exist, it's ignored.
 
         Args:
             tag_ids: List of tag documentIds (e.g., ["session_1", "session_2"])
+            tags_by_id: Tags read with TagsRepository.read_many, by tag_id
 
         Returns:
             List of Tag objects, or None if no tags
@@ -108,13 +136,5 @@ class UserService:
         if not tag_ids:
             return None
 
-        tags = []
-        for tag_id in tag_ids:
-            try:
-                tag = self.tags_repository.read(tag_id)
-                tags.append(tag)
-            except Exception:
-                # If tag doesn't exist, skip it
-                continue
-
+        tags = [tags_by_id[tag_id] for tag_id in tag_ids if tag_id in tags_by_id]
         return tags if tags else None
@@ -0,0 +1,60 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+
+class GroupAllocator:
+    """
+    Process-local groups and user counts, used to assign groups at check-in
+    without a transaction.
+
+    The groups are reloaded from Firestore every `refresh_interval` seconds. In between,
+    the assignments made by this process are added to them, so that a burst of check-ins
+    is spread over the groups; the assignments of the other processes are picked up at
+    the next reload.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    def __init__(self, refresh_interval: float) -> None:
+        self.refresh_interval = refresh_interval
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._counts: Dict[str, int] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        return bool(self._counts) and time.time() - self._loaded_at < self.refresh_interval
+
+    def replace_all(self, groups: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Replaces the groups, by gid. Each group data holds its current user_count.
+        """
+        with self._lock:
+            self._groups = {gid: dict(data) for gid, data in groups.items()}
+            self._counts = {gid: data.get("user_count", 0) or 0 for gid, data in groups.items()}
+            self._loaded_at = time.time()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def allocate(self, load_groups: Callable[[], Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Picks one of the least populated groups at random and counts the new user in it.
+        `load_groups` reads the gid -> group data map when the counts are stale.
+        Returns a copy of the group data, with the local count.
+
+        Raises:
+            LookupError: if there are no groups
+        """
+        if not self.is_fresh():
+            self.replace_all(load_groups())
+        with self._lock:
+            if not self._counts:
+                raise LookupError("No groups available")
+            min_count = min(self._counts.values())
+            gid = random.choice([gid for gid, count in self._counts.items() if count == min_count])
+            self._counts[gid] += 1
+            return {**self._groups[gid], "user_count": self._counts[gid]}
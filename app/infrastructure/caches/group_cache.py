@@ -0,0 +1,40 @@
+import threading
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+
+class GroupCache:
+    """
+    Process-wide cache of group documents by gid, as resolved from the users' group references.
+
+    There are only a handful of groups, so the cache is small. Entries are dropped
+    by GroupRepository whenever a group is written, and expire after `ttl` seconds
+    to pick up changes made by other processes.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: int) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, gid: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a copy of the cached group data (including gid), or None.
+        """
+        with self._lock:
+            group_data = self._cache.get(gid)
+        return dict(group_data) if group_data is not None else None
+
+    def put(self, gid: str, group_data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._cache[gid] = dict(group_data)
+
+    def invalidate(self, gid: str) -> None:
+        with self._lock:
+            self._cache.pop(gid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
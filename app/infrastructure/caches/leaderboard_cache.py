@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from google.cloud.firestore_v1.watch import ChangeType
+from sortedcontainers import SortedList
+
+from domain.entities.leaderboard import Leaderboard, LeaderboardRank
+from domain.entities.leaderboard_entry import LeaderboardEntry
+from infrastructure.clients.firestore_client import FirestoreClient
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderboardRanking:
+    """
+    Leaderboard entries ordered by score (descending), then by updated_at, so that
+    on equal score who got there first ranks higher.
+    Updates, top-K and rank lookups are O(log n) on a sorted list.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, LeaderboardEntry] = {}
+        self._ranking: SortedList = SortedList()
+
+    @staticmethod
+    def _key(entry: LeaderboardEntry) -> Tuple[int, int, str]:
+        return (-entry.score, entry.updated_at, entry.entry_id)
+
+    def put(self, entry: LeaderboardEntry) -> None:
+        self.remove(entry.entry_id)
+        self._entries[entry.entry_id] = entry
+        self._ranking.add(self._key(entry))
+
+    def remove(self, entry_id: str) -> None:
+        previous = self._entries.pop(entry_id, None)
+        if previous is not None:
+            self._ranking.remove(self._key(previous))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._ranking.clear()
+
+    def top(self, k: int) -> List[LeaderboardEntry]:
+        return [self._entries[key[2]] for key in self._ranking.islice(0, k)]
+
+    def rank(self, entry_id: str) -> Optional[Tuple[int, LeaderboardEntry]]:
+        """
+        Returns the 1-based rank of the entry together with the entry, or None if it's not ranked.
+        """
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            return None
+        return self._ranking.index(self._key(entry)) + 1, entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LeaderboardCache:
+    """
+    Process-local ranking of the leaderboard_users and leaderboard_groups collections.
+
+    As for the quiz catalog, both rankings are kept fresh by `on_snapshot` listeners.
+    Without a streaming listener the rankings are trusted for `ttl` seconds after the
+    last full load, then readers reload them from Firestore.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    LEADERBOARD_USER_COLLECTION: str = "leaderboard_users"
+    LEADERBOARD_GROUP_COLLECTION: str = "leaderboard_groups"
+
+    def __init__(self, firestore_client: FirestoreClient, ttl: int, use_listener: bool = True) -> None:
+        self.firestore_client = firestore_client
+        self.ttl = ttl
+        self.users = LeaderboardRanking()
+        self.groups = LeaderboardRanking()
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._watches: Dict[str, object] = {}
+        self._snapshot_received: set = set()
+        # Bumped on every change, lets readers skip work when nothing changed
+        self.version = 0
+
+        if use_listener:
+            self.start_listener()
+
+    def start_listener(self) -> None:
+        """
+        Subscribes to both leaderboard collections. On failure the cache keeps working in TTL polling mode.
+        """
+        listeners = (
+            (self.LEADERBOARD_USER_COLLECTION, self.users, LeaderboardEntry.from_user_dict),
+            (self.LEADERBOARD_GROUP_COLLECTION, self.groups, LeaderboardEntry.from_group_dict),
+        )
+        try:
+            for collection, ranking, parse in listeners:
+                self._watches[collection] = self.firestore_client.db.collection(collection).on_snapshot(
+                    self._snapshot_handler(collection, ranking, parse)
+                )
+        except Exception:
+            logger.warning("Leaderboard listener not started, falling back to TTL polling", exc_info=True)
+            self.stop_listener()
+
+    def stop_listener(self) -> None:
+        for watch in self._watches.values():
+            watch.unsubscribe()
+        self._watches.clear()
+        self._snapshot_received.clear()
+
+    def _snapshot_handler(
+        self,
+        collection: str,
+        ranking: LeaderboardRanking,
+        parse: Callable[[str, dict], LeaderboardEntry]
+    ):
+        def on_snapshot(docs, changes, read_time) -> None:
+            with self._lock:
+                for change in changes:
+                    doc = change.document
+                    if change.type == ChangeType.REMOVED:
+                        ranking.remove(doc.id)
+                        continue
+                    try:
+                        ranking.put(parse(doc.id, doc.to_dict()))
+                    except Exception:
+                        ranking.remove(doc.id)
+                self._snapshot_received.add(collection)
+                self.version += 1
+        return on_snapshot
+
+    def _listener_active(self) -> bool:
+        return (
+            len(self._watches) == 2
+            and len(self._snapshot_received) == 2
+            and all(watch.is_active for watch in self._watches.values())
+        )
+
+    def is_fresh(self) -> bool:
+        """
+        True when the rankings can answer reads without going to Firestore.
+        """
+        if self._listener_active():
+            return True
+        return self._loaded_at is not None and time.time() - self._loaded_at < self.ttl
+
+    def replace_all(self, users: List[LeaderboardEntry], groups: List[LeaderboardEntry]) -> None:
+        """
+        Replaces both rankings with a full load from Firestore.
+        """
+        with self._lock:
+            for ranking, entries in ((self.users, users), (self.groups, groups)):
+                ranking.clear()
+                for entry in entries:
+                    ranking.put(entry)
+            self._loaded_at = time.time()
+            self.version += 1
+
+    def read(self, k: int, uid: Optional[str] = None, gid: Optional[str] = None) -> Leaderboard:
+        """
+        Returns the top k users and groups, with the ranks of the given user and group,
+        all read from the same state of the rankings.
+        """
+        with self._lock:
+            user_rank = self.users.rank(uid) if uid else None
+            group_rank = self.groups.rank(gid) if gid else None
+            return Leaderboard(
+                top_users=self.users.top(k),
+                top_groups=self.groups.top(k),
+                user_count=len(self.users),
+                group_count=len(self.groups),
+                user_rank=LeaderboardRank(rank=user_rank[0], entry=user_rank[1]) if user_rank else None,
+                group_rank=LeaderboardRank(rank=group_rank[0], entry=group_rank[1]) if group_rank else None,
+            )
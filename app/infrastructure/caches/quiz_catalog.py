@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from google.cloud.firestore_v1.watch import ChangeType
+
+from domain.entities.quiz import Quiz
+from infrastructure.clients.firestore_client import FirestoreClient
+
+logger = logging.getLogger(__name__)
+
+
+class QuizCatalog:
+    """
+    Process-local catalog of parsed quizzes and of the quiz_id -> session_id map.
+
+    The catalog is kept fresh by a Firestore `on_snapshot` listener on the quizzes
+    collection. If the listener can't be started or stops streaming, the catalog
+    is considered fresh only for `ttl` seconds after the last full load, so readers
+    fall back to Firestore and reload it (TTL polling).
+
+    Quizzes are returned as deep copies, since callers adjust fields such as
+    timer_duration per user.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    QUIZ_COLLECTION: str = "quizzes"
+    QUIZ_ID: str = "quiz_id"
+
+    def __init__(self, firestore_client: FirestoreClient, ttl: int, use_listener: bool = True) -> None:
+        self.firestore_client = firestore_client
+        self.ttl = ttl
+        self._quizzes: Dict[str, Quiz] = {}
+        self._session_map: Dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._watch = None
+        self._snapshot_received = False
+
+        if use_listener:
+            self.start_listener()
+
+    def start_listener(self) -> None:
+        """
+        Subscribes to the quizzes collection. On failure the catalog keeps working in TTL polling mode.
+        """
+        try:
+            self._watch = self.firestore_client.db.collection(self.QUIZ_COLLECTION).on_snapshot(self._on_snapshot)
+        except Exception:
+            logger.warning("Quiz catalog listener not started, falling back to TTL polling", exc_info=True)
+            self._watch = None
+
+    def stop_listener(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+        self._snapshot_received = False
+
+    def _on_snapshot(self, docs, changes, read_time) -> None:
+        """
+        Applies a snapshot from the listener. The first snapshot contains the whole collection.
+        """
+        with self._lock:
+            for change in changes:
+                doc = change.document
+                if change.type == ChangeType.REMOVED:
+                    self._remove_locked(doc.id)
+                    continue
+                try:
+                    self._put_locked(Quiz.from_dict({self.QUIZ_ID: doc.id, **doc.to_dict()}))
+                except Exception:
+                    # Malformed documents are skipped, as they can't be read anyway
+                    self._remove_locked(doc.id)
+            self._snapshot_received = True
+            self._loaded_at = time.time()
+
+    def _listener_active(self) -> bool:
+        return self._watch is not None and self._snapshot_received and self._watch.is_active
+
+    def is_fresh(self) -> bool:
+        """
+        True when the catalog can answer reads without going to Firestore.
+        """
+        if self._listener_active():
+            return True
+        return self._loaded_at is not None and time.time() - self._loaded_at < self.ttl
+
+    def _put_locked(self, quiz: Quiz) -> None:
+        self._quizzes[quiz.quiz_id] = quiz
+        self._session_map[quiz.quiz_id] = quiz.session_id
+
+    def _remove_locked(self, quiz_id: str) -> None:
+        self._quizzes.pop(quiz_id, None)
+        self._session_map.pop(quiz_id, None)
+
+    def get(self, quiz_id: str) -> Optional[Quiz]:
+        """
+        Returns a copy of the cached quiz, or None if it's not in the catalog.
+        """
+        quiz = self._quizzes.get(quiz_id)
+        return quiz.model_copy(deep=True) if quiz is not None else None
+
+    def all(self) -> List[Quiz]:
+        """
+        Returns copies of all cached quizzes.
+        """
+        with self._lock:
+            quizzes = list(self._quizzes.values())
+        return [quiz.model_copy(deep=True) for quiz in quizzes]
+
+    def session_map(self) -> Dict[str, str]:
+        """
+        Returns the precomputed quiz_id -> session_id map.
+        """
+        with self._lock:
+            return dict(self._session_map)
+
+    def put(self, quiz: Quiz) -> None:
+        """
+        Writes a quiz through to the catalog.
+        """
+        if quiz.quiz_id is None:
+            return
+        with self._lock:
+            self._put_locked(quiz.model_copy(deep=True))
+
+    def remove(self, quiz_id: str) -> None:
+        with self._lock:
+            self._remove_locked(quiz_id)
+
+    def replace_all(self, quizzes: List[Quiz]) -> None:
+        """
+        Replaces the catalog content with a full load from Firestore.
+        """
+        with self._lock:
+            self._quizzes.clear()
+            self._session_map.clear()
+            for quiz in quizzes:
+                self._put_locked(quiz.model_copy(deep=True))
+            self._loaded_at = time.time()
@@ -0,0 +1,71 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreEpochCache:
+    """
+    Process-local copy of the current score epoch, stamped on every score event.
+
+    The epoch only changes on a leaderboard reset or a replay of a previous epoch,
+    so it's kept fresh by an `on_snapshot` listener on score_epochs/current instead
+    of being read for every event. Without a streaming listener it's trusted for
+    `ttl` seconds, then read again: events recorded meanwhile go to the previous epoch.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    def __init__(self, leaderboard_repository: LeaderboardRepository, ttl: int, use_listener: bool = True) -> None:
+        self.leaderboard_repository = leaderboard_repository
+        self.ttl = ttl
+        self._epoch = 0
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._watch = None
+
+        if use_listener:
+            self.start_listener()
+
+    def start_listener(self) -> None:
+        """
+        Subscribes to the current epoch. On failure the epoch is read again every `ttl` seconds.
+        """
+        try:
+            self._watch = self.leaderboard_repository.watch_score_epoch(self.set)
+        except Exception:
+            logger.warning("Score epoch listener not started, falling back to TTL polling", exc_info=True)
+            self._watch = None
+
+    def stop_listener(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def set(self, epoch: int) -> None:
+        with self._lock:
+            self._epoch = epoch
+            self._loaded_at = time.monotonic()
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        # The listener pushes every change, the loaded epoch stays current
+        return self._watch is not None or time.monotonic() - self._loaded_at < self.ttl
+
+    def get(self) -> int:
+        if not self._is_fresh():
+            self.set(self.leaderboard_repository.read_score_epoch())
+        return self._epoch
+
+    async def get_async(self) -> int:
+        """
+        Async variant of get, reading the epoch with the async client when it's stale.
+        """
+        if not self._is_fresh():
+            self.set(await self.leaderboard_repository.read_score_epoch_async())
+        return self._epoch
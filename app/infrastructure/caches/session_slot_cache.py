@@ -0,0 +1,87 @@
+import logging
+import threading
+from typing import FrozenSet, Mapping, Optional
+
+from domain.entities.session_slot_map import SessionSlotMap
+from domain.entities.slot import Slot
+from infrastructure.repositories.session_slot_repository import SessionSlotRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSlotCache:
+    """
+    Process-local copy of the shared session slot map.
+
+    The map is published to Firestore by the instance that syncs Sessionize, and
+    every instance keeps its copy fresh with an `on_snapshot` listener on it, so all
+    the workers agree on the slots without each fetching the GridSmart view.
+    An older map never replaces a newer one, whichever way it arrives.
+    Without a repository the map only lives in this process.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    def __init__(self, session_slot_repository: Optional[SessionSlotRepository] = None, use_listener: bool = True) -> None:
+        self.session_slot_repository = session_slot_repository
+        self._slot_map = SessionSlotMap()
+        self._index: Mapping[str, FrozenSet[Slot]] = self._slot_map.index()
+        self._lock = threading.Lock()
+        self._watch = None
+
+        if use_listener and session_slot_repository is not None:
+            self.start_listener()
+
+    def start_listener(self) -> None:
+        """
+        Subscribes to the shared map. On failure the map is only refreshed by load and publish.
+        """
+        try:
+            self._watch = self.session_slot_repository.watch(self._on_snapshot)
+        except Exception:
+            logger.warning("Session slot listener not started", exc_info=True)
+            self._watch = None
+
+    def stop_listener(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _on_snapshot(self, slot_map: Optional[SessionSlotMap]) -> None:
+        if slot_map is not None:
+            self._replace(slot_map)
+
+    def _replace(self, slot_map: SessionSlotMap) -> None:
+        with self._lock:
+            if slot_map.synced_at >= self._slot_map.synced_at:
+                # Readers see either the previous index or the new one, never a partial one
+                self._index = slot_map.index()
+                self._slot_map = slot_map
+
+    @property
+    def synced_at(self) -> int:
+        return self._slot_map.synced_at
+
+    def is_loaded(self) -> bool:
+        return self._slot_map.synced_at > 0
+
+    def load(self) -> bool:
+        """
+        Reads the shared map from Firestore. Returns whether a map is loaded.
+        """
+        if self.session_slot_repository is not None:
+            slot_map = self.session_slot_repository.read()
+            if slot_map is not None:
+                self._replace(slot_map)
+        return self.is_loaded()
+
+    def publish(self, slot_map: SessionSlotMap) -> None:
+        """
+        Uses a newly computed map in this process and shares it with the other instances.
+        """
+        self._replace(slot_map)
+        if self.session_slot_repository is not None:
+            self.session_slot_repository.save(slot_map)
+
+    def get(self, session_id: str) -> FrozenSet[Slot]:
+        return self._index.get(session_id, frozenset())
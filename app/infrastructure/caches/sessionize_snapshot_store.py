@@ -0,0 +1,66 @@
+import json
+import logging
+import mmap
+import os
+import tempfile
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SessionizeSnapshotStore:
+    """
+    Last good Sessionize views on local disk, so that a cold start or a Sessionize
+    outage is served from the last fetched data instead of failing.
+
+    Each view is a `{sessionize_id}-{view}.snapshot` file: a JSON header line with the
+    fetch time, then the JSON body as served. Files are written to a temporary file
+    and renamed over the previous snapshot, so readers (and the other workers)
+    never see a partial one, and they are read through a memory map.
+    """
+
+    def __init__(self, directory: str, sessionize_id: str) -> None:
+        self.directory = directory
+        self.sessionize_id = sessionize_id
+
+    def _path(self, view_name: str) -> str:
+        return os.path.join(self.directory, f"{self.sessionize_id}-{view_name}.snapshot")
+
+    def save(self, view_name: str, body: bytes, fetched_at: float) -> None:
+        """
+        Replaces the snapshot of a view atomically. Failures are logged, not raised.
+        """
+        temp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            header = json.dumps({"view": view_name, "fetched_at": fetched_at}).encode("utf-8")
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=".tmp-", delete=False) as file:
+                temp_path = file.name
+                file.write(header + b"\n")
+                file.write(body)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self._path(view_name))
+        except Exception:
+            logger.warning("Failed to save the Sessionize %s snapshot", view_name, exc_info=True)
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def load(self, view_name: str) -> Optional[Tuple[bytes, float]]:
+        """
+        Returns the body of the last good view and its fetch time, or None if there is
+        no readable snapshot.
+        """
+        try:
+            with open(self._path(view_name), "rb") as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                header_end = mapped.find(b"\n")
+                if header_end < 0:
+                    return None
+                header = json.loads(mapped[:header_end])
+                return mapped[header_end + 1:], float(header["fetched_at"])
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Failed to load the Sessionize %s snapshot", view_name, exc_info=True)
+            return None
@@ -0,0 +1,86 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from cachetools import TTLCache
+
+from domain.entities.tag import Tag
+from infrastructure.clients.firestore_client import FirestoreClient
+
+logger = logging.getLogger(__name__)
+
+
+class TagCache:
+    """
+    Process-wide cache of Tag entities by tag_id.
+
+    Tags rarely change, so entries live for `ttl` seconds and are dropped
+    explicitly by TagsRepository on update and delete. As for the quiz catalog,
+    an `on_snapshot` listener on the tags collection drops the tags changed by
+    other instances. Without it they may still serve a previous tag for up to
+    `ttl` seconds, so the cache is only used to show tags, never to award their points.
+    Tags are copied in and out, so callers can't alter the cached ones.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    TAGS_COLLECTION: str = "tags"
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: int,
+        firestore_client: Optional[FirestoreClient] = None,
+        use_listener: bool = True
+    ) -> None:
+        self.firestore_client = firestore_client
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._watch = None
+
+        if use_listener and firestore_client is not None:
+            self.start_listener()
+
+    def start_listener(self) -> None:
+        """
+        Subscribes to the tags collection. On failure cached tags only expire after `ttl` seconds.
+        """
+        try:
+            self._watch = self.firestore_client.db.collection(self.TAGS_COLLECTION).on_snapshot(self._on_snapshot)
+        except Exception:
+            logger.warning("Tag cache listener not started, falling back to the TTL", exc_info=True)
+            self._watch = None
+
+    def stop_listener(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _on_snapshot(self, docs, changes, read_time) -> None:
+        # The first snapshot lists every tag, dropping them is harmless
+        with self._lock:
+            for change in changes:
+                self._cache.pop(change.document.id, None)
+
+    def get(self, tag_id: str) -> Optional[Tag]:
+        with self._lock:
+            tag = self._cache.get(tag_id)
+        return tag.model_copy() if tag is not None else None
+
+    def get_many(self, tag_ids: Iterable[str]) -> Dict[str, Tag]:
+        """
+        Returns the cached tags among the given ids, by tag_id.
+        """
+        with self._lock:
+            tags = {tag_id: self._cache[tag_id] for tag_id in tag_ids if tag_id in self._cache}
+        return {tag_id: tag.model_copy() for tag_id, tag in tags.items()}
+
+    def put_many(self, tags: List[Tag]) -> None:
+        with self._lock:
+            for tag in tags:
+                if tag.tag_id:
+                    self._cache[tag.tag_id] = tag.model_copy()
+
+    def invalidate(self, tag_id: str) -> None:
+        with self._lock:
+            self._cache.pop(tag_id, None)
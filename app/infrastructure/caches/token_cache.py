@@ -0,0 +1,189 @@
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set
+
+from cachetools import TLRUCache
+
+from domain.entities.user import User
+from infrastructure.repositories.token_invalidation_repository import TokenInvalidationRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedToken:
+    """
+    Verified token entry: decoded claims, resolved user and the time of
+    the last revocation check against Firebase Auth.
+    """
+    claims: Dict[str, Any]
+    user: User
+    expires_at: float
+    revocation_checked_at: float
+
+
+class _EvictingTLRUCache(TLRUCache):
+    """
+    TLRUCache that reports the entries it evicts or expires by itself.
+    """
+
+    def __init__(self, maxsize: int, ttu, timer, on_evict: Callable[[str, Any], None]) -> None:
+        super().__init__(maxsize=maxsize, ttu=ttu, timer=timer)
+        self._on_evict = on_evict
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, value in expired:
+            self._on_evict(key, value)
+        return expired
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._on_evict(key, value)
+        return key, value
+
+
+class TokenCache:
+    """
+    Bounded, time-aware cache of verified Firebase ID tokens.
+
+    Entries are keyed by the SHA-256 of the raw token and live at most `ttl` seconds,
+    never beyond the token's own `exp` claim. Each entry remembers when revocation was
+    last checked, so callers can re-verify after `revocation_check_interval` seconds.
+
+    The cache is local to a process. Invalidating a user drops their tokens here and
+    publishes the invalidation to Firestore, where every instance watches it with an
+    `on_snapshot` listener. Without the repository or if the listener is not running,
+    the other instances keep serving the previous user for up to `ttl` seconds.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: int,
+        revocation_check_interval: int,
+        token_invalidation_repository: Optional[TokenInvalidationRepository] = None,
+        use_listener: bool = True
+    ) -> None:
+        self.ttl = ttl
+        self.revocation_check_interval = revocation_check_interval
+        self.token_invalidation_repository = token_invalidation_repository
+        self._cache: TLRUCache = _EvictingTLRUCache(
+            maxsize=maxsize, ttu=self._time_to_use, timer=time.time, on_evict=self._on_evict
+        )
+        self._keys_by_uid: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._watch = None
+
+        if use_listener and token_invalidation_repository is not None:
+            self.start_listener()
+
+    def start_listener(self) -> None:
+        """
+        Subscribes to the invalidations published from now on. On failure the tokens
+        cached here stay valid up to their TTL after an invalidation by another instance.
+        """
+        try:
+            since = int(time.time() * 1000)
+            self._watch = self.token_invalidation_repository.watch(since, self._drop_user)
+        except Exception:
+            logger.warning("Token invalidation listener not started", exc_info=True)
+            self._watch = None
+
+    def stop_listener(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _time_to_use(self, key: str, entry: CachedToken, now: float) -> float:
+        """
+        Expiration of an entry: the earliest between cache TTL and token expiration.
+        """
+        return min(now + self.ttl, entry.expires_at)
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        """
+        Returns the cached entry for a token, or None if missing or expired.
+        """
+        with self._lock:
+            return self._cache.get(self._hash(token))
+
+    def put(self, token: str, claims: Dict[str, Any], user: User) -> None:
+        """
+        Stores a freshly verified token with its resolved user.
+        Tokens without an `exp` claim or already expired are not cached.
+        """
+        expires_at = claims.get("exp")
+        now = time.time()
+        if expires_at is None or expires_at <= now:
+            return
+
+        key = self._hash(token)
+        entry = CachedToken(
+            claims=claims,
+            user=user,
+            expires_at=float(expires_at),
+            revocation_checked_at=now,
+        )
+        with self._lock:
+            self._cache[key] = entry
+            self._keys_by_uid.setdefault(user.uid, set()).add(key)
+
+    def _on_evict(self, key: str, entry: CachedToken) -> None:
+        # Called by the cache, with the lock held
+        self._forget_key(key, entry.user.uid)
+
+    def _forget_key(self, key: str, uid: str) -> None:
+        keys = self._keys_by_uid.get(uid)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_uid[uid]
+
+    def needs_revocation_check(self, entry: CachedToken) -> bool:
+        """
+        True if the last revocation check is older than the configured interval.
+        """
+        return time.time() - entry.revocation_checked_at >= self.revocation_check_interval
+
+    def mark_revocation_checked(self, entry: CachedToken) -> None:
+        entry.revocation_checked_at = time.time()
+
+    def discard(self, token: str) -> None:
+        """
+        Removes a single token from the cache.
+        """
+        key = self._hash(token)
+        with self._lock:
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                self._forget_key(key, entry.user.uid)
+
+    def _drop_user(self, uid: str) -> None:
+        with self._lock:
+            for key in self._keys_by_uid.pop(uid, set()):
+                self._cache.pop(key, None)
+
+    def invalidate_user(self, uid: Optional[str]) -> None:
+        """
+        Drops every cached token belonging to a user, in this instance and, through
+        Firestore, in the others, so that role, group and check-in changes are visible
+        on the next request.
+        """
+        if uid is None:
+            return
+        self._drop_user(uid)
+        if self.token_invalidation_repository is not None:
+            try:
+                self.token_invalidation_repository.publish(uid)
+            except Exception:
+                logger.warning("Failed to publish the token invalidation of user %s", uid, exc_info=True)
@@ -0,0 +1,172 @@
+import os
+from typing import Any, Dict, List, Optional
+
+import firebase_admin
+from firebase_admin import credentials, firestore_async
+
+from core.settings import settings
+from infrastructure.errors.firestore_errors import DocumentNotFoundError
+
+
+class AsyncFirestoreClient:
+    """
+    Async counterpart of FirestoreClient, built on google.cloud.firestore.AsyncClient.
+
+    Use it from `async def` code paths so that Firestore RPCs are awaited instead of
+    blocking the event loop. Sync routers keep using FirestoreClient.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
+
+    Usage:
+        client = AsyncFirestoreClient()
+        await client.read_doc("collection", "doc_id")
+    """
+
+
+    def __init__(self) -> None:
+        """
+        Initializes the async Firestore client and Firebase app if not already initialized.
+
+        In local development: uses service account key file if specified and exists.
+        On Cloud Run: uses Application Default Credentials (ADC) automatically provided by GCP.
+        """
+        if not firebase_admin._apps:
+            # Check if service account path is provided and file exists (local development)
+            if (
+                settings.firebase_service_account_path
+                and os.path.exists(settings.firebase_service_account_path)
+            ):
+                cred: credentials.Certificate = credentials.Certificate(
+                    settings.firebase_service_account_path
+                )
+                firebase_admin.initialize_app(cred)
+            else:
+                # Use Application Default Credentials (Cloud Run or local with gcloud auth)
+                firebase_admin.initialize_app()
+        self.db = firestore_async.client()
+        self._initialized: bool = True
+
+
+    async def create_doc(
+        self,
+        collection_name: str,
+        doc_id: Optional[str],
+        doc_data: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Creates a document in the specified Firestore collection.
+
+        Args:
+            collection_name (str): The name of the Firestore collection.
+            doc_id (Optional[str]): The document ID. If None, Firestore will auto-generate an ID.
+            doc_data (dict): The data to store in the document.
+
+        Returns:
+            str: The ID of the created document.
+        """
+        _, doc_ref = await self.db.collection(collection_name).add(
+            document_data=doc_data,
+            document_id=doc_id,
+        )
+        return doc_ref.id
+
+
+    async def read_doc(self, collection_name: str, doc_id: str) -> Dict[str, Any]:
+        """
+        Reads a document from a Firestore collection by its ID.
+
+        Args:
+            collection_name (str): The name of the Firestore collection.
+            doc_id (str): The document ID.
+
+        Returns:
+            dict: The document data.
+
+        Raises:
+            DocumentNotFoundError: If the document does not exist.
+        """
+        doc_ref = self.db.collection(collection_name).document(doc_id)
+        doc = await doc_ref.get()
+        if doc.exists:
+            doc_dict: Optional[Dict[str, Any]] = doc.to_dict()
+            return doc_dict if doc_dict is not None else {}
+        else:
+            raise DocumentNotFoundError()
+
+
+    async def read_all_docs(
+        self,
+        collection_name: str,
+        include_id: Optional[bool] = False,
+        id_field_name: Optional[str] = "id",
+    ) -> List[Dict[str, Any]]:
+        """
+        Reads all documents from a Firestore collection.
+
+        Args:
+            collection_name (str): The name of the Firestore collection.
+
+        Returns:
+            list[dict]: List of document data.
+        """
+        collection_ref = self.db.collection(collection_name)
+        docs = await collection_ref.get()
+        if include_id:
+            return [{id_field_name: doc.id, **doc.to_dict()} for doc in docs]
+        else:
+            return [doc.to_dict() for doc in docs]
+
+
+    async def update_doc(
+        self,
+        collection_name: str,
+        doc_id: str,
+        doc_data: Dict[str, Any],
+    ) -> None:
+        """
+        Updates an existing document in a Firestore collection.
+
+        Args:
+            collection_name (str): The name of the Firestore collection.
+            doc_id (str): The document ID.
+            doc_data (dict): The data to update in the document.
+        """
+        try:
+            doc_ref = self.db.collection(collection_name).document(doc_id)
+            await doc_ref.update(doc_data)
+        except Exception:
+            raise DocumentNotFoundError()
+
+
+    async def set_doc(
+        self,
+        collection_name: str,
+        doc_id: str,
+        doc_data: Dict[str, Any],
+    ) -> None:
+        """
+        Creates or overwrites a document in a Firestore collection.
+
+        Args:
+            collection_name (str): The name (or path) of the Firestore collection.
+            doc_id (str): The document ID.
+            doc_data (dict): The data to store in the document.
+        """
+        doc_ref = self.db.collection(collection_name).document(doc_id)
+        await doc_ref.set(doc_data)
+
+
+    async def delete_doc(self, collection_name: str, doc_id: str) -> None:
+        """
+        Deletes a document from a Firestore collection.
+
+        Args:
+            collection_name (str): The name of the Firestore collection.
+            doc_id (str): The document ID.
+        """
+        doc_ref = self.db.collection(collection_name).document(doc_id)
+        doc = await doc_ref.get()
+        if doc.exists:
+            await doc_ref.delete()
+        else:
+            raise DocumentNotFoundError()
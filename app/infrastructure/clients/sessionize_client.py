@@ -1,59 +1,246 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 import httpx
-from cachetools import TTLCache
 from core.settings import settings
+from infrastructure.caches.sessionize_snapshot_store import SessionizeSnapshotStore
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, responses fall back to gzip
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedView:
+    """
+    A Sessionize view as last fetched, with the time it was fetched at.
+
+    The JSON body, its ETag and its compressed variants are computed once per
+    refresh, so that requests can be answered without re-encoding the view.
+    """
+    data: Any
+    fetched_at: float
+    body: bytes
+    etag: str
+    gzip_body: bytes
+    brotli_body: Optional[bytes] = None
+
+    @staticmethod
+    def from_data(data: Any, fetched_at: float) -> "CachedView":
+        # Same encoding as FastAPI's JSONResponse
+        body = json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+        return CachedView._from_encoded(data, body, fetched_at)
+
+    @staticmethod
+    def from_body(body: bytes, fetched_at: float) -> "CachedView":
+        """
+        Rebuilds a view from a body encoded by from_data, e.g. read from a snapshot.
+        """
+        return CachedView._from_encoded(json.loads(body), body, fetched_at)
+
+    @staticmethod
+    def _from_encoded(data: Any, body: bytes, fetched_at: float) -> "CachedView":
+        return CachedView(
+            data=data,
+            fetched_at=fetched_at,
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()}"',
+            gzip_body=gzip.compress(body, compresslevel=6),
+            brotli_body=brotli.compress(body, quality=5) if brotli is not None else None,
+        )
 
 
 class SessionizeClient:
     """
     Client for interacting with the Sessionize API.
+
+    Views are cached in memory. After `ttl` seconds a cached view is still served
+    while a single background refresh runs (stale-while-revalidate); concurrent
+    misses for the same view share one in-flight fetch. Requests go through one
+    pooled HTTP/2 connection, opened on first use and closed on shutdown.
+
+    With a snapshot store, each fetched view is also saved to disk. The snapshots
+    are loaded at startup, and the last good one is served when Sessionize fails.
+
+    Note: Use as a singleton through FastAPI's dependency injection with lru_cache.
     """
 
     BASE_URL = "https://sessionize.com/api/v2"
-    cache = TTLCache(maxsize=5, ttl=600)
 
-    def __init__(self):
+    # View names
+    VIEW_ALL = "All"
+    VIEW_GRID_SMART = "GridSmart"
+    VIEW_SESSIONS = "Sessions"
+    VIEW_SPEAKERS = "Speakers"
+    VIEW_SPEAKER_WALL = "SpeakerWall"
+    VIEWS = (VIEW_ALL, VIEW_GRID_SMART, VIEW_SESSIONS, VIEW_SPEAKERS, VIEW_SPEAKER_WALL)
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        timeout: Optional[float] = None,
+        snapshot_store: Optional[SessionizeSnapshotStore] = None
+    ):
         self.sessionize_id = settings.sessionize_id
         self.base_url = f"{self.BASE_URL}/{self.sessionize_id}"
+        self.ttl = ttl if ttl is not None else settings.sessionize_cache_ttl
+        self.timeout = timeout if timeout is not None else settings.sessionize_timeout
+        self.cache: Dict[str, CachedView] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self.snapshot_store = snapshot_store
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._http_client
 
-    async def _get_cached_or_fetch(self, view_name: str) -> Any:
-        if view_name in self.cache:
-            return self.cache[view_name]
+    async def aclose(self) -> None:
+        """
+        Closes the pooled connection. Called on application shutdown.
+        """
+        for task in self._in_flight.values():
+            task.cancel()
+        self._in_flight.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def _load_snapshot(self, view_name: str) -> Optional[CachedView]:
+        snapshot = self.snapshot_store.load(view_name) if self.snapshot_store is not None else None
+        if snapshot is None:
+            return None
+        body, fetched_at = snapshot
+        try:
+            return CachedView.from_body(body, fetched_at)
+        except ValueError:
+            logger.warning("Ignoring the malformed Sessionize %s snapshot", view_name)
+            return None
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/view/{view_name}")
+    def load_snapshots(self) -> int:
+        """
+        Loads the views saved on disk that are not cached yet, so that the first requests
+        don't wait on Sessionize. Called at startup. Returns the number of loaded views.
+        """
+        loaded = 0
+        for view_name in self.VIEWS:
+            if view_name in self.cache:
+                continue
+            view = self._load_snapshot(view_name)
+            if view is not None:
+                self.cache[view_name] = view
+                loaded += 1
+        return loaded
+
+    async def _fetch(self, view_name: str) -> CachedView:
+        try:
+            response = await self._get_http_client().get(f"/view/{view_name}")
             response.raise_for_status()
-            data = response.json()
-            self.cache[view_name] = data
-            return data
+            # Serializing and compressing large views is CPU bound, keep it off the event loop
+            view = await asyncio.to_thread(CachedView.from_data, response.json(), time.time())
+        except Exception:
+            # Serve the last good snapshot rather than failing, if there is one not cached yet
+            if view_name in self.cache:
+                raise
+            view = await asyncio.to_thread(self._load_snapshot, view_name)
+            if view is None:
+                raise
+            logger.warning("Sessionize view %s unavailable, serving its snapshot", view_name, exc_info=True)
+            self.cache[view_name] = view
+            return view
+
+        self.cache[view_name] = view
+        if self.snapshot_store is not None:
+            await asyncio.to_thread(self.snapshot_store.save, view_name, view.body, view.fetched_at)
+        return view
+
+    def _fetch_once(self, view_name: str) -> asyncio.Task:
+        """
+        Returns the in-flight fetch of a view, starting one if there is none.
+        """
+        task = self._in_flight.get(view_name)
+        if task is None:
+            task = asyncio.create_task(self._fetch(view_name))
+            self._in_flight[view_name] = task
+            task.add_done_callback(lambda done: self._on_fetch_done(view_name, done))
+        return task
+
+    def _on_fetch_done(self, view_name: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(view_name) is task:
+            del self._in_flight[view_name]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to fetch Sessionize view %s", view_name, exc_info=task.exception())
+
+    async def get_view(self, view_name: str, fresh: bool = False) -> CachedView:
+        """
+        Returns the cached view with its pre-encoded body, fetching it if needed.
+        With fresh, waits for a fetch of the view instead, e.g. to sync from it, and
+        only falls back to the cached view or its snapshot if the fetch fails.
+        """
+        cached = self.cache.get(view_name)
+        if fresh:
+            try:
+                return await asyncio.shield(self._fetch_once(view_name))
+            except Exception:
+                # Cache misses already fall back to the snapshot in _fetch
+                cached = self.cache.get(view_name)
+                if cached is None:
+                    raise
+                logger.warning("Sessionize view %s unavailable, using the cached one", view_name, exc_info=True)
+                return cached
+
+        if cached is None:
+            # shield: a cancelled request must not cancel the fetch shared with other requests
+            return await asyncio.shield(self._fetch_once(view_name))
+
+        if time.time() - cached.fetched_at >= self.ttl:
+            # Stale: refresh in background, keep serving the last good data meanwhile
+            self._fetch_once(view_name)
+        return cached
+
+    async def _get_cached_or_fetch(self, view_name: str, fresh: bool = False) -> Any:
+        return (await self.get_view(view_name, fresh)).data
 
     async def get_all(self) -> Dict[str, Any]:
         """
         Fetches all data from Sessionize.
         """
-        return await self._get_cached_or_fetch("All")
+        return await self._get_cached_or_fetch(self.VIEW_ALL)
 
-    async def get_grid_smart(self) -> List[Dict[str, Any]]:
+    async def get_grid_smart(self, fresh: bool = False) -> List[Dict[str, Any]]:
         """
-        Fetches the GridSmart view from Sessionize.
+        Fetches the GridSmart view from Sessionize. With fresh, see get_view.
         """
-        return await self._get_cached_or_fetch("GridSmart")
+        return await self._get_cached_or_fetch(self.VIEW_GRID_SMART, fresh)
 
     async def get_sessions(self) -> List[Dict[str, Any]]:
         """
         Fetches the sessions from Sessionize.
         """
-        return await self._get_cached_or_fetch("Sessions")
+        return await self._get_cached_or_fetch(self.VIEW_SESSIONS)
 
     async def get_speakers(self) -> List[Dict[str, Any]]:
         """
         Fetches the speakers from Sessionize.
         """
-        return await self._get_cached_or_fetch("Speakers")
+        return await self._get_cached_or_fetch(self.VIEW_SPEAKERS)
 
     async def get_speaker_wall(self) -> List[Dict[str, Any]]:
         """
         Fetches the speaker wall from Sessionize.
         """
-        return await self._get_cached_or_fetch("SpeakerWall")
+        return await self._get_cached_or_fetch(self.VIEW_SPEAKER_WALL)
@@ -0,0 +1,12 @@
+from infrastructure.errors.base_error import BaseError
+
+class AdminJobNotFoundError(BaseError):
+    """Raised when reading an administration job that does not exist"""
+    def __init__(self, message: str = "Job not found", http_status: int = 404):
+        super().__init__(message, status_code=http_status)
+
+
+class AdminJobLeaseLostError(BaseError):
+    """Raised when saving an administration job whose lease is held by another process or expired"""
+    def __init__(self, message: str = "Job lease lost", http_status: int = 409):
+        super().__init__(message, status_code=http_status)
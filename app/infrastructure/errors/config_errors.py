@@ -10,3 +10,7 @@ class CheckInNotOpenError(BaseError):
     def __init__(self, message: str = "Check-in is currently closed", http_status: int = 403):
         super().__init__(message, status_code=http_status)
 
+class LeaderboardNotOpenError(BaseError):
+    """Raised when reading the leaderboard while it is not open"""
+    def __init__(self, message: str = "Leaderboard is currently closed", http_status: int = 403):
+        super().__init__(message, status_code=http_status)
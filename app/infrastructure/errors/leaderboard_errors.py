@@ -0,0 +1,6 @@
+from infrastructure.errors.base_error import BaseError
+
+class LeaderboardSnapshotNotFoundError(BaseError):
+    """Raised when no leaderboard snapshot was taken at or before the requested time"""
+    def __init__(self, message: str = "No leaderboard snapshot found", http_status: int = 404):
+        super().__init__(message, status_code=http_status)
@@ -60,3 +60,9 @@ class QuizAllSessionsAlreadyCompletedError(BaseError):
     def __init__(self, message: str = "All quiz sessions already completed", http_status: int = 403):
         super().__init__(message, status_code=http_status)
 
+
+
+class SessionSlotsNotReadyError(BaseError):
+    """Raised when a quiz is submitted before the session slots were ever synced"""
+    def __init__(self, message: str = "Session slots not synced yet, retry shortly", http_status: int = 503):
+        super().__init__(message, status_code=http_status)
@@ -0,0 +1,131 @@
+import time
+from typing import List, Optional
+
+from firebase_admin import firestore
+
+from domain.entities.admin_job import AdminJob, AdminJobStatus
+from infrastructure.clients.firestore_client import FirestoreClient
+from infrastructure.errors.admin_errors import AdminJobLeaseLostError, AdminJobNotFoundError
+
+
+class AdminJobRepository:
+    """
+    Repository for the administration jobs with Firestore.
+
+    Each job is an admin_jobs/{job_id} document holding its status and its checkpoint.
+    The process running a job holds a lease on it and renews it at each checkpoint and
+    from a heartbeat in between: a job whose lease expired was left behind by a stopped
+    process and can be resumed. Only the holder of a valid lease can save a job.
+    """
+
+    ADMIN_JOBS_COLLECTION: str = "admin_jobs"
+
+    def __init__(self, firestore_client: FirestoreClient):
+        self.firestore_client = firestore_client
+
+    def _get_timestamp(self) -> int:
+        return int(time.time() * 1000)
+
+    def _job_ref(self, job_id: str):
+        return self.firestore_client.db.collection(self.ADMIN_JOBS_COLLECTION).document(job_id)
+
+    def create(self, job: AdminJob) -> None:
+        """
+        Stores a new job.
+        """
+        self._job_ref(job.job_id).set(job.to_firestore_data())
+
+    def read(self, job_id: str) -> AdminJob:
+        """
+        Reads a job.
+
+        Raises:
+            AdminJobNotFoundError: if the job does not exist
+        """
+        snapshot = self._job_ref(job_id).get()
+        if not snapshot.exists:
+            raise AdminJobNotFoundError()
+        return AdminJob.from_dict({"job_id": snapshot.id, **(snapshot.to_dict() or {})})
+
+    def read_unfinished_ids(self, job_type: str) -> List[str]:
+        """
+        Reads the ids of the jobs of a type that are pending or running.
+        """
+        query = (
+            self.firestore_client.db.collection(self.ADMIN_JOBS_COLLECTION)
+            .where(filter=firestore.FieldFilter("job_type", "==", job_type))
+            .where(filter=firestore.FieldFilter(
+                "status", "in", [AdminJobStatus.PENDING.value, AdminJobStatus.RUNNING.value]
+            ))
+            .select([])
+        )
+        return [doc.id for doc in query.stream()]
+
+    def _holds_lease(self, snapshot, owner: str, now: int) -> bool:
+        data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+        return data.get("lease_owner") == owner and data.get("lease_expires_at", 0) > now
+
+    def save(self, job: AdminJob, owner: str, lease_seconds: float) -> None:
+        """
+        Checkpoints a job and renews the lease of its owner, in a transaction that
+        fails if `owner` no longer holds a valid lease, e.g. after another process
+        took the job over. Clearing job.lease_owner releases the lease.
+
+        Raises:
+            AdminJobLeaseLostError: if the lease is held by another process or expired
+        """
+        job_ref = self._job_ref(job.job_id)
+
+        @firestore.transactional
+        def save_in_transaction(transaction) -> None:
+            now = self._get_timestamp()
+            if not self._holds_lease(job_ref.get(transaction=transaction), owner, now):
+                raise AdminJobLeaseLostError()
+            job.updated_at = now
+            job.lease_expires_at = now + int(lease_seconds * 1000)
+            transaction.set(job_ref, job.to_firestore_data())
+
+        save_in_transaction(self.firestore_client.db.transaction())
+
+    def renew_lease(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Extends the lease of `owner` on a job without checkpointing it, e.g. during a
+        long step. Returns False if the lease is held by another process or expired.
+        """
+        job_ref = self._job_ref(job_id)
+
+        @firestore.transactional
+        def renew_in_transaction(transaction) -> bool:
+            now = self._get_timestamp()
+            if not self._holds_lease(job_ref.get(transaction=transaction), owner, now):
+                return False
+            transaction.update(job_ref, {"lease_expires_at": now + int(lease_seconds * 1000)})
+            return True
+
+        return renew_in_transaction(self.firestore_client.db.transaction())
+
+    def acquire_lease(self, job_id: str, owner: str, lease_seconds: float) -> Optional[AdminJob]:
+        """
+        Takes over an unfinished job whose lease expired, in a transaction so that
+        only one process resumes it.
+        Returns the job as checkpointed, or None if it's finished or its lease is still valid.
+        """
+        job_ref = self._job_ref(job_id)
+
+        @firestore.transactional
+        def acquire_in_transaction(transaction) -> Optional[AdminJob]:
+            snapshot = job_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            job = AdminJob.from_dict({"job_id": snapshot.id, **(snapshot.to_dict() or {})})
+            now = self._get_timestamp()
+            # A running job renews its lease at each checkpoint, even in this process
+            if job.is_finished() or job.lease_expires_at > now:
+                return None
+            job.lease_owner = owner
+            job.updated_at = now
+            job.lease_expires_at = now + int(lease_seconds * 1000)
+            transaction.set(job_ref, job.to_firestore_data())
+            return job
+
+        return acquire_in_transaction(self.firestore_client.db.transaction())
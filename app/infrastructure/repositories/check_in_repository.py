@@ -0,0 +1,132 @@
+import time
+from typing import Optional
+
+from firebase_admin import firestore
+from google.api_core.exceptions import FailedPrecondition
+
+from domain.entities.group_assignment_strategy import GroupAssignmentStrategy
+from infrastructure.clients.firestore_client import FirestoreClient
+from infrastructure.errors.auth_errors import ForbiddenError
+from infrastructure.errors.base_error import BaseError
+from infrastructure.errors.user_errors import ReadUserError, UpdateUserError
+from infrastructure.repositories.firestore_repository import FirestoreRepository
+from infrastructure.repositories.group_repository import GroupRepository
+from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+
+
+class CheckInRepository:
+    """
+    Repository for the check-in writes with Firestore.
+
+    A check-in selects a group, assigns it to the user and upserts the leaderboard
+    entries of the user and the group. All of them are committed together: in one
+    transaction with the transaction assignment strategy, in one batch with the
+    allocator strategy. The batch only updates the user if it is unchanged since it
+    was read, so a concurrent check-in can't assign a second group.
+    """
+
+    def __init__(self, firestore_client: FirestoreClient, group_repository: GroupRepository):
+        self.firestore_client = firestore_client
+        self.group_repository = group_repository
+
+    def _get_timestamp(self) -> int:
+        return int(time.time() * 1000)
+
+    def check_in(self, uid: str, nickname: str) -> Optional[dict]:
+        """
+        Checks in a user without a group.
+        Returns the assigned group data, with its gid, or None if the user already has a group.
+
+        Raises:
+            ReadUserError: if the user does not exist
+            ForbiddenError: if the user changed since it was read, e.g. checked in
+                concurrently (allocator strategy only)
+            ReadGroupError: if there are no groups
+            UpdateUserError: if the check-in could not be written
+        """
+        try:
+            if self.group_repository.assignment_strategy == GroupAssignmentStrategy.ALLOCATOR:
+                group = self._check_in_in_batch(uid, nickname)
+            else:
+                group = self._check_in_in_transaction(uid, nickname)
+        except BaseError:
+            raise
+        except Exception:
+            raise UpdateUserError(message="Failed to check in user", http_status=400)
+
+        if group is not None:
+            self.group_repository.invalidate_cached_group(group[GroupRepository.GROUP_ID])
+        return group
+
+    def _check_in_in_transaction(self, uid: str, nickname: str) -> Optional[dict]:
+        user_ref = self.firestore_client.db.collection(FirestoreRepository.USERS_COLLECTION).document(uid)
+
+        @firestore.transactional
+        def check_in_in_transaction(transaction) -> Optional[dict]:
+            # Reads go first in a transaction
+            snapshot = user_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                raise ReadUserError(message="User not found", http_status=404)
+            if (snapshot.to_dict() or {}).get(FirestoreRepository.USER_GROUP) is not None:
+                return None
+            group = self.group_repository.select_group_in_transaction(transaction)
+            self._add_check_in_writes(transaction, uid, nickname, group)
+            return group
+
+        return check_in_in_transaction(self.firestore_client.db.transaction())
+
+    def _check_in_in_batch(self, uid: str, nickname: str) -> Optional[dict]:
+        db = self.firestore_client.db
+        user_ref = db.collection(FirestoreRepository.USERS_COLLECTION).document(uid)
+        snapshot = user_ref.get()
+        if not snapshot.exists:
+            raise ReadUserError(message="User not found", http_status=404)
+        if (snapshot.to_dict() or {}).get(FirestoreRepository.USER_GROUP) is not None:
+            return None
+
+        group = self.group_repository.allocate_group()
+        batch = db.batch()
+        self.group_repository.add_user_count_increment(batch, group[GroupRepository.GROUP_ID])
+        # The whole batch fails if the user changed since it was read
+        self._add_check_in_writes(
+            batch, uid, nickname, group,
+            option=db.write_option(last_update_time=snapshot.update_time)
+        )
+        try:
+            batch.commit()
+        except FailedPrecondition:
+            # The local count was taken for nothing: reload the groups on the next check-in
+            self.group_repository.group_allocator.invalidate()
+            raise ForbiddenError()
+        except Exception:
+            # The group may have been deleted meanwhile: reload the groups on the next check-in
+            self.group_repository.group_allocator.invalidate()
+            raise
+        return group
+
+    def _add_check_in_writes(self, writer, uid: str, nickname: str, group: dict, option=None) -> None:
+        """
+        Adds the user and leaderboard writes of a check-in to a transaction or a batch,
+        with `option` as precondition of the user update.
+        The entries are upserted: Increment(0) sets a missing score to 0 and keeps an existing one.
+        The group name and color are only written when the group has them, so that a
+        group without them doesn't clear the ones already on the leaderboard.
+        """
+        db = self.firestore_client.db
+        gid = group[GroupRepository.GROUP_ID]
+        name, color = group.get(GroupRepository.GROUP_NAME), group.get(GroupRepository.GROUP_COLOR)
+        now = self._get_timestamp()
+        writer.update(db.collection(FirestoreRepository.USERS_COLLECTION).document(uid), {
+            FirestoreRepository.USER_GROUP: db.collection(GroupRepository.GROUP_COLLECTION).document(gid),
+            "checked_in": True
+        }, option=option)
+        group_entry = {"score": firestore.Increment(0), "updated_at": now}
+        if name:
+            group_entry["name"] = name
+        if color:
+            group_entry["color"] = color
+        writer.set(db.collection(LeaderboardRepository.LEADERBOARD_GROUP_COLLECTION).document(gid), group_entry, merge=True)
+        user_entry = {"nickname": nickname, "score": firestore.Increment(0), "updated_at": now}
+        if color:
+            user_entry["group_color"] = color
+        writer.set(db.collection(LeaderboardRepository.LEADERBOARD_USER_COLLECTION).document(uid), user_entry, merge=True)
@@ -1,4 +1,10 @@
+from typing import Optional
+
+from google.cloud.firestore_v1.field_path import FieldPath
+
 from domain.entities.user import User
+from infrastructure.caches.group_cache import GroupCache
+from infrastructure.clients.async_firestore_client import AsyncFirestoreClient
 from infrastructure.clients.firestore_client import FirestoreClient
 from infrastructure.errors.firestore_errors import *
 from infrastructure.errors.user_errors import *
@@ -24,9 +30,13 @@ class FirestoreRepository:
 
     def __init__(
         self,
-        firestore_client: FirestoreClient
+        firestore_client: FirestoreClient,
+        async_firestore_client: Optional[AsyncFirestoreClient] = None,
+        group_cache: Optional[GroupCache] = None
     ):
         self.firestore_client = firestore_client
+        self.async_firestore_client = async_firestore_client
+        self.group_cache = group_cache
 
 
     def create_user(self, user_data: User) -> None:
@@ -94,12 +104,32 @@ class FirestoreRepository:
             raise ReserveNicknameError(message=f"Failed to create nickname", http_status=400)
 
 
+    def _group_from_snapshot(self, group_doc) -> Optional[dict]:
+        """
+        Extracts the group data (with its document ID) from a group snapshot and caches it.
+        Returns None if the group doesn't exist or is empty.
+        """
+        group_data = group_doc.to_dict() if group_doc.exists else None
+        if not group_data:
+            return None
+        # Include the complete group object with document ID
+        group_data['gid'] = group_doc.id
+        if self.group_cache is not None:
+            self.group_cache.put(group_doc.id, group_data)
+        return group_data
+
+    def _get_cached_group(self, group_ref) -> Optional[dict]:
+        if self.group_cache is None:
+            return None
+        return self.group_cache.get(group_ref.id)
+
     def _resolve_group_reference(self, user_data: dict) -> None:
         """
         Resolves a Firestore DocumentReference in the 'group' field to extract the complete group object.
 
         This helper method checks if the user_data contains a 'group' field with a DocumentReference,
-        fetches the referenced group document, and replaces the reference with the complete group data.
+        takes the referenced group from the group cache or fetches it, and replaces the reference
+        with the complete group data.
         If the reference is invalid, missing, or the group doesn't exist, sets group to None.
 
         Args:
@@ -113,18 +143,12 @@ class FirestoreRepository:
             group_ref = user_data[self.USER_GROUP]
             # Check if it's a DocumentReference
             if hasattr(group_ref, 'get'):
+                cached_group = self._get_cached_group(group_ref)
+                if cached_group is not None:
+                    user_data[self.USER_GROUP] = cached_group
+                    return
                 try:
-                    group_doc = group_ref.get()
-                    if group_doc.exists:
-                        group_data = group_doc.to_dict()
-                        # Include the complete group object with document ID
-                        if group_data:
-                            group_data['gid'] = group_doc.id
-                            user_data[self.USER_GROUP] = group_data
-                        else:
-                            user_data[self.USER_GROUP] = None
-                    else:
-                        user_data[self.USER_GROUP] = None
+                    user_data[self.USER_GROUP] = self._group_from_snapshot(group_ref.get())
                 except Exception:
                     # If fetching the group fails, set to None
                     user_data[self.USER_GROUP] = None
@@ -132,6 +156,36 @@ class FirestoreRepository:
             elif not isinstance(group_ref, dict):
                 user_data[self.USER_GROUP] = None
 
+    def _resolve_group_references(self, users_data: list[dict]) -> None:
+        """
+        Resolves the group references of many users at once.
+
+        The distinct references that are not cached are fetched with a single get_all,
+        then every user is resolved from the cache.
+        """
+        refs_to_fetch = {}
+        for user_data in users_data:
+            group_ref = user_data.get(self.USER_GROUP)
+            if hasattr(group_ref, 'get') and self._get_cached_group(group_ref) is None:
+                refs_to_fetch[group_ref.path] = group_ref
+
+        missing_paths = set()
+        if refs_to_fetch:
+            try:
+                for group_doc in self.firestore_client.db.get_all(list(refs_to_fetch.values())):
+                    if self._group_from_snapshot(group_doc) is None:
+                        missing_paths.add(group_doc.reference.path)
+            except Exception:
+                # Fall back to resolving each reference on its own
+                pass
+
+        for user_data in users_data:
+            group_ref = user_data.get(self.USER_GROUP)
+            if hasattr(group_ref, 'path') and group_ref.path in missing_paths:
+                user_data[self.USER_GROUP] = None
+            else:
+                self._resolve_group_reference(user_data)
+
     def read_user(self, uid: str) -> dict:
         """
         Retrieves a single user document from the Firestore 'users' collection.
@@ -155,6 +209,45 @@ class FirestoreRepository:
             raise ReadUserError(message=f"Failed to read user", http_status=400)
 
 
+    async def _resolve_group_reference_async(self, user_data: dict) -> None:
+        """
+        Async variant of _resolve_group_reference, for documents read through the async client.
+        """
+        if self.USER_GROUP in user_data and user_data[self.USER_GROUP] is not None:
+            group_ref = user_data[self.USER_GROUP]
+            if hasattr(group_ref, 'get'):
+                cached_group = self._get_cached_group(group_ref)
+                if cached_group is not None:
+                    user_data[self.USER_GROUP] = cached_group
+                    return
+                try:
+                    user_data[self.USER_GROUP] = self._group_from_snapshot(await group_ref.get())
+                except Exception:
+                    user_data[self.USER_GROUP] = None
+            elif not isinstance(group_ref, dict):
+                user_data[self.USER_GROUP] = None
+
+    async def read_user_async(self, uid: str) -> dict:
+        """
+        Async variant of read_user.
+
+        Raises:
+            ReadUserError: If user retrieval fails. Specific scenarios:
+                - HTTP 404: User document with this UID does not exist in Firestore
+                - HTTP 400: Invalid UID format or other Firestore operation errors
+        """
+        try:
+            user_data_dict = await self.async_firestore_client.read_doc(
+                collection_name=self.USERS_COLLECTION, doc_id=uid
+            )
+            await self._resolve_group_reference_async(user_data_dict)
+            return {self.USER_ID: uid, **user_data_dict}
+        except DocumentNotFoundError:
+            raise ReadUserError(message=f"User was not found", http_status=404)
+        except Exception:
+            raise ReadUserError(message=f"Failed to read user", http_status=400)
+
+
     def read_all_users(self) -> list[dict]:
         """
         Retrieves all user documents from the Firestore 'users' collection.
@@ -172,8 +265,7 @@ class FirestoreRepository:
                 include_id=True,
                 id_field_name=self.USER_ID,
             )
-            for user in users:
-                self._resolve_group_reference(user)
+            self._resolve_group_references(users)
             return users
         except Exception:
             raise ReadUserError(message=f"Failed to read all users", http_status=400)
@@ -366,16 +458,111 @@ class FirestoreRepository:
             raise CreateUserError(f"Error writing to subcollection", http_status=400)
 
 
-    def delete_subcollection(
+    async def read_from_subcollection_async(
+        self,
+        document_id: str,
+        subcollection: str,
+        subdocument_id: str
+    ) -> dict:
+        """
+        Async variant of read_from_subcollection.
+        Raises DocumentNotFoundError if not found.
+        """
+        try:
+            path = f"{self.USERS_COLLECTION}/{document_id}/{subcollection}"
+            return await self.async_firestore_client.read_doc(collection_name=path, doc_id=subdocument_id)
+        except DocumentNotFoundError:
+            raise
+        except Exception as e:
+            raise ReadUserError(f"Error reading from subcollection {subcollection}", http_status=400)
+
+
+    async def read_all_from_subcollection_async(
         self,
         document_id: str,
         subcollection: str
+    ) -> list[dict]:
+        """
+        Async variant of read_all_from_subcollection.
+        """
+        try:
+            path = f"{self.USERS_COLLECTION}/{document_id}/{subcollection}"
+            return await self.async_firestore_client.read_all_docs(
+                collection_name=path,
+                include_id=True,
+                id_field_name="id"
+            )
+        except Exception as e:
+            raise ReadUserError(f"Error reading all from subcollection {subcollection}", http_status=400)
+
+
+    async def write_to_subcollection_async(
+        self,
+        document_id: str,
+        subcollection: str,
+        subdocument_id: str,
+        data: dict
     ) -> None:
         """
-        Deletes all documents in a subcollection.
+        Async variant of write_to_subcollection.
         """
         try:
             path = f"{self.USERS_COLLECTION}/{document_id}/{subcollection}"
-            self.firestore_client.delete_all_docs(path)
+            await self.async_firestore_client.set_doc(path, doc_id=subdocument_id, doc_data=data)
+        except Exception as e:
+            raise CreateUserError(f"Error writing to subcollection", http_status=400)
+
+
+    def count_users(self) -> int:
+        """
+        Counts the user documents with an aggregation query, without reading them.
+        """
+        result = self.firestore_client.db.collection(self.USERS_COLLECTION).count().get()
+        return int(result[0][0].value)
+
+
+    def read_user_ids_page(self, start_after: Optional[str], limit: int) -> list[str]:
+        """
+        Reads a page of user ids in document id order, starting after the given id.
+        Only document references are read.
+        """
+        query = (
+            self.firestore_client.db.collection(self.USERS_COLLECTION)
+            .order_by(FieldPath.document_id())
+            .select([])
+            .limit(limit)
+        )
+        if start_after is not None:
+            query = query.start_after({FieldPath.document_id(): start_after})
+        return [doc.id for doc in query.stream()]
+
+
+    def clear_users_tags(self, uids: list[str]) -> None:
+        """
+        Clears the tags of the given users with a BulkWriter, which batches and
+        parallelizes the writes and retries the throttled ones.
+        """
+        try:
+            users_ref = self.firestore_client.db.collection(self.USERS_COLLECTION)
+            bulk_writer = self.firestore_client.db.bulk_writer()
+            for uid in uids:
+                bulk_writer.update(users_ref.document(uid), {"tags": []})
+            bulk_writer.close()
+        except Exception as e:
+            raise UpdateUserError(f"Error clearing user tags", http_status=400)
+
+
+    def recursive_delete_subcollection(
+        self,
+        document_id: str,
+        subcollection: str
+    ) -> int:
+        """
+        Deletes a subcollection and all of its descendants with a BulkWriter.
+        Returns the number of documents deleted.
+        """
+        try:
+            user_ref = self.firestore_client.db.collection(self.USERS_COLLECTION).document(document_id)
+            return self.firestore_client.db.recursive_delete(user_ref.collection(subcollection))
         except Exception as e:
             raise DeleteUserError(f"Error deleting subcollection {subcollection}", http_status=400)
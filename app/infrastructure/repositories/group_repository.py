@@ -1,9 +1,13 @@
 import random
+from typing import Dict, Optional
 
 from firebase_admin import firestore
 from google.cloud.firestore import Transaction
 
 from domain.entities.group import Group
+from domain.entities.group_assignment_strategy import GroupAssignmentStrategy
+from infrastructure.caches.group_allocator import GroupAllocator
+from infrastructure.caches.group_cache import GroupCache
 from infrastructure.clients.firestore_client import FirestoreClient
 from infrastructure.errors.firestore_errors import DocumentNotFoundError
 from infrastructure.errors.group_errors import *
@@ -20,12 +24,31 @@ class GroupRepository:
     GROUP_COLOR: str = "color"
     GROUP_IMAGE_URL: str = "image_url"
     GROUP_USER_COUNT: str = "user_count"
+    USER_COUNT_SHARDS_COLLECTION: str = "user_count_shards"
 
     def __init__(
         self,
-        firestore_client: FirestoreClient
+        firestore_client: FirestoreClient,
+        group_cache: Optional[GroupCache] = None,
+        assignment_strategy: GroupAssignmentStrategy = GroupAssignmentStrategy.TRANSACTION,
+        group_allocator: Optional[GroupAllocator] = None,
+        counter_shards: int = 1
     ):
         self.firestore_client = firestore_client
+        self.group_cache = group_cache
+        # The allocator strategy needs the process-wide counts
+        self.assignment_strategy = assignment_strategy if group_allocator is not None else GroupAssignmentStrategy.TRANSACTION
+        self.group_allocator = group_allocator
+        # With more than one shard, allocator increments go to groups/{gid}/user_count_shards/{n}
+        # and are periodically rolled up into the group user_count
+        self.counter_shards = max(counter_shards, 1)
+
+    def _is_user_count_sharded(self) -> bool:
+        return self.counter_shards > 1
+
+    def invalidate_cached_group(self, gid: str) -> None:
+        if self.group_cache is not None:
+            self.group_cache.invalidate(gid)
 
     def create(self, group: Group) -> Group:
         """
@@ -89,6 +112,7 @@ class GroupRepository:
                 doc_id=gid,
                 doc_data=update_params
             )
+            self.invalidate_cached_group(gid)
             return self.read(gid)
         except DocumentNotFoundError:
             raise UpdateGroupError(message=f"Group not found", http_status=404)
@@ -101,6 +125,7 @@ class GroupRepository:
         """
         try:
             self.firestore_client.delete_doc(collection_name=self.GROUP_COLLECTION, doc_id=gid)
+            self.invalidate_cached_group(gid)
         except DocumentNotFoundError:
             raise DeleteGroupError(message=f"Group not found", http_status=404)
         except Exception:
@@ -112,6 +137,8 @@ class GroupRepository:
         """
         try:
             self.firestore_client.delete_all_docs(self.GROUP_COLLECTION)
+            if self.group_cache is not None:
+                self.group_cache.clear()
         except Exception:
             raise DeleteGroupError(message=f"Failed to delete all groups", http_status=400)
 
@@ -122,51 +149,170 @@ class GroupRepository:
         try:
             group_doc = self.firestore_client.db.collection(self.GROUP_COLLECTION).document(gid)
             group_doc.update({self.GROUP_USER_COUNT: firestore.Increment(-1)})
+            self.invalidate_cached_group(gid)
         except Exception:
             raise UpdateGroupError(message=f"Failed to decrement user count", http_status=400)
 
     def increment_group_counter(self) -> str:
-        groups_ref = self.firestore_client.db.collection(self.GROUP_COLLECTION)
+        """
+        Picks the group of a user being checked in, one of the least populated,
+        and increments its user count. Returns the gid.
+        """
+        if self.assignment_strategy == GroupAssignmentStrategy.ALLOCATOR:
+            return self._allocate_group()
+        return self._increment_group_counter_in_transaction()
+
+    def _read_groups(self) -> Dict[str, dict]:
+        """
+        Reads the gid -> group data map, with the users still in the shards counted in user_count.
+        """
+        db = self.firestore_client.db
+        groups = {}
+        for doc in db.collection(self.GROUP_COLLECTION).stream():
+            data = doc.to_dict() or {}
+            data[self.GROUP_ID] = doc.id
+            data[self.GROUP_USER_COUNT] = data.get(self.GROUP_USER_COUNT, 0) or 0
+            groups[doc.id] = data
+        if self._is_user_count_sharded():
+            for shard in db.collection_group(self.USER_COUNT_SHARDS_COLLECTION).stream():
+                gid = shard.reference.parent.parent.id
+                # Shards of deleted groups are ignored
+                if gid in groups:
+                    groups[gid][self.GROUP_USER_COUNT] += (shard.to_dict() or {}).get(self.GROUP_USER_COUNT, 0)
+        return groups
+
+    def allocate_group(self) -> dict:
+        """
+        Picks a group from the in-memory counts of the allocator, without writing.
+        Returns the group data, with its gid. The count must then be incremented with
+        add_user_count_increment.
+
+        Raises:
+            ReadGroupError: if there are no groups
+        """
+        try:
+            return self.group_allocator.allocate(self._read_groups)
+        except LookupError:
+            raise ReadGroupError(message="No groups available", http_status=404)
+        except Exception:
+            raise UpdateGroupError(message=f"Failed to select group", http_status=400)
+
+    def add_user_count_increment(self, batch, gid: str) -> None:
+        """
+        Adds the atomic increment of a group user count to a write batch.
+        """
+        group_doc = self.firestore_client.db.collection(self.GROUP_COLLECTION).document(gid)
+        if self._is_user_count_sharded():
+            batch.set(
+                group_doc.collection(self.USER_COUNT_SHARDS_COLLECTION).document(str(random.randrange(self.counter_shards))),
+                {self.GROUP_USER_COUNT: firestore.Increment(1)},
+                merge=True
+            )
+        else:
+            batch.update(group_doc, {self.GROUP_USER_COUNT: firestore.Increment(1)})
+
+    def _allocate_group(self) -> str:
+        """
+        Picks the group from the in-memory counts of the allocator and increments
+        its count with an atomic increment, without reading the groups in a transaction.
+        """
+        gid = self.allocate_group()[self.GROUP_ID]
+        try:
+            batch = self.firestore_client.db.batch()
+            self.add_user_count_increment(batch, gid)
+            batch.commit()
+        except Exception:
+            # The group may have been deleted meanwhile: reload the counts on the next check-in
+            self.group_allocator.invalidate()
+            raise UpdateGroupError(message=f"Failed to select group", http_status=400)
+        self.invalidate_cached_group(gid)
+        return gid
+
+    def rollup_user_counts(self) -> int:
+        """
+        Moves the users counted in the shards into the user_count of each group, in a
+        transaction per group that subtracts from every shard the value read.
+        Returns the number of groups whose count changed.
+        """
+        db = self.firestore_client.db
+        updated = 0
 
         @firestore.transactional
-        def update_in_transaction(transaction):
-            groups_data = []
+        def rollup_in_transaction(transaction, group_doc) -> bool:
+            if not group_doc.get(transaction=transaction).exists:
+                return False
+            shards = [
+                shard for shard in group_doc.collection(self.USER_COUNT_SHARDS_COLLECTION).get(transaction=transaction)
+                if (shard.to_dict() or {}).get(self.GROUP_USER_COUNT, 0)
+            ]
+            if not shards:
+                return False
+            total = sum(shard.to_dict()[self.GROUP_USER_COUNT] for shard in shards)
+            transaction.update(group_doc, {self.GROUP_USER_COUNT: firestore.Increment(total)})
+            for shard in shards:
+                transaction.update(shard.reference, {
+                    self.GROUP_USER_COUNT: firestore.Increment(-shard.to_dict()[self.GROUP_USER_COUNT])
+                })
+            return True
+
+        try:
+            for group_doc in db.collection(self.GROUP_COLLECTION).list_documents():
+                if rollup_in_transaction(db.transaction(), group_doc):
+                    self.invalidate_cached_group(group_doc.id)
+                    updated += 1
+            return updated
+        except Exception:
+            raise UpdateGroupError(message=f"Failed to roll up group user counts", http_status=400)
 
-            for doc in groups_ref.stream():
-                if doc.exists:
-                    data = doc.to_dict()
-                    data['gid'] = doc.id
-                    groups_data.append(data)
+    def select_group_in_transaction(self, transaction) -> dict:
+        """
+        Reads the groups in the transaction, picks one of the least populated at random
+        and increments its user count in the transaction.
+        Returns the group data, with its gid.
+        """
+        groups_ref = self.firestore_client.db.collection(self.GROUP_COLLECTION)
+        groups_data = []
 
-            if not groups_data:
-                raise ReadGroupError(message="No groups available", http_status=404)
+        for doc in groups_ref.stream(transaction=transaction):
+            if doc.exists:
+                data = doc.to_dict()
+                data['gid'] = doc.id
+                groups_data.append(data)
 
-            # Find the minimum user_count among all groups
-            min_count = min(g.get(self.GROUP_USER_COUNT, 0) or 0 for g in groups_data)
+        if not groups_data:
+            raise ReadGroupError(message="No groups available", http_status=404)
 
-            # Get all groups that have this minimum count
-            min_groups = [g for g in groups_data if (g.get(self.GROUP_USER_COUNT, 0) or 0) == min_count]
+        # Find the minimum user_count among all groups
+        min_count = min(g.get(self.GROUP_USER_COUNT, 0) or 0 for g in groups_data)
 
-            # If multiple groups have same count, pick one randomly for better distribution
-            selected_group = random.choice(min_groups)
-            selected_gid = selected_group['gid']
+        # Get all groups that have this minimum count
+        min_groups = [g for g in groups_data if (g.get(self.GROUP_USER_COUNT, 0) or 0) == min_count]
 
-            # Increment the counter of the selected group atomically
-            group_doc_ref = groups_ref.document(selected_gid)
+        # If multiple groups have same count, pick one randomly for better distribution
+        selected_group = random.choice(min_groups)
 
-            # Read current value from the data we already have
-            current_count = selected_group.get(self.GROUP_USER_COUNT, 0) or 0
+        # Read current value from the data we already have
+        current_count = selected_group.get(self.GROUP_USER_COUNT, 0) or 0
 
-            # Update with the new value using transaction
-            transaction.update(group_doc_ref, {
-                self.GROUP_USER_COUNT: current_count + 1
-            })
+        # Update with the new value using transaction
+        transaction.update(groups_ref.document(selected_group['gid']), {
+            self.GROUP_USER_COUNT: current_count + 1
+        })
+        selected_group[self.GROUP_USER_COUNT] = current_count + 1
 
-            return selected_gid
+        return selected_group
+
+    def _increment_group_counter_in_transaction(self) -> str:
+
+        @firestore.transactional
+        def update_in_transaction(transaction):
+            return self.select_group_in_transaction(transaction)['gid']
 
         try:
             # Execute the transaction
             transaction = self.firestore_client.db.transaction()
-            return update_in_transaction(transaction)
+            selected_gid = update_in_transaction(transaction)
+            self.invalidate_cached_group(selected_gid)
+            return selected_gid
         except Exception:
             raise UpdateGroupError(message=f"Failed to select group", http_status=400)
@@ -1,7 +1,18 @@
+import random
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
 from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists, NotFound
 
+from domain.entities.leaderboard_entry import LeaderboardEntry
+from domain.entities.leaderboard_snapshot import LeaderboardSnapshot
+from domain.entities.score_event import ScoreEvent
+from domain.entities.score_replay_summary import ScoreReplaySummary
+from domain.entities.score_reset_summary import ScoreResetSummary
+from infrastructure.clients.async_firestore_client import AsyncFirestoreClient
 from infrastructure.clients.firestore_client import FirestoreClient
 from infrastructure.errors.firestore_errors import DocumentNotFoundError
 from infrastructure.errors.user_errors import CreateUserError
@@ -15,11 +26,39 @@ class LeaderboardRepository:
 
     LEADERBOARD_USER_COLLECTION: str = "leaderboard_users"
     LEADERBOARD_GROUP_COLLECTION: str = "leaderboard_groups"
+    GROUP_SHARDS_COLLECTION: str = "score_shards"
+    SCORE_LEDGER_COLLECTION: str = "score_ledger"
+    # Set on the ledger entries recorded by the score aggregator until their points are applied
+    SCORE_PENDING_SINCE: str = "pending_since"
+    # Single document holding the current score epoch, started by each reset
+    SCORE_EPOCHS_COLLECTION: str = "score_epochs"
+    SCORE_EPOCH_DOC_ID: str = "current"
+    LEADERBOARD_SNAPSHOTS_COLLECTION: str = "leaderboard_snapshots"
 
     DEFAULT_GROUP_COLOR: str = "black"
 
-    def __init__(self, firestore_client: FirestoreClient):
+    # Firestore batches are limited to 500 operations
+    BATCH_SIZE: int = 500
+    # Batches committed concurrently by the bulk operations
+    BATCH_PARALLELISM: int = 4
+
+    def __init__(
+        self,
+        firestore_client: FirestoreClient,
+        async_firestore_client: Optional[AsyncFirestoreClient] = None,
+        group_shards: int = 1
+    ):
         self.firestore_client = firestore_client
+        self.async_firestore_client = async_firestore_client
+        # With more than one shard, group increments go to leaderboard_groups/{gid}/score_shards/{n}
+        # and are periodically rolled up into the group score
+        self.group_shards = max(group_shards, 1)
+
+    def _is_group_score_sharded(self) -> bool:
+        return self.group_shards > 1
+
+    def _random_shard_id(self) -> str:
+        return str(random.randrange(self.group_shards))
 
 
     def _get_timestamp(self) -> int:
@@ -127,65 +166,494 @@ class LeaderboardRepository:
         except Exception as e:
             raise CreateUserError(f"Failed to create group leaderboard entry", http_status=400)
 
-    def increment_user_score(self, uid: str, points: int) -> None:
+    def read_user_entries(self) -> List[LeaderboardEntry]:
+        """
+        Reads all the user entries of the leaderboard.
         """
-        Atomically increments the score for a user in the leaderboard.
-        Uses Firestore Increment to ensure atomicity and handle concurrency.
+        users = self.firestore_client.read_all_docs(self.LEADERBOARD_USER_COLLECTION, include_id=True)
+        return [LeaderboardEntry.from_user_dict(user["id"], user) for user in users]
 
-        Args:
-            uid (str): The user's UID (document ID)
-            points (int): The points to add (can be positive or negative)
+    def read_group_entries(self) -> List[LeaderboardEntry]:
         """
-        try:
-            user_doc = self.firestore_client.db.collection(self.LEADERBOARD_USER_COLLECTION).document(uid)
-            user_doc.update({
-                "score": firestore.Increment(points),
-                "updated_at": self._get_timestamp()
+        Reads all the group entries of the leaderboard.
+        """
+        groups = self.firestore_client.read_all_docs(self.LEADERBOARD_GROUP_COLLECTION, include_id=True)
+        return [LeaderboardEntry.from_group_dict(group["id"], group) for group in groups]
+
+    def read_score_epoch(self) -> int:
+        """
+        Reads the current score epoch, 0 until the first reset.
+        """
+        snapshot = self.firestore_client.db.collection(self.SCORE_EPOCHS_COLLECTION).document(self.SCORE_EPOCH_DOC_ID).get()
+        return (snapshot.to_dict() or {}).get("epoch", 0) if snapshot.exists else 0
+
+    async def read_score_epoch_async(self) -> int:
+        """
+        Async variant of read_score_epoch.
+        """
+        snapshot = await self.async_firestore_client.db.collection(self.SCORE_EPOCHS_COLLECTION).document(self.SCORE_EPOCH_DOC_ID).get()
+        return (snapshot.to_dict() or {}).get("epoch", 0) if snapshot.exists else 0
+
+    def watch_score_epoch(self, callback: Callable[[int], None]):
+        """
+        Calls `callback` with the current score epoch on every change, and once with its
+        current value. Returns the Firestore watch, to be unsubscribed.
+        """
+        def on_snapshot(docs, changes, read_time) -> None:
+            for doc in docs:
+                callback((doc.to_dict() or {}).get("epoch", 0) if doc.exists else 0)
+
+        return self.firestore_client.db.collection(self.SCORE_EPOCHS_COLLECTION).document(self.SCORE_EPOCH_DOC_ID).on_snapshot(on_snapshot)
+
+    def _start_score_epoch(self) -> int:
+        """
+        Starts a new score epoch, after every epoch started so far, and returns it.
+        """
+        db = self.firestore_client.db
+        epoch_doc = db.collection(self.SCORE_EPOCHS_COLLECTION).document(self.SCORE_EPOCH_DOC_ID)
+
+        @firestore.transactional
+        def start_in_transaction(transaction) -> int:
+            snapshot = epoch_doc.get(transaction=transaction)
+            data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+            epoch = max(data.get("epoch", 0), data.get("last_epoch", 0)) + 1
+            transaction.set(epoch_doc, {"epoch": epoch, "last_epoch": epoch, "started_at": self._get_timestamp()})
+            return epoch
+
+        return start_in_transaction(db.transaction())
+
+    def _add_score_increments(self, db, batch, event: ScoreEvent) -> None:
+        """
+        Adds the leaderboard increments of an event to a write batch, of the sync or async client.
+        """
+        updated_at = self._get_timestamp()
+        batch.update(db.collection(self.LEADERBOARD_USER_COLLECTION).document(event.uid), {
+            "score": firestore.Increment(event.points),
+            "updated_at": updated_at
+        })
+        if not event.gid:
+            return
+        group_doc = db.collection(self.LEADERBOARD_GROUP_COLLECTION).document(event.gid)
+        if self._is_group_score_sharded():
+            batch.set(
+                group_doc.collection(self.GROUP_SHARDS_COLLECTION).document(self._random_shard_id()),
+                {"score": firestore.Increment(event.points)},
+                merge=True
+            )
+        else:
+            batch.update(group_doc, {
+                "score": firestore.Increment(event.points),
+                "updated_at": updated_at
             })
+
+    def record_score_event(self, event: ScoreEvent) -> bool:
+        """
+        Records an event in the score ledger of its epoch, the current one stamped by the
+        caller, and applies its points to the user and group scores, in one atomic batch.
+        The ledger entry is created with the event id, scoped to the epoch, as document id,
+        so an event already recorded fails the whole batch and its points are not counted twice.
+        Returns False if the event was already recorded in this epoch.
+        """
+        db = self.firestore_client.db
+        try:
+            batch = db.batch()
+            batch.create(db.collection(self.SCORE_LEDGER_COLLECTION).document(event.ledger_id()), event.to_firestore_data())
+            self._add_score_increments(db, batch, event)
+            batch.commit()
+            return True
+        except AlreadyExists:
+            return False
         except Exception as e:
-            raise IncrementScoreError(f"Failed to increment user score", http_status=400)
+            raise IncrementScoreError(f"Failed to increment scores", http_status=400)
 
-    def increment_group_score(self, group_id: str, points: int) -> None:
+    async def record_score_event_async(self, event: ScoreEvent) -> bool:
         """
-        Atomically increments the score for a group in the leaderboard.
-        Uses Firestore Increment to ensure atomicity and handle concurrency.
+        Async variant of record_score_event.
+        """
+        db = self.async_firestore_client.db
+        try:
+            batch = db.batch()
+            batch.create(db.collection(self.SCORE_LEDGER_COLLECTION).document(event.ledger_id()), event.to_firestore_data())
+            self._add_score_increments(db, batch, event)
+            await batch.commit()
+            return True
+        except AlreadyExists:
+            return False
+        except Exception as e:
+            raise IncrementScoreError(f"Failed to increment scores", http_status=400)
+
 
-        Args:
-            group_id (str): The group's ID (document ID)
-            points (int): The points to add (can be positive or negative)
+    def _commit_in_batches(self, operations: List[tuple]) -> None:
         """
+        Commits (reference, data) operations in BATCH_SIZE batches, BATCH_PARALLELISM at a time.
+        Data None deletes the document, otherwise the document is updated with it.
+        """
+        db = self.firestore_client.db
+
+        def commit_chunk(chunk) -> None:
+            batch = db.batch()
+            for ref, data in chunk:
+                if data is None:
+                    batch.delete(ref)
+                else:
+                    batch.update(ref, data)
+            batch.commit()
+
+        chunks = [operations[i:i + self.BATCH_SIZE] for i in range(0, len(operations), self.BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=self.BATCH_PARALLELISM) as executor:
+            # list() re-raises the first failed commit
+            list(executor.map(commit_chunk, chunks))
+
+
+    def reset_all_scores(self) -> ScoreResetSummary:
+        """
+        Resets all scores in the leaderboard to 0 and drops the pending group shards
+        and the points of the pending ledger entries. A new score epoch is started first, so that points
+        can be earned again, while the ledger entries of the previous epochs are kept
+        and can still be replayed.
+        Only document references are read, then writes are sent in 500-operation
+        batches, BATCH_PARALLELISM at a time.
+        Returns a summary of the documents touched and of the time taken.
+        """
+        started_at = time.perf_counter()
         try:
-            group_doc = self.firestore_client.db.collection(self.LEADERBOARD_GROUP_COLLECTION).document(group_id)
-            group_doc.update({
-                "score": firestore.Increment(points),
+            db = self.firestore_client.db
+            epoch = self._start_score_epoch()
+            reset_data = {"score": 0, "updated_at": self._get_timestamp()}
+
+            # select([]) returns the document references without their fields
+            user_refs = [doc.reference for doc in db.collection(self.LEADERBOARD_USER_COLLECTION).select([]).stream()]
+            group_refs = [doc.reference for doc in db.collection(self.LEADERBOARD_GROUP_COLLECTION).select([]).stream()]
+            shard_refs = [doc.reference for doc in db.collection_group(self.GROUP_SHARDS_COLLECTION).select([]).stream()]
+            pending_refs = self._read_pending_refs()
+
+            self._commit_in_batches(
+                [(ref, reset_data) for ref in user_refs + group_refs]
+                + [(ref, None) for ref in shard_refs]
+                + [(ref, {self.SCORE_PENDING_SINCE: firestore.DELETE_FIELD}) for ref in pending_refs]
+            )
+
+            return ScoreResetSummary(
+                epoch=epoch,
+                users=len(user_refs),
+                groups=len(group_refs),
+                shards=len(shard_refs),
+                outbox_events=len(pending_refs),
+                duration_ms=int((time.perf_counter() - started_at) * 1000)
+            )
+        except Exception as e:
+            raise IncrementScoreError(f"Failed to reset scores", http_status=400)
+
+
+    def read_group_score(self, group_id: str) -> int:
+        """
+        Reads the up to date score of a group: the group score plus
+        the points still pending in its shards.
+        """
+        group_doc = self.firestore_client.db.collection(self.LEADERBOARD_GROUP_COLLECTION).document(group_id)
+        snapshot = group_doc.get()
+        if not snapshot.exists:
+            raise DocumentNotFoundError()
+        score = (snapshot.to_dict() or {}).get("score", 0)
+        for shard in group_doc.collection(self.GROUP_SHARDS_COLLECTION).stream():
+            score += (shard.to_dict() or {}).get("score", 0)
+        return score
+
+
+    def rollup_group_scores(self) -> int:
+        """
+        Moves the points accumulated in the shards into the score of each group.
+        Each group is rolled up in a transaction that adds the shard total to the
+        group score and subtracts from every shard the value read, so increments
+        landing meanwhile are kept and concurrent rollups never count twice.
+        Returns the number of groups whose score changed.
+        """
+        db = self.firestore_client.db
+        updated = 0
+
+        @firestore.transactional
+        def rollup_in_transaction(transaction, group_doc) -> bool:
+            if not group_doc.get(transaction=transaction).exists:
+                return False
+            shards = [
+                shard for shard in group_doc.collection(self.GROUP_SHARDS_COLLECTION).get(transaction=transaction)
+                if (shard.to_dict() or {}).get("score", 0)
+            ]
+            if not shards:
+                return False
+            total = sum(shard.to_dict()["score"] for shard in shards)
+            transaction.update(group_doc, {
+                "score": firestore.Increment(total),
                 "updated_at": self._get_timestamp()
             })
+            for shard in shards:
+                transaction.update(shard.reference, {"score": firestore.Increment(-shard.to_dict()["score"])})
+            return True
+
+        try:
+            for group_doc in db.collection(self.LEADERBOARD_GROUP_COLLECTION).list_documents():
+                if rollup_in_transaction(db.transaction(), group_doc):
+                    updated += 1
+            return updated
         except Exception as e:
-            raise IncrementScoreError(f"Failed to increment group score", http_status=400)
+            raise IncrementScoreError(f"Failed to roll up group scores", http_status=400)
 
 
-    def reset_all_scores(self) -> None:
+    def _pending_ledger_data(self, event: ScoreEvent) -> dict:
+        return {**event.to_firestore_data(), self.SCORE_PENDING_SINCE: event.created_at}
+
+    def create_score_event(self, event: ScoreEvent) -> Optional[ScoreEvent]:
         """
-        Resets all scores in the leaderboard to 0.
+        Durably records points to be applied later: the event is created in the score
+        ledger of its epoch, marked as pending until apply_score_events applies it.
+        This single write is all the request path pays.
+        Returns the event, or None if the event was already recorded in this epoch,
+        in which case nothing is written.
         """
         try:
-            # Reset user scores
-            users = self.firestore_client.read_all_docs(self.LEADERBOARD_USER_COLLECTION, include_id=True)
-            for user in users:
-                self.firestore_client.update_doc(
-                    self.LEADERBOARD_USER_COLLECTION,
-                    user["id"],
-                    {"score": 0, "updated_at": self._get_timestamp()}
-                )
+            ledger = self.firestore_client.db.collection(self.SCORE_LEDGER_COLLECTION)
+            ledger.document(event.ledger_id()).create(self._pending_ledger_data(event))
+            return event
+        except AlreadyExists:
+            return None
+        except Exception as e:
+            raise IncrementScoreError(f"Failed to record score event", http_status=400)
 
-            # Reset group scores
-            groups = self.firestore_client.read_all_docs(self.LEADERBOARD_GROUP_COLLECTION, include_id=True)
-            for group in groups:
-                self.firestore_client.update_doc(
-                    self.LEADERBOARD_GROUP_COLLECTION,
-                    group["id"],
-                    {"score": 0, "updated_at": self._get_timestamp()}
-                )
+    async def create_score_event_async(self, event: ScoreEvent) -> Optional[ScoreEvent]:
+        """
+        Async variant of create_score_event.
+        """
+        try:
+            ledger = self.async_firestore_client.db.collection(self.SCORE_LEDGER_COLLECTION)
+            await ledger.document(event.ledger_id()).create(self._pending_ledger_data(event))
+            return event
+        except AlreadyExists:
+            return None
         except Exception as e:
-            raise IncrementScoreError(f"Failed to reset scores", http_status=400)
+            raise IncrementScoreError(f"Failed to record score event", http_status=400)
+
+
+    def _read_pending_refs(self) -> list:
+        """
+        Reads the references of all the pending ledger entries, without their fields.
+        """
+        query = (
+            self.firestore_client.db.collection(self.SCORE_LEDGER_COLLECTION)
+            .where(filter=firestore.FieldFilter(self.SCORE_PENDING_SINCE, ">=", 0))
+        )
+        return [doc.reference for doc in query.select([]).stream()]
+
 
+    def read_pending_score_event_ids(self, created_before: int, limit: int) -> List[str]:
+        """
+        Reads the ledger ids of the pending events created before the given timestamp
+        (milliseconds), i.e. the events left behind by a process that stopped before applying them.
+        """
+        query = (
+            self.firestore_client.db.collection(self.SCORE_LEDGER_COLLECTION)
+            .where(filter=firestore.FieldFilter(self.SCORE_PENDING_SINCE, "<", created_before))
+            .limit(limit)
+        )
+        return [doc.id for doc in query.select([]).stream()]
+
+
+    def apply_score_events(self, ledger_ids: List[str]) -> int:
+        """
+        Applies the given pending ledger entries to the leaderboard and clears their pending
+        marker, in one transaction. Deltas are summed per user and per group, so each
+        leaderboard document is written once per call.
+        Entries no longer pending were already applied and are skipped, which makes it
+        safe for several processes to apply the same events.
+        Only the ledger entries are read in the transaction: the leaderboard documents are
+        blind Increment updates, so flushes of different processes don't contend on the hot
+        group documents. Points of users or groups without a leaderboard entry are dropped:
+        when an update fails with NotFound the missing documents are looked up and skipped.
+        Returns the number of events applied.
+        """
+        if not ledger_ids:
+            return 0
+        db = self.firestore_client.db
+        ledger = db.collection(self.SCORE_LEDGER_COLLECTION)
+        users = db.collection(self.LEADERBOARD_USER_COLLECTION)
+        groups = db.collection(self.LEADERBOARD_GROUP_COLLECTION)
+        touched_refs: list = []
+        missing_paths: set = set()
+
+        @firestore.transactional
+        def apply_in_transaction(transaction) -> int:
+            event_snapshots = [
+                snapshot for snapshot in db.get_all([ledger.document(ledger_id) for ledger_id in ledger_ids], transaction=transaction)
+                if snapshot.exists and snapshot.get(self.SCORE_PENDING_SINCE) is not None
+            ]
+            user_points: Dict[str, int] = defaultdict(int)
+            group_points: Dict[str, int] = defaultdict(int)
+            for snapshot in event_snapshots:
+                event = ScoreEvent.from_dict({"event_id": snapshot.id, **snapshot.to_dict()})
+                user_points[event.uid] += event.points
+                if event.gid:
+                    group_points[event.gid] += event.points
+
+            touched_refs.clear()
+            updated_at = self._get_timestamp()
+            for uid, points in user_points.items():
+                user_doc = users.document(uid)
+                if points and user_doc.path not in missing_paths:
+                    touched_refs.append(user_doc)
+                    transaction.update(user_doc, {
+                        "score": firestore.Increment(points),
+                        "updated_at": updated_at
+                    })
+            for gid, points in group_points.items():
+                group_doc = groups.document(gid)
+                if not points or group_doc.path in missing_paths:
+                    continue
+                if self._is_group_score_sharded():
+                    transaction.set(
+                        group_doc.collection(self.GROUP_SHARDS_COLLECTION).document(self._random_shard_id()),
+                        {"score": firestore.Increment(points)},
+                        merge=True
+                    )
+                else:
+                    touched_refs.append(group_doc)
+                    transaction.update(group_doc, {
+                        "score": firestore.Increment(points),
+                        "updated_at": updated_at
+                    })
+            for snapshot in event_snapshots:
+                transaction.update(snapshot.reference, {self.SCORE_PENDING_SINCE: firestore.DELETE_FIELD})
+            return len(event_snapshots)
+
+        try:
+            try:
+                return apply_in_transaction(db.transaction())
+            except NotFound:
+                # Rare: a user or group deleted with points pending, skip it and apply the rest
+                missing_paths.update(snapshot.reference.path for snapshot in db.get_all(touched_refs) if not snapshot.exists)
+                return apply_in_transaction(db.transaction())
+        except Exception as e:
+            raise IncrementScoreError(f"Failed to apply score events", http_status=400)
+
+
+    def snapshot_exists(self, taken_at: int) -> bool:
+        """
+        Checks if the snapshot of the given time was already taken.
+        """
+        return self.firestore_client.db.collection(self.LEADERBOARD_SNAPSHOTS_COLLECTION).document(str(taken_at)).get().exists
+
+
+    def create_snapshot(self, snapshot: LeaderboardSnapshot) -> bool:
+        """
+        Stores a leaderboard snapshot, with its time as document id.
+        Returns False if a snapshot of the same time was already stored, e.g. by another instance.
+        """
+        doc_ref = self.firestore_client.db.collection(self.LEADERBOARD_SNAPSHOTS_COLLECTION).document(str(snapshot.taken_at))
+        try:
+            doc_ref.create(snapshot.to_firestore_data())
+            return True
+        except AlreadyExists:
+            return False
+
+
+    def read_snapshot_at(self, timestamp: int) -> Optional[LeaderboardSnapshot]:
+        """
+        Reads the last snapshot taken at or before the given time, or None if there is none.
+        """
+        query = (
+            self.firestore_client.db.collection(self.LEADERBOARD_SNAPSHOTS_COLLECTION)
+            .where(filter=firestore.FieldFilter("taken_at", "<=", timestamp))
+            .order_by("taken_at", direction=firestore.Query.DESCENDING)
+            .limit(1)
+        )
+        for doc in query.stream():
+            return LeaderboardSnapshot.from_dict(doc.to_dict())
+        return None
+
+
+    def read_snapshots(self, start: int, end: int, limit: int) -> List[LeaderboardSnapshot]:
+        """
+        Reads the first `limit` snapshots taken between start and end (inclusive), oldest first.
+        """
+        query = (
+            self.firestore_client.db.collection(self.LEADERBOARD_SNAPSHOTS_COLLECTION)
+            .where(filter=firestore.FieldFilter("taken_at", ">=", start))
+            .where(filter=firestore.FieldFilter("taken_at", "<=", end))
+            .order_by("taken_at")
+            .limit(limit)
+        )
+        return [LeaderboardSnapshot.from_dict(doc.to_dict()) for doc in query.stream()]
+
+
+    def replay_score_ledger(self, dry_run: bool = False, epoch: Optional[int] = None) -> ScoreReplaySummary:
+        """
+        Rebuilds the user and group scores from the score ledger of an epoch, the current
+        one by default.
+
+        The ledger entries of the epoch are streamed once, with only the fields needed, and
+        summed per user and per group. Scores that differ from the sums are then rewritten
+        in 500-operation batches, BATCH_PARALLELISM at a time. The group shards are dropped
+        and the pending ledger entries marked as applied: their points are already in the sums.
+        Replaying a previous epoch, e.g. to undo a reset, makes it the current epoch again,
+        so the events already recorded in it are not counted twice.
+        Points recorded while the replay runs may be lost, run it with the leaderboard closed.
+        With dry_run nothing is written and the summary tells what would change.
+        """
+        started_at = time.perf_counter()
+        try:
+            db = self.firestore_client.db
+            current_epoch = self.read_score_epoch()
+            if epoch is None:
+                epoch = current_epoch
+
+            ledger = db.collection(self.SCORE_LEDGER_COLLECTION)
+            if epoch:
+                ledger = ledger.where(filter=firestore.FieldFilter("epoch", "==", epoch))
+            user_points: Dict[str, int] = defaultdict(int)
+            group_points: Dict[str, int] = defaultdict(int)
+            ledger_entries = 0
+            for doc in ledger.select(["uid", "gid", "points", "epoch"]).stream():
+                entry = doc.to_dict() or {}
+                # Entries recorded before epochs existed have no epoch field and belong to epoch 0
+                if entry.get("epoch", 0) != epoch:
+                    continue
+                ledger_entries += 1
+                user_points[entry["uid"]] += entry.get("points", 0)
+                if entry.get("gid"):
+                    group_points[entry["gid"]] += entry.get("points", 0)
+
+            updated_at = self._get_timestamp()
+
+            def changed_scores(collection: str, points: Dict[str, int]) -> List[tuple]:
+                return [
+                    (doc.reference, {"score": points.get(doc.id, 0), "updated_at": updated_at})
+                    for doc in db.collection(collection).select(["score"]).stream()
+                    if (doc.to_dict() or {}).get("score", 0) != points.get(doc.id, 0)
+                ]
+
+            user_updates = changed_scores(self.LEADERBOARD_USER_COLLECTION, user_points)
+            group_updates = changed_scores(self.LEADERBOARD_GROUP_COLLECTION, group_points)
+            shard_refs = [doc.reference for doc in db.collection_group(self.GROUP_SHARDS_COLLECTION).select([]).stream()]
+            pending_refs = self._read_pending_refs()
+
+            if not dry_run:
+                if epoch != current_epoch:
+                    # last_epoch is kept, so the next reset still starts a new epoch
+                    db.collection(self.SCORE_EPOCHS_COLLECTION).document(self.SCORE_EPOCH_DOC_ID).set(
+                        {"epoch": epoch, "started_at": self._get_timestamp()}, merge=True
+                    )
+                self._commit_in_batches(
+                    user_updates + group_updates + [(ref, None) for ref in shard_refs]
+                    + [(ref, {self.SCORE_PENDING_SINCE: firestore.DELETE_FIELD}) for ref in pending_refs]
+                )
+
+            return ScoreReplaySummary(
+                epoch=epoch,
+                ledger_entries=ledger_entries,
+                users_updated=len(user_updates),
+                groups_updated=len(group_updates),
+                shards=len(shard_refs),
+                outbox_events=len(pending_refs),
+                dry_run=dry_run,
+                duration_ms=int((time.perf_counter() - started_at) * 1000)
+            )
+        except Exception as e:
+            raise IncrementScoreError(f"Failed to replay the score ledger", http_status=400)
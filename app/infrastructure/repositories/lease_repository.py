@@ -0,0 +1,43 @@
+import time
+
+from firebase_admin import firestore
+
+from infrastructure.clients.firestore_client import FirestoreClient
+
+
+class LeaseRepository:
+    """
+    Repository for the named leases with Firestore.
+
+    Each leases/{name} document holds the owner of the lease and when it expires.
+    A lease is held by one process at a time: the others can only take it once it
+    expired, which happens when its owner stops renewing it.
+    """
+
+    LEASES_COLLECTION: str = "leases"
+
+    def __init__(self, firestore_client: FirestoreClient):
+        self.firestore_client = firestore_client
+
+    def _get_timestamp(self) -> int:
+        return int(time.time() * 1000)
+
+    def acquire(self, name: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Takes the lease if it's free or expired, or renews it if `owner` holds it,
+        in a transaction so that only one process gets it.
+        Returns whether `owner` holds the lease for the next `lease_seconds`.
+        """
+        lease_ref = self.firestore_client.db.collection(self.LEASES_COLLECTION).document(name)
+
+        @firestore.transactional
+        def acquire_in_transaction(transaction) -> bool:
+            snapshot = lease_ref.get(transaction=transaction)
+            data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+            now = self._get_timestamp()
+            if data.get("owner") not in (None, owner) and data.get("expires_at", 0) > now:
+                return False
+            transaction.set(lease_ref, {"owner": owner, "expires_at": now + int(lease_seconds * 1000)})
+            return True
+
+        return acquire_in_transaction(self.firestore_client.db.transaction())
@@ -1,3 +1,5 @@
+from typing import Dict, List, Optional
+
 from domain.entities.quiz import Quiz
 from infrastructure.errors.firestore_errors import DocumentNotFoundError
 from infrastructure.errors.quiz_errors import (
@@ -6,6 +8,8 @@ from infrastructure.errors.quiz_errors import (
     UpdateQuizError,
     DeleteQuizError
 )
+from infrastructure.caches.quiz_catalog import QuizCatalog
+from infrastructure.clients.async_firestore_client import AsyncFirestoreClient
 from infrastructure.clients.firestore_client import FirestoreClient
 
 
@@ -16,9 +20,27 @@ class QuizRepository:
 
     QUIZ_COLLECTION: str = "quizzes"
     QUIZ_ID: str = "quiz_id"
+    QUIZ_SESSIONS: str = "sessions"
+
+    # Firestore batches are limited to 500 operations
+    BATCH_SIZE: int = 500
 
-    def __init__(self, firestore_client: FirestoreClient):
+    def __init__(
+        self,
+        firestore_client: FirestoreClient,
+        async_firestore_client: Optional[AsyncFirestoreClient] = None,
+        quiz_catalog: Optional[QuizCatalog] = None
+    ):
         self.firestore_client = firestore_client
+        self.async_firestore_client = async_firestore_client
+        self.quiz_catalog = quiz_catalog
+
+    def _catalog_is_fresh(self) -> bool:
+        return self.quiz_catalog is not None and self.quiz_catalog.is_fresh()
+
+    def _write_through(self, quiz: Quiz) -> None:
+        if self.quiz_catalog is not None:
+            self.quiz_catalog.put(quiz)
 
     def create(self, quiz: Quiz) -> Quiz:
         """
@@ -31,6 +53,7 @@ class QuizRepository:
                 doc_data=quiz.to_firestore_data()
             )
             quiz.quiz_id = quiz_id
+            self._write_through(quiz)
             return quiz
         except Exception:
             raise CreateQuizError(message="Failed to create quiz", http_status=400)
@@ -44,7 +67,32 @@ class QuizRepository:
                 collection_name=self.QUIZ_COLLECTION,
                 doc_id=quiz_id
             )
-            return Quiz.from_dict({self.QUIZ_ID: quiz_id, **quiz_data_dict})
+            quiz = Quiz.from_dict({self.QUIZ_ID: quiz_id, **quiz_data_dict})
+            self._write_through(quiz)
+            return quiz
+        except DocumentNotFoundError:
+            raise ReadQuizError(message="Quiz not found", http_status=404)
+        except Exception:
+            raise ReadQuizError(message="Failed to read quiz", http_status=400)
+
+    async def read_async(self, quiz_id: str) -> Quiz:
+        """
+        Async variant of read, for use inside async endpoints.
+        Served from the quiz catalog when fresh, falling back to Firestore on a miss.
+        """
+        if self._catalog_is_fresh():
+            quiz = self.quiz_catalog.get(quiz_id)
+            if quiz is not None:
+                return quiz
+
+        try:
+            quiz_data_dict = await self.async_firestore_client.read_doc(
+                collection_name=self.QUIZ_COLLECTION,
+                doc_id=quiz_id
+            )
+            quiz = Quiz.from_dict({self.QUIZ_ID: quiz_id, **quiz_data_dict})
+            self._write_through(quiz)
+            return quiz
         except DocumentNotFoundError:
             raise ReadQuizError(message="Quiz not found", http_status=404)
         except Exception:
@@ -52,18 +100,54 @@ class QuizRepository:
 
     def read_all(self) -> list[Quiz]:
         """
-        Reads all quizzes from Firestore.
+        Reads all quizzes, from the quiz catalog when fresh, otherwise from Firestore.
         """
+        if self._catalog_is_fresh():
+            return self.quiz_catalog.all()
+
         try:
             quizzes = self.firestore_client.read_all_docs(
                 collection_name=self.QUIZ_COLLECTION,
                 include_id=True,
                 id_field_name=self.QUIZ_ID,
             )
-            return [Quiz.from_dict(quiz) for quiz in quizzes]
+            parsed_quizzes = [Quiz.from_dict(quiz) for quiz in quizzes]
+            if self.quiz_catalog is not None:
+                self.quiz_catalog.replace_all(parsed_quizzes)
+            return parsed_quizzes
+        except Exception:
+            raise ReadQuizError(message="Failed to read all quizzes", http_status=400)
+
+    async def read_all_async(self) -> list[Quiz]:
+        """
+        Async variant of read_all.
+        """
+        if self._catalog_is_fresh():
+            return self.quiz_catalog.all()
+
+        try:
+            quizzes = await self.async_firestore_client.read_all_docs(
+                collection_name=self.QUIZ_COLLECTION,
+                include_id=True,
+                id_field_name=self.QUIZ_ID,
+            )
+            parsed_quizzes = [Quiz.from_dict(quiz) for quiz in quizzes]
+            if self.quiz_catalog is not None:
+                self.quiz_catalog.replace_all(parsed_quizzes)
+            return parsed_quizzes
         except Exception:
             raise ReadQuizError(message="Failed to read all quizzes", http_status=400)
 
+    async def read_session_map_async(self) -> dict[str, str]:
+        """
+        Returns the quiz_id -> session_id map, precomputed by the quiz catalog when fresh.
+        """
+        if self._catalog_is_fresh():
+            return self.quiz_catalog.session_map()
+
+        quizzes = await self.read_all_async()
+        return {quiz.quiz_id: quiz.session_id for quiz in quizzes}
+
     def update(self, quiz_id: str, quiz_update: dict) -> Quiz:
         """
         Updates a quiz in Firestore.
@@ -90,6 +174,31 @@ class QuizRepository:
         except Exception:
             raise UpdateQuizError(message="Failed to update quiz", http_status=400)
 
+    def update_sessions(self, quizzes: List[Quiz], sessions_by_quiz: Dict[str, List[str]]) -> None:
+        """
+        Writes the session tags of many quizzes, in a single batch up to BATCH_SIZE quizzes,
+        without reading them back. The catalog is updated from the given quizzes.
+        """
+        if not sessions_by_quiz:
+            return
+        try:
+            db = self.firestore_client.db
+            quiz_ids = list(sessions_by_quiz)
+            for start in range(0, len(quiz_ids), self.BATCH_SIZE):
+                batch = db.batch()
+                for quiz_id in quiz_ids[start:start + self.BATCH_SIZE]:
+                    batch.update(
+                        db.collection(self.QUIZ_COLLECTION).document(quiz_id),
+                        {self.QUIZ_SESSIONS: sessions_by_quiz[quiz_id]}
+                    )
+                batch.commit()
+        except Exception:
+            raise UpdateQuizError(message="Failed to update quiz sessions", http_status=400)
+
+        for quiz in quizzes:
+            if quiz.quiz_id in sessions_by_quiz:
+                self._write_through(quiz.model_copy(update={"sessions": sessions_by_quiz[quiz.quiz_id]}))
+
     def delete(self, quiz_id: str) -> None:
         """
         Deletes a quiz from Firestore.
@@ -99,6 +208,8 @@ class QuizRepository:
                 collection_name=self.QUIZ_COLLECTION,
                 doc_id=quiz_id
             )
+            if self.quiz_catalog is not None:
+                self.quiz_catalog.remove(quiz_id)
         except DocumentNotFoundError:
             raise DeleteQuizError(message="Quiz not found", http_status=404)
         except Exception:
@@ -0,0 +1,180 @@
+from typing import Dict, List, Optional
+
+from google.cloud.firestore import async_transactional
+
+from domain.entities.quiz_progress import QuizProgress
+from domain.entities.quiz_result import QuizResult
+from domain.entities.quiz_start_time import QuizStartTime
+from infrastructure.clients.async_firestore_client import AsyncFirestoreClient
+from infrastructure.clients.firestore_client import FirestoreClient
+from infrastructure.errors.firestore_errors import DocumentNotFoundError
+from infrastructure.errors.quiz_errors import QuizAlreadySubmittedError
+
+
+class QuizStateRepository:
+    """
+    Repository for the denormalized per-user quiz state with Firestore.
+
+    Each user has a single user_quiz_state/{uid} document holding a map of
+    quiz_id -> {started_at, score, max_score, quiz_title, submitted_at},
+    so that everything a quiz read or submit needs is one point read.
+    Writes run in transactions, which also guard against double starts and submits.
+    """
+
+    USER_QUIZ_STATE_COLLECTION: str = "user_quiz_state"
+    QUIZ_RESULTS_COLLECTION: str = "quiz_results"
+    QUIZ_START_TIMES_COLLECTION: str = "quiz_start_times"
+
+    # State field names
+    QUIZZES: str = "quizzes"
+    STARTED_AT: str = "started_at"
+    SUBMITTED_AT: str = "submitted_at"
+
+    def __init__(
+        self,
+        firestore_client: FirestoreClient,
+        async_firestore_client: AsyncFirestoreClient
+    ):
+        self.firestore_client = firestore_client
+        self.async_firestore_client = async_firestore_client
+
+    def _quizzes_from_data(self, data: Optional[dict]) -> Dict[str, dict]:
+        return (data or {}).get(self.QUIZZES) or {}
+
+    def _start_time_from_entry(self, entry: dict) -> Optional[QuizStartTime]:
+        if entry.get(self.STARTED_AT) is None:
+            return None
+        return QuizStartTime.from_dict(entry)
+
+    def _result_from_entry(self, entry: dict) -> Optional[QuizResult]:
+        if entry.get(self.SUBMITTED_AT) is None:
+            return None
+        return QuizResult.from_dict(entry)
+
+    def read_quizzes(self, uid: str) -> Dict[str, dict]:
+        """
+        Reads the quiz_id -> state map of a user. Returns an empty map if the user has none.
+        """
+        try:
+            return self._quizzes_from_data(
+                self.firestore_client.read_doc(self.USER_QUIZ_STATE_COLLECTION, uid)
+            )
+        except DocumentNotFoundError:
+            return {}
+
+    async def read_quizzes_async(self, uid: str) -> Dict[str, dict]:
+        """
+        Async variant of read_quizzes.
+        """
+        try:
+            return self._quizzes_from_data(
+                await self.async_firestore_client.read_doc(self.USER_QUIZ_STATE_COLLECTION, uid)
+            )
+        except DocumentNotFoundError:
+            return {}
+
+    def read_results(self, uid: str) -> List[QuizResult]:
+        """
+        Reads all the submitted quiz results of a user.
+        """
+        results = [self._result_from_entry(entry) for entry in self.read_quizzes(uid).values()]
+        return [result for result in results if result is not None]
+
+    async def read_progress_async(self, uid: str, quiz_id: str) -> QuizProgress:
+        """
+        Reads the result and start time of a quiz, and the completed quiz ids, with a single read.
+        """
+        quizzes = await self.read_quizzes_async(uid)
+        entry = quizzes.get(quiz_id) or {}
+        return QuizProgress(
+            result=self._result_from_entry(entry),
+            start_time=self._start_time_from_entry(entry),
+            completed_quiz_ids=[
+                completed_id for completed_id, state in quizzes.items()
+                if state.get(self.SUBMITTED_AT) is not None
+            ],
+        )
+
+    async def save_start_time_async(self, uid: str, quiz_id: str, start_time: QuizStartTime) -> None:
+        """
+        Records the start time of a quiz in a transaction.
+        An existing start time is never overwritten, so concurrent first reads can't reset the timer.
+        """
+        doc_ref = self.async_firestore_client.db.collection(self.USER_QUIZ_STATE_COLLECTION).document(uid)
+
+        @async_transactional
+        async def save_in_transaction(transaction) -> None:
+            snapshot = await doc_ref.get(transaction=transaction)
+            entry = self._quizzes_from_data(snapshot.to_dict() if snapshot.exists else None).get(quiz_id) or {}
+            if entry.get(self.STARTED_AT) is not None:
+                return
+            transaction.set(
+                doc_ref,
+                {self.QUIZZES: {quiz_id: start_time.to_firestore_data()}},
+                merge=True
+            )
+
+        await save_in_transaction(self.async_firestore_client.db.transaction())
+
+    async def save_result_async(self, uid: str, quiz_id: str, result: QuizResult) -> None:
+        """
+        Records a quiz result in a transaction.
+
+        Raises:
+            QuizAlreadySubmittedError: if a result for the quiz was already recorded
+        """
+        doc_ref = self.async_firestore_client.db.collection(self.USER_QUIZ_STATE_COLLECTION).document(uid)
+
+        @async_transactional
+        async def save_in_transaction(transaction) -> None:
+            snapshot = await doc_ref.get(transaction=transaction)
+            entry = self._quizzes_from_data(snapshot.to_dict() if snapshot.exists else None).get(quiz_id) or {}
+            if entry.get(self.SUBMITTED_AT) is not None:
+                raise QuizAlreadySubmittedError("You have already submitted this quiz")
+            transaction.set(
+                doc_ref,
+                {self.QUIZZES: {quiz_id: result.to_firestore_data()}},
+                merge=True
+            )
+
+        await save_in_transaction(self.async_firestore_client.db.transaction())
+
+    def delete_many(self, uids: List[str]) -> None:
+        """
+        Deletes the quiz state of the given users with a BulkWriter.
+        """
+        states_ref = self.firestore_client.db.collection(self.USER_QUIZ_STATE_COLLECTION)
+        bulk_writer = self.firestore_client.db.bulk_writer()
+        for uid in uids:
+            bulk_writer.delete(states_ref.document(uid))
+        bulk_writer.close()
+
+    def backfill_from_subcollections(self) -> int:
+        """
+        Migration: copies every users/{uid}/quiz_start_times and users/{uid}/quiz_results
+        document into the user_quiz_state/{uid} documents.
+        Entries are merged, so it's safe to run during the dual-write period and more than once.
+        Returns the number of user documents written.
+        """
+        db = self.firestore_client.db
+        quizzes_by_uid: Dict[str, Dict[str, dict]] = {}
+
+        # Collection group queries read each subcollection for all the users in one stream
+        for subcollection in (self.QUIZ_START_TIMES_COLLECTION, self.QUIZ_RESULTS_COLLECTION):
+            for doc in db.collection_group(subcollection).stream():
+                uid = doc.reference.parent.parent.id
+                quizzes_by_uid.setdefault(uid, {}).setdefault(doc.id, {}).update(doc.to_dict() or {})
+
+        states_ref = db.collection(self.USER_QUIZ_STATE_COLLECTION)
+        written = 0
+        batch = db.batch()
+        for uid, quizzes in quizzes_by_uid.items():
+            batch.set(states_ref.document(uid), {self.QUIZZES: quizzes}, merge=True)
+            written += 1
+            # Firestore batches are limited to 500 operations
+            if written % 500 == 0:
+                batch.commit()
+                batch = db.batch()
+        if written % 500:
+            batch.commit()
+        return written
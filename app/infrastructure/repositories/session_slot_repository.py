@@ -0,0 +1,52 @@
+from typing import Callable, Optional
+
+from domain.entities.session_slot_map import SessionSlotMap
+from infrastructure.clients.firestore_client import FirestoreClient
+from infrastructure.errors.firestore_errors import DocumentNotFoundError
+
+
+class SessionSlotRepository:
+    """
+    Repository for the session slot map with Firestore.
+
+    The map is precomputed by the instance that syncs Sessionize and stored in a
+    single session_slots/current document, that the other instances load and watch.
+    """
+
+    SESSION_SLOTS_COLLECTION: str = "session_slots"
+    SESSION_SLOTS_DOC_ID: str = "current"
+
+    def __init__(self, firestore_client: FirestoreClient):
+        self.firestore_client = firestore_client
+
+    def _slot_map_ref(self):
+        return self.firestore_client.db.collection(self.SESSION_SLOTS_COLLECTION).document(self.SESSION_SLOTS_DOC_ID)
+
+    def read(self) -> Optional[SessionSlotMap]:
+        """
+        Reads the session slot map, or None if no instance synced Sessionize yet.
+        """
+        try:
+            data = self.firestore_client.read_doc(
+                collection_name=self.SESSION_SLOTS_COLLECTION, doc_id=self.SESSION_SLOTS_DOC_ID
+            )
+        except DocumentNotFoundError:
+            return None
+        return SessionSlotMap.from_dict(data)
+
+    def save(self, slot_map: SessionSlotMap) -> None:
+        """
+        Replaces the session slot map.
+        """
+        self._slot_map_ref().set(slot_map.to_firestore_data())
+
+    def watch(self, callback: Callable[[Optional[SessionSlotMap]], None]):
+        """
+        Calls `callback` with the session slot map on every change, and once with its
+        current value. Returns the Firestore watch, to be unsubscribed.
+        """
+        def on_snapshot(docs, changes, read_time) -> None:
+            for doc in docs:
+                callback(SessionSlotMap.from_dict(doc.to_dict() or {}) if doc.exists else None)
+
+        return self._slot_map_ref().on_snapshot(on_snapshot)
@@ -1,4 +1,7 @@
+from typing import Iterable, Optional
+
 from domain.entities.tag import Tag
+from infrastructure.caches.tag_cache import TagCache
 from infrastructure.clients.firestore_client import FirestoreClient
 from infrastructure.errors.firestore_errors import DocumentNotFoundError
 from infrastructure.errors.tag_errors import (
@@ -15,38 +18,120 @@ class TagsRepository:
     """
 
     TAGS_COLLECTION: str = "tags"
+    TAG_SECRETS_COLLECTION: str = "tag_secrets"
     TAG_ID: str = "tag_id"
+    TAG_POINTS: str = "points"
+    TAG_SECRET: str = "secret"
 
-    def __init__(self, firestore_client: FirestoreClient):
+    def __init__(
+        self,
+        firestore_client: FirestoreClient,
+        tag_cache: Optional[TagCache] = None
+    ):
         self.firestore_client = firestore_client
+        self.tag_cache = tag_cache
+
+    def _secret_index_data(self, tag_id: str, points: int) -> dict:
+        return {self.TAG_ID: tag_id, self.TAG_POINTS: points}
 
     def create(self, tag: Tag, tag_id: str = None) -> Tag:
         """
         Creates a tag in Firestore with specified or auto-generated document ID.
+        If the tag has a secret, the tag_secrets/{secret} index entry is created in the same batch.
         """
         try:
-            created_tag_id = self.firestore_client.create_doc(
-                collection_name=self.TAGS_COLLECTION,
-                doc_id=tag_id,
-                doc_data=tag.to_firestore_data()
-            )
-            tag.tag_id = created_tag_id
+            db = self.firestore_client.db
+            tags_ref = db.collection(self.TAGS_COLLECTION)
+            tag_ref = tags_ref.document(tag_id) if tag_id else tags_ref.document()
+
+            batch = db.batch()
+            batch.create(tag_ref, tag.to_firestore_data())
+            if tag.secret:
+                batch.create(
+                    db.collection(self.TAG_SECRETS_COLLECTION).document(tag.secret),
+                    self._secret_index_data(tag_ref.id, tag.points)
+                )
+            batch.commit()
+
+            tag.tag_id = tag_ref.id
             return tag
         except Exception as exception:
             if "ALREADY_EXISTS" in str(exception) or "already exists" in str(exception).lower():
                 raise CreateTagError(message="Tag already exists", http_status=409)
             raise CreateTagError(message="Failed to create tag", http_status=400)
 
-    def read(self, tag_id: str) -> Tag:
+    def read(self, tag_id: str, use_cache: bool = True) -> Tag:
         """
-        Reads a tag from Firestore.
+        Reads a tag, from the tag cache if present, otherwise from Firestore.
+        Without use_cache the tag is always read from Firestore, e.g. to award its points.
         """
+        if use_cache and self.tag_cache is not None:
+            cached_tag = self.tag_cache.get(tag_id)
+            if cached_tag is not None:
+                return cached_tag
+
         try:
             tag_data_dict = self.firestore_client.read_doc(
                 collection_name=self.TAGS_COLLECTION,
                 doc_id=tag_id
             )
-            return Tag.from_dict({self.TAG_ID: tag_id, **tag_data_dict})
+            tag = Tag.from_dict({self.TAG_ID: tag_id, **tag_data_dict})
+            if self.tag_cache is not None:
+                self.tag_cache.put_many([tag])
+            return tag
+        except DocumentNotFoundError:
+            raise ReadTagError(message="Tag not found", http_status=404)
+        except Exception:
+            raise ReadTagError(message="Failed to read tag", http_status=400)
+
+    def read_many(self, tag_ids: Iterable[str]) -> dict[str, Tag]:
+        """
+        Reads many tags at once, by tag_id.
+        Cached tags are served from the tag cache, the others are fetched in a single
+        get_all round-trip. Tags that don't exist are left out of the result.
+        """
+        unique_ids = list(dict.fromkeys(tag_id for tag_id in tag_ids if tag_id))
+        if not unique_ids:
+            return {}
+
+        tags = self.tag_cache.get_many(unique_ids) if self.tag_cache is not None else {}
+        missing_ids = [tag_id for tag_id in unique_ids if tag_id not in tags]
+        if not missing_ids:
+            return tags
+
+        try:
+            db = self.firestore_client.db
+            tags_ref = db.collection(self.TAGS_COLLECTION)
+            fetched = []
+            for doc in db.get_all([tags_ref.document(tag_id) for tag_id in missing_ids]):
+                if doc.exists:
+                    fetched.append(Tag.from_dict({self.TAG_ID: doc.id, **doc.to_dict()}))
+        except Exception:
+            raise ReadTagError(message="Failed to read tags", http_status=400)
+
+        if self.tag_cache is not None:
+            self.tag_cache.put_many(fetched)
+        tags.update({tag.tag_id: tag for tag in fetched})
+        return tags
+
+    def read_by_secret(self, secret: str) -> Tag:
+        """
+        Reads a tag through the tag_secrets index with a single point read.
+        """
+        # Secrets are hex strings: anything that isn't a valid document ID can't match
+        if not secret or "/" in secret or secret in (".", ".."):
+            raise ReadTagError(message="Tag not found", http_status=404)
+
+        try:
+            index_data = self.firestore_client.read_doc(
+                collection_name=self.TAG_SECRETS_COLLECTION,
+                doc_id=secret
+            )
+            return Tag(
+                tag_id=index_data[self.TAG_ID],
+                points=index_data.get(self.TAG_POINTS, 0),
+                secret=secret
+            )
         except DocumentNotFoundError:
             raise ReadTagError(message="Tag not found", http_status=404)
         except Exception:
@@ -86,7 +171,17 @@ class TagsRepository:
                 doc_id=tag_id,
                 doc_data=update_params
             )
-            return self.read(tag_id)
+            if self.tag_cache is not None:
+                self.tag_cache.invalidate(tag_id)
+            updated_tag = self.read(tag_id)
+
+            # Keep the secret index in sync with the tag points
+            if updated_tag.secret:
+                self.firestore_client.db.collection(self.TAG_SECRETS_COLLECTION).document(
+                    updated_tag.secret
+                ).set(self._secret_index_data(tag_id, updated_tag.points))
+
+            return updated_tag
         except DocumentNotFoundError:
             raise UpdateTagError(message="Tag not found", http_status=404)
         except Exception:
@@ -94,15 +189,53 @@ class TagsRepository:
 
     def delete(self, tag_id: str) -> None:
         """
-        Deletes a tag from Firestore.
+        Deletes a tag from Firestore, together with its tag_secrets index entry.
         """
         try:
-            self.firestore_client.delete_doc(
-                collection_name=self.TAGS_COLLECTION,
-                doc_id=tag_id
-            )
+            db = self.firestore_client.db
+            tag_ref = db.collection(self.TAGS_COLLECTION).document(tag_id)
+            tag_doc = tag_ref.get()
+            if not tag_doc.exists:
+                raise DocumentNotFoundError()
+
+            batch = db.batch()
+            batch.delete(tag_ref)
+            secret = (tag_doc.to_dict() or {}).get(self.TAG_SECRET)
+            if secret:
+                batch.delete(db.collection(self.TAG_SECRETS_COLLECTION).document(secret))
+            batch.commit()
+
+            if self.tag_cache is not None:
+                self.tag_cache.invalidate(tag_id)
         except DocumentNotFoundError:
             raise DeleteTagError(message="Tag not found", http_status=404)
         except Exception:
             raise DeleteTagError(message="Failed to delete tag", http_status=400)
 
+    def backfill_secret_index(self) -> int:
+        """
+        Migration: writes the tag_secrets index entry for every existing tag with a secret.
+        Idempotent, it can be run again at any time.
+
+        Returns:
+            int: The number of index entries written.
+        """
+        try:
+            db = self.firestore_client.db
+            secrets_ref = db.collection(self.TAG_SECRETS_COLLECTION)
+            written = 0
+            batch = db.batch()
+            for tag in self.read_all():
+                if not tag.secret:
+                    continue
+                batch.set(secrets_ref.document(tag.secret), self._secret_index_data(tag.tag_id, tag.points))
+                written += 1
+                # Firestore batches are limited to 500 operations
+                if written % 500 == 0:
+                    batch.commit()
+                    batch = db.batch()
+            if written % 500:
+                batch.commit()
+            return written
+        except Exception:
+            raise UpdateTagError(message="Failed to backfill tag secrets", http_status=400)
@@ -0,0 +1,57 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from firebase_admin import firestore
+
+from infrastructure.clients.firestore_client import FirestoreClient
+
+
+class TokenInvalidationRepository:
+    """
+    Repository for the token invalidations with Firestore.
+
+    Each token_invalidations/{uid} document holds the last time the cached tokens of a
+    user were invalidated, e.g. after a role, group or check-in change. Every instance
+    watches the recent ones to drop the tokens it cached for these users.
+
+    Once the tokens cached before it have expired, `retention` seconds later, an entry is
+    useless: it carries an `expires_at` timestamp, for a Firestore TTL policy on
+    token_invalidations.expires_at to delete it.
+    """
+
+    TOKEN_INVALIDATIONS_COLLECTION: str = "token_invalidations"
+    INVALIDATED_AT: str = "invalidated_at"
+    EXPIRES_AT: str = "expires_at"
+
+    def __init__(self, firestore_client: FirestoreClient, retention: int):
+        self.firestore_client = firestore_client
+        self.retention = retention
+
+    def _get_timestamp(self) -> int:
+        return int(time.time() * 1000)
+
+    def publish(self, uid: str) -> None:
+        """
+        Records that the cached tokens of a user must be dropped by every instance.
+        """
+        self.firestore_client.db.collection(self.TOKEN_INVALIDATIONS_COLLECTION).document(uid).set({
+            self.INVALIDATED_AT: self._get_timestamp(),
+            self.EXPIRES_AT: datetime.now(timezone.utc) + timedelta(seconds=self.retention)
+        })
+
+    def watch(self, since: int, callback: Callable[[str], None]):
+        """
+        Calls `callback` with the uid of every user invalidated at or after `since`
+        (milliseconds), now and on every later invalidation.
+        Returns the Firestore watch, to be unsubscribed.
+        """
+        def on_snapshot(docs, changes, read_time) -> None:
+            for change in changes:
+                callback(change.document.id)
+
+        query = (
+            self.firestore_client.db.collection(self.TOKEN_INVALIDATIONS_COLLECTION)
+            .where(filter=firestore.FieldFilter(self.INVALIDATED_AT, ">=", since))
+        )
+        return query.on_snapshot(on_snapshot)
@@ -1,13 +1,22 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List
 from infrastructure.repositories.firebase_auth_repository import FirebaseAuthRepository
 from infrastructure.repositories.firestore_repository import FirestoreRepository
 from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+from infrastructure.repositories.quiz_state_repository import QuizStateRepository
 from domain.entities.user import User
+from domain.entities.quiz_progress import QuizProgress
+from domain.entities.quiz_state_mode import QuizStateMode
 from domain.entities.quiz_result import QuizResult
 from domain.entities.quiz_start_time import QuizStartTime
 from infrastructure.errors.user_errors import *
 from infrastructure.errors.auth_errors import *
 from infrastructure.errors.firestore_errors import DocumentNotFoundError
+from infrastructure.errors.quiz_errors import QuizAlreadySubmittedError
+
+logger = logging.getLogger(__name__)
 
 class UserRepository:
     """
@@ -27,11 +36,25 @@ class UserRepository:
         self,
         auth_repository: FirebaseAuthRepository,
         firestore_repository: FirestoreRepository,
-        leaderboard_repository: LeaderboardRepository
+        leaderboard_repository: LeaderboardRepository,
+        quiz_state_repository: Optional[QuizStateRepository] = None,
+        quiz_state_mode: QuizStateMode = QuizStateMode.SUBCOLLECTIONS
     ):
         self.auth_repository = auth_repository
         self.firestore_repository = firestore_repository
         self.leaderboard_repository = leaderboard_repository
+        self.quiz_state_repository = quiz_state_repository
+        # Without a state repository only the subcollections can be used
+        self.quiz_state_mode = quiz_state_mode if quiz_state_repository is not None else QuizStateMode.SUBCOLLECTIONS
+
+    def _reads_quiz_state(self) -> bool:
+        return self.quiz_state_mode == QuizStateMode.DOCUMENT
+
+    def _writes_quiz_state(self) -> bool:
+        return self.quiz_state_mode in (QuizStateMode.DUAL_WRITE, QuizStateMode.DOCUMENT)
+
+    def _writes_subcollections(self) -> bool:
+        return self.quiz_state_mode != QuizStateMode.DOCUMENT
 
 
     def create(self, user: User) -> User:
@@ -83,6 +106,13 @@ class UserRepository:
         """
         return User.from_dict(self.firestore_repository.read_user(uid), tags=None)
 
+    async def read_async(self, uid: str) -> User:
+        """
+        Async variant of read, for use inside async endpoints.
+        Note: Tags are not loaded.
+        """
+        return User.from_dict(await self.firestore_repository.read_user_async(uid), tags=None)
+
     def read_raw(self, uid: str) -> dict:
         """
         Reads a user from Firestore and returns raw dict.
@@ -146,6 +176,12 @@ class UserRepository:
 
         return self.read(uid)
 
+    def mark_checked_in(self, uid: str) -> None:
+        """
+        Sets the checked_in status of a user, without reading it back.
+        """
+        self.firestore_repository.update_user(uid, {"checked_in": True})
+
     def add_tags(self, uid: str, tags: List[str]) -> User:
         """
         Adds tags to user's tags list.
@@ -155,13 +191,13 @@ class UserRepository:
         return self.read(uid)
 
 
-    def get_quiz_result(self, uid: str, quiz_id: str) -> Optional[QuizResult]:
+    async def get_quiz_result_async(self, uid: str, quiz_id: str) -> Optional[QuizResult]:
         """
-        Get quiz result for a user if it exists.
+        Get quiz result for a user if it exists, from the quiz_results subcollection.
         Returns None if not found.
         """
         try:
-            data = self.firestore_repository.read_from_subcollection(
+            data = await self.firestore_repository.read_from_subcollection_async(
                 document_id=uid,
                 subcollection=self.QUIZ_RESULTS_COLLECTION,
                 subdocument_id=quiz_id
@@ -176,6 +212,8 @@ class UserRepository:
         Get all quiz results for a user.
         """
         try:
+            if self._reads_quiz_state():
+                return self.quiz_state_repository.read_results(uid)
             results = self.firestore_repository.read_all_from_subcollection(
                 document_id=uid,
                 subcollection=self.QUIZ_RESULTS_COLLECTION
@@ -185,40 +223,55 @@ class UserRepository:
             return []
 
 
-    def get_completed_quiz_ids(self, uid: str) -> List[str]:
+    async def get_completed_quiz_ids_async(self, uid: str) -> List[str]:
         """
-        Get list of quiz IDs that the user has completed.
+        Get list of quiz IDs that the user has completed, from the quiz_results subcollection.
         """
         try:
-            results = self.firestore_repository.read_all_from_subcollection(
+            results = await self.firestore_repository.read_all_from_subcollection_async(
                 document_id=uid,
                 subcollection=self.QUIZ_RESULTS_COLLECTION
             )
-            # The document ID in subcollection is the quiz_id
             return [result["id"] for result in results]
         except Exception:
             return []
 
 
-    def save_quiz_result(self, uid: str, quiz_id: str, result: QuizResult) -> None:
+    async def save_quiz_result_async(self, uid: str, quiz_id: str, result: QuizResult) -> None:
         """
-        Save quiz result to user's quiz_results subcollection.
+        Save a quiz result, following the quiz state mode.
+        The state document is written first, as its transaction rejects a second submit.
+
+        Raises:
+            QuizAlreadySubmittedError: if the state document already holds a result for the quiz
         """
-        self.firestore_repository.write_to_subcollection(
-            document_id=uid,
-            subcollection=self.QUIZ_RESULTS_COLLECTION,
-            subdocument_id=quiz_id,
-            data=result.to_firestore_data()
-        )
+        if self._writes_quiz_state():
+            try:
+                await self.quiz_state_repository.save_result_async(uid, quiz_id, result)
+            except QuizAlreadySubmittedError:
+                raise
+            except Exception:
+                if self._reads_quiz_state():
+                    raise
+                # During the dual-write period the subcollections are still the source of truth
+                logger.warning("Failed to write quiz state for user %s", uid, exc_info=True)
+
+        if self._writes_subcollections():
+            await self.firestore_repository.write_to_subcollection_async(
+                document_id=uid,
+                subcollection=self.QUIZ_RESULTS_COLLECTION,
+                subdocument_id=quiz_id,
+                data=result.to_firestore_data()
+            )
 
 
-    def get_quiz_start_time(self, uid: str, quiz_id: str) -> Optional[QuizStartTime]:
+    async def get_quiz_start_time_async(self, uid: str, quiz_id: str) -> Optional[QuizStartTime]:
         """
-        Get quiz start time for a user if it exists.
+        Get quiz start time for a user if it exists, from the quiz_start_times subcollection.
         Returns None if not found.
         """
         try:
-            data = self.firestore_repository.read_from_subcollection(
+            data = await self.firestore_repository.read_from_subcollection_async(
                 document_id=uid,
                 subcollection=self.QUIZ_START_TIMES_COLLECTION,
                 subdocument_id=quiz_id
@@ -228,36 +281,88 @@ class UserRepository:
             return None
 
 
-    def save_quiz_start_time(self, uid: str, quiz_id: str, start_time: QuizStartTime) -> None:
+    async def save_quiz_start_time_async(self, uid: str, quiz_id: str, start_time: QuizStartTime) -> None:
         """
-        Save quiz start time to user's quiz_start_times subcollection.
+        Save a quiz start time, following the quiz state mode.
         """
-        self.firestore_repository.write_to_subcollection(
-            document_id=uid,
-            subcollection=self.QUIZ_START_TIMES_COLLECTION,
-            subdocument_id=quiz_id,
-            data=start_time.to_firestore_data()
+        if self._writes_quiz_state():
+            try:
+                await self.quiz_state_repository.save_start_time_async(uid, quiz_id, start_time)
+            except Exception:
+                if self._reads_quiz_state():
+                    raise
+                # During the dual-write period the subcollections are still the source of truth
+                logger.warning("Failed to write quiz state for user %s", uid, exc_info=True)
+
+        if self._writes_subcollections():
+            await self.firestore_repository.write_to_subcollection_async(
+                document_id=uid,
+                subcollection=self.QUIZ_START_TIMES_COLLECTION,
+                subdocument_id=quiz_id,
+                data=start_time.to_firestore_data()
+            )
+
+
+    async def get_quiz_progress_async(self, uid: str, quiz_id: str) -> QuizProgress:
+        """
+        Get result and start time of a quiz for a user, together with the ids of the completed quizzes.
+        In DOCUMENT mode this is a single read of the user quiz state,
+        otherwise the subcollections are read concurrently.
+        """
+        if self._reads_quiz_state():
+            return await self.quiz_state_repository.read_progress_async(uid, quiz_id)
+
+        result, start_time, completed_quiz_ids = await asyncio.gather(
+            self.get_quiz_result_async(uid, quiz_id),
+            self.get_quiz_start_time_async(uid, quiz_id),
+            self.get_completed_quiz_ids_async(uid),
         )
+        return QuizProgress(result=result, start_time=start_time, completed_quiz_ids=completed_quiz_ids)
 
 
-    def clear_tags(self, uid: str) -> None:
+    def backfill_quiz_state(self) -> int:
         """
-        Clears all tags for a user.
+        Copies the quiz results and start times subcollections into the user quiz state documents.
+        Returns the number of users written.
         """
-        try:
-            self.firestore_repository.update_user(uid, {"tags": []})
-        except Exception:
-            # If update fails (e.g. user not found), ignore or log
-            pass
+        if self.quiz_state_repository is None:
+            return 0
+        return self.quiz_state_repository.backfill_from_subcollections()
+
+
+    def count_all(self) -> int:
+        """
+        Counts all the users.
+        """
+        return self.firestore_repository.count_users()
 
-    def clear_quiz_results(self, uid: str) -> None:
+    def read_ids_page(self, start_after: Optional[str], limit: int) -> List[str]:
         """
-        Clears all quiz results for a user.
+        Reads a page of user ids in id order, starting after the given id.
         """
-        self.firestore_repository.delete_subcollection(uid, self.QUIZ_RESULTS_COLLECTION)
+        return self.firestore_repository.read_user_ids_page(start_after, limit)
 
-    def clear_quiz_start_times(self, uid: str) -> None:
+    def reset_users_data(self, uids: List[str], parallelism: int) -> int:
         """
-        Clears all quiz start times for a user.
+        Clears the tags, quiz results, quiz start times and quiz state of the given users.
+        The users' subcollections are recursively deleted `parallelism` at a time.
+        Safe to run again on the same users.
+        Returns the number of subcollection documents deleted.
         """
-        self.firestore_repository.delete_subcollection(uid, self.QUIZ_START_TIMES_COLLECTION)
+        self.firestore_repository.clear_users_tags(uids)
+
+        subcollections = [
+            (uid, subcollection)
+            for uid in uids
+            for subcollection in (self.QUIZ_RESULTS_COLLECTION, self.QUIZ_START_TIMES_COLLECTION)
+        ]
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            # sum() re-raises the first failed delete
+            deleted = sum(executor.map(
+                lambda item: self.firestore_repository.recursive_delete_subcollection(*item),
+                subcollections
+            ))
+
+        if self.quiz_state_repository is not None:
+            self.quiz_state_repository.delete_many(uids)
+        return deleted
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 
 from api.include_routers import include_routers
 from core.exception_handler import register_exception_handlers
+from core.lifespan import lifespan
 from core.logging import setup_logging
 from core.middleware import add_middlewares
 from core.settings import settings
@@ -12,6 +13,7 @@ app = FastAPI(
     debug=settings.debug,
     docs_url="/api/docs",
     version=settings.version,
+    lifespan=lifespan,
 )
 
 add_middlewares(app)
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SESSIONIZE_ID", "test")
+
+from infrastructure.clients.firestore_client import FirestoreClient
+from tests.fake_firestore import FakeFirestore
+
+
+@pytest.fixture
+def firestore_client() -> FirestoreClient:
+    client = FirestoreClient.__new__(FirestoreClient)
+    client.db = FakeFirestore()
+    return client
@@ -0,0 +1,312 @@
+"""
+In-memory stand-in for the parts of the Firestore client the repositories use.
+
+Documents are plain dicts keyed by their path. Writes support set (with merge),
+update (with dotted field paths and a last_update_time precondition), create and
+delete, and the Increment and DELETE_FIELD transforms. Batches commit atomically,
+and transactions are optimistic: a transaction whose reads changed before its
+commit is aborted and retried by firestore.transactional, as with the real client.
+"""
+import copy
+import itertools
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+from google.api_core.exceptions import Aborted, AlreadyExists, FailedPrecondition, NotFound
+from google.cloud.firestore_v1.transforms import Increment, Sentinel
+
+from firebase_admin import firestore
+
+
+class FakeSnapshot:
+    def __init__(self, reference: "FakeDocument", data: Optional[dict], update_time: Optional[int]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.update_time = update_time
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[dict]:
+        return copy.deepcopy(self._data)
+
+    def get(self, field: str) -> Any:
+        value = self._data
+        for part in field.split("."):
+            value = (value or {}).get(part)
+        return value
+
+
+class FakeDocument:
+    def __init__(self, db: "FakeFirestore", path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self) -> "FakeCollection":
+        return FakeCollection(self._db, self.path.rsplit("/", 1)[0])
+
+    def collection(self, name: str) -> "FakeCollection":
+        return FakeCollection(self._db, f"{self.path}/{name}")
+
+    def get(self, field_paths=None, transaction: Optional["FakeTransaction"] = None) -> FakeSnapshot:
+        snapshot = self._db._snapshot(self.path)
+        if transaction is not None:
+            transaction._read(snapshot)
+        return snapshot
+
+    def set(self, data: dict, merge: bool = False) -> None:
+        self._db._commit([("set", self.path, data, merge)])
+
+    def update(self, data: dict, option=None) -> None:
+        self._db._commit([("update", self.path, data, option)])
+
+    def create(self, data: dict) -> None:
+        self._db._commit([("create", self.path, data, None)])
+
+    def delete(self) -> None:
+        self._db._commit([("delete", self.path, None, None)])
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FakeDocument) and other.path == self.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __deepcopy__(self, memo) -> "FakeDocument":
+        # Stored as a reference field: references are immutable
+        return self
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeFirestore", matches, filters=(), orders=(), limit=None, start_after=None):
+        self._db = db
+        self._matches = matches
+        self._filters = list(filters)
+        self._orders = list(orders)
+        self._limit = limit
+        self._start_after = start_after
+
+    def _copy(self, **changes) -> "FakeQuery":
+        values = {
+            "filters": self._filters, "orders": self._orders,
+            "limit": self._limit, "start_after": self._start_after, **changes
+        }
+        return FakeQuery(self._db, self._matches, **values)
+
+    def where(self, field_path=None, op_string=None, value=None, filter=None) -> "FakeQuery":
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + [(field_path, op_string, value)])
+
+    def select(self, field_paths) -> "FakeQuery":
+        return self
+
+    def order_by(self, field_path: str, direction: str = firestore.Query.ASCENDING) -> "FakeQuery":
+        return self._copy(orders=self._orders + [(field_path, direction)])
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._copy(limit=count)
+
+    def start_after(self, values) -> "FakeQuery":
+        return self._copy(start_after=values)
+
+    def _value(self, snapshot: FakeSnapshot, field_path: str) -> Any:
+        return snapshot.id if field_path == "__name__" else snapshot.get(field_path)
+
+    def stream(self, transaction: Optional["FakeTransaction"] = None) -> Iterable[FakeSnapshot]:
+        snapshots = [self._db._snapshot(path) for path in self._db._paths() if self._matches(path)]
+        for field_path, op_string, value in self._filters:
+            snapshots = [s for s in snapshots if _compare(self._value(s, field_path), op_string, value)]
+        orders = self._orders or [("__name__", firestore.Query.ASCENDING)]
+        for field_path, direction in reversed(orders):
+            snapshots.sort(
+                key=lambda s: self._value(s, field_path),
+                reverse=direction == firestore.Query.DESCENDING
+            )
+        if self._start_after is not None:
+            values = self._start_after if isinstance(self._start_after, dict) else {"__name__": self._start_after.id}
+            snapshots = [s for s in snapshots if self._value(s, orders[0][0]) > values[orders[0][0]]]
+        if self._limit is not None:
+            snapshots = snapshots[:self._limit]
+        if transaction is not None:
+            for snapshot in snapshots:
+                transaction._read(snapshot)
+        return iter(snapshots)
+
+    def get(self, transaction: Optional["FakeTransaction"] = None) -> List[FakeSnapshot]:
+        return list(self.stream(transaction=transaction))
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, db: "FakeFirestore", path: str):
+        super().__init__(db, lambda doc_path: doc_path.rsplit("/", 1)[0] == path)
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocument:
+        return FakeDocument(self._db, f"{self.path}/{doc_id or uuid.uuid4().hex}")
+
+    def add(self, data: dict):
+        doc = self.document()
+        doc.create(data)
+        return None, doc
+
+    def list_documents(self) -> List[FakeDocument]:
+        return [FakeDocument(self._db, path) for path in self._db._paths() if self._matches(path)]
+
+
+class FakeBatch:
+    def __init__(self, db: "FakeFirestore"):
+        self._db = db
+        self._writes: List[tuple] = []
+
+    def set(self, ref: FakeDocument, data: dict, merge: bool = False) -> None:
+        self._writes.append(("set", ref.path, data, merge))
+
+    def update(self, ref: FakeDocument, data: dict, option=None) -> None:
+        self._writes.append(("update", ref.path, data, option))
+
+    def create(self, ref: FakeDocument, data: dict) -> None:
+        self._writes.append(("create", ref.path, data, None))
+
+    def delete(self, ref: FakeDocument) -> None:
+        self._writes.append(("delete", ref.path, None, None))
+
+    def commit(self) -> None:
+        self._db._commit(self._writes)
+        self._writes = []
+
+
+class FakeTransaction(FakeBatch):
+    def __init__(self, db: "FakeFirestore"):
+        super().__init__(db)
+        self._max_attempts = 5
+        self._read_only = False
+        self._id = None
+        self._reads: Dict[str, Optional[int]] = {}
+
+    def _read(self, snapshot: FakeSnapshot) -> None:
+        self._reads.setdefault(snapshot.reference.path, snapshot.update_time)
+
+    def _clean_up(self) -> None:
+        self._writes, self._reads, self._id = [], {}, None
+
+    def _begin(self, retry_id=None) -> None:
+        self._id = uuid.uuid4().bytes
+
+    def _rollback(self) -> None:
+        self._clean_up()
+
+    def _commit(self) -> list:
+        with self._db._lock:
+            if any(self._db._update_times.get(path) != read for path, read in self._reads.items()):
+                raise Aborted("Transaction contention")
+            self._db._commit(self._writes)
+        self._clean_up()
+        return []
+
+    def get(self, ref_or_query):
+        if isinstance(ref_or_query, FakeDocument):
+            return iter([ref_or_query.get(transaction=self)])
+        return ref_or_query.stream(transaction=self)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self._docs: Dict[str, dict] = {}
+        self._update_times: Dict[str, int] = {}
+        self._clock = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def document(self, path: str) -> FakeDocument:
+        return FakeDocument(self, path)
+
+    def collection_group(self, name: str) -> FakeQuery:
+        return FakeQuery(self, lambda path: path.rsplit("/", 2)[-2] == name)
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+    def transaction(self, **kwargs) -> FakeTransaction:
+        return FakeTransaction(self)
+
+    def write_option(self, last_update_time=None) -> dict:
+        return {"last_update_time": last_update_time}
+
+    def get_all(self, references, field_paths=None, transaction: Optional[FakeTransaction] = None):
+        for ref in references:
+            yield ref.get(transaction=transaction)
+
+    def _paths(self) -> List[str]:
+        with self._lock:
+            return sorted(self._docs)
+
+    def _snapshot(self, path: str) -> FakeSnapshot:
+        with self._lock:
+            return FakeSnapshot(FakeDocument(self, path), copy.deepcopy(self._docs.get(path)), self._update_times.get(path))
+
+    def _commit(self, writes: List[tuple]) -> None:
+        with self._lock:
+            docs = copy.deepcopy(self._docs)
+            for kind, path, data, extra in writes:
+                if kind == "create":
+                    if path in docs:
+                        raise AlreadyExists(f"Document already exists: {path}")
+                    docs[path] = _apply({}, data)
+                elif kind == "set":
+                    docs[path] = _apply(docs.get(path, {}) if extra else {}, data)
+                elif kind == "update":
+                    if path not in docs:
+                        raise NotFound(f"No document to update: {path}")
+                    if extra and extra.get("last_update_time") != self._update_times.get(path):
+                        raise FailedPrecondition(f"Document changed: {path}")
+                    docs[path] = _apply(docs[path], data, dotted=True)
+                else:
+                    docs.pop(path, None)
+            now = next(self._clock)
+            for _, path, _, _ in writes:
+                if path in docs:
+                    self._update_times[path] = now
+                else:
+                    self._update_times.pop(path, None)
+            self._docs = docs
+
+
+def _apply(document: dict, data: dict, dotted: bool = False) -> dict:
+    document = copy.deepcopy(document)
+    for key, value in data.items():
+        parts = key.split(".") if dotted else [key]
+        target = document
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        if isinstance(value, Increment):
+            target[parts[-1]] = (target.get(parts[-1]) or 0) + value.value
+        elif isinstance(value, Sentinel):
+            target.pop(parts[-1], None)
+        elif isinstance(value, dict) and not dotted and isinstance(target.get(parts[-1]), dict):
+            target[parts[-1]] = _apply(target[parts[-1]], value)
+        else:
+            target[parts[-1]] = copy.deepcopy(value)
+    return document
+
+
+def _compare(left: Any, op_string: str, right: Any) -> bool:
+    if op_string == "==":
+        return left == right
+    if op_string == "!=":
+        return left != right
+    if op_string == "in":
+        return left in right
+    if op_string == "array_contains":
+        return right in (left or [])
+    if left is None:
+        return False
+    return {"<": left < right, "<=": left <= right, ">": left > right, ">=": left >= right}[op_string]
@@ -0,0 +1,41 @@
+import pytest
+
+from domain.entities.admin_job import AdminJob
+from infrastructure.errors.admin_errors import AdminJobLeaseLostError
+from infrastructure.repositories.admin_job_repository import AdminJobRepository
+
+
+@pytest.fixture
+def repository(firestore_client) -> AdminJobRepository:
+    return AdminJobRepository(firestore_client)
+
+
+def new_job(repository: AdminJobRepository, owner: str, lease_expires_at: int) -> AdminJob:
+    job = AdminJob(
+        job_id="job", job_type="reset_all_data", created_at=0, updated_at=0,
+        lease_owner=owner, lease_expires_at=lease_expires_at
+    )
+    repository.create(job)
+    return job
+
+
+def test_only_the_lease_owner_saves(repository):
+    job = new_job(repository, "worker-a", repository._get_timestamp() + 60_000)
+
+    repository.save(job, "worker-a", 60)
+    with pytest.raises(AdminJobLeaseLostError):
+        repository.save(job, "worker-b", 60)
+
+
+def test_expired_lease_is_taken_over(repository):
+    job = new_job(repository, "worker-a", 0)
+
+    with pytest.raises(AdminJobLeaseLostError):
+        repository.save(job, "worker-a", 60)
+    assert not repository.renew_lease("job", "worker-a", 60)
+
+    taken = repository.acquire_lease("job", "worker-b", 60)
+    assert taken.lease_owner == "worker-b"
+    assert repository.renew_lease("job", "worker-b", 60)
+    with pytest.raises(AdminJobLeaseLostError):
+        repository.save(job, "worker-a", 60)
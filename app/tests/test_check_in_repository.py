@@ -0,0 +1,69 @@
+import pytest
+
+from domain.entities.group_assignment_strategy import GroupAssignmentStrategy
+from infrastructure.caches.group_allocator import GroupAllocator
+from infrastructure.errors.auth_errors import ForbiddenError
+from infrastructure.repositories.check_in_repository import CheckInRepository
+from infrastructure.repositories.group_repository import GroupRepository
+
+
+@pytest.fixture
+def group_repository(firestore_client) -> GroupRepository:
+    db = firestore_client.db
+    for gid in ("red", "blue"):
+        db.collection(GroupRepository.GROUP_COLLECTION).document(gid).set({"name": gid, "color": gid, "user_count": 0})
+    db.collection("users").document("alice").set({"nickname": "alice", "group": None})
+    return GroupRepository(
+        firestore_client,
+        assignment_strategy=GroupAssignmentStrategy.ALLOCATOR,
+        group_allocator=GroupAllocator(refresh_interval=60)
+    )
+
+
+def user_counts(firestore_client) -> dict:
+    return {
+        doc.id: doc.to_dict()["user_count"]
+        for doc in firestore_client.db.collection(GroupRepository.GROUP_COLLECTION).stream()
+    }
+
+
+def test_batch_check_in_assigns_one_group(firestore_client, group_repository):
+    repository = CheckInRepository(firestore_client, group_repository)
+
+    group = repository.check_in("alice", "alice")
+
+    user = firestore_client.db.collection("users").document("alice").get().to_dict()
+    assert user["checked_in"] and user["group"].id == group["gid"]
+    assert sum(user_counts(firestore_client).values()) == 1
+    assert repository.check_in("alice", "alice") is None
+
+
+def test_batch_check_in_fails_if_the_user_changed_after_the_read(firestore_client, group_repository):
+    repository = CheckInRepository(firestore_client, group_repository)
+    allocate_group = group_repository.allocate_group
+
+    def allocate_after_concurrent_check_in() -> dict:
+        # Another request checks the user in between the read and the commit
+        firestore_client.db.collection("users").document("alice").update({"group": "blue", "checked_in": True})
+        return allocate_group()
+
+    group_repository.allocate_group = allocate_after_concurrent_check_in
+
+    with pytest.raises(ForbiddenError):
+        repository.check_in("alice", "alice")
+
+    assert user_counts(firestore_client) == {"blue": 0, "red": 0}
+    assert not group_repository.group_allocator.is_fresh()
+
+
+def test_check_in_keeps_the_leaderboard_name_and_color_of_a_group_without_them(firestore_client, group_repository):
+    db = firestore_client.db
+    for gid in ("red", "blue"):
+        db.collection(GroupRepository.GROUP_COLLECTION).document(gid).set({"user_count": 0})
+        db.collection("leaderboard_groups").document(gid).set({"name": gid, "color": gid, "score": 3})
+
+    group = CheckInRepository(firestore_client, group_repository).check_in("alice", "alice")
+
+    entry = db.collection("leaderboard_groups").document(group["gid"]).get().to_dict()
+    assert (entry["name"], entry["color"], entry["score"]) == (group["gid"], group["gid"], 3)
+    assert "group_color" not in db.collection("leaderboard_users").document("alice").get().to_dict()
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from domain.services.leaderboard_broadcaster import LeaderboardBroadcaster
+from domain.services.leaderboard_service import LeaderboardService
+from infrastructure.caches.leaderboard_cache import LeaderboardCache
+from infrastructure.repositories.config_repository import ConfigRepository
+from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+
+
+@pytest.fixture
+def broadcaster(firestore_client) -> LeaderboardBroadcaster:
+    db = firestore_client.db
+    users = db.collection(LeaderboardRepository.LEADERBOARD_USER_COLLECTION)
+    users.document("alice").set({"nickname": "alice", "score": 10, "updated_at": 1})
+    users.document("bob").set({"nickname": "bob", "score": 5, "updated_at": 1})
+    db.collection(ConfigRepository.CONFIG_COLLECTION).document(ConfigRepository.CONFIG_DOC_ID).set({"leaderboard_open": True})
+    LeaderboardService.leaderboard_open_cache.clear()
+    repository = LeaderboardRepository(firestore_client)
+    return LeaderboardBroadcaster(
+        LeaderboardCache(firestore_client, ttl=0, use_listener=False),
+        repository,
+        interval=0.01,
+        queue_size=16,
+        top_k=10,
+        leaderboard_service=LeaderboardService(repository, config_repository=ConfigRepository(firestore_client)),
+    )
+
+
+def drain(queue: asyncio.Queue) -> list:
+    updates = []
+    while not queue.empty():
+        updates.append(queue.get_nowait())
+    return updates
+
+
+def test_closing_the_leaderboard_ends_the_streams_of_non_staff(broadcaster, firestore_client):
+    async def scenario():
+        user = await broadcaster.subscribe("bob", None)
+        staff = await broadcaster.subscribe("alice", None, is_staff=True)
+
+        firestore_client.db.collection(ConfigRepository.CONFIG_COLLECTION).document(ConfigRepository.CONFIG_DOC_ID).set(
+            {"leaderboard_open": False}
+        )
+        LeaderboardService.leaderboard_open_cache.clear()
+        await asyncio.sleep(0.05)
+
+        assert user.closed and drain(user.queue) == [None]
+        assert not staff.closed
+        await broadcaster.close()
+
+    asyncio.run(scenario())
+
+
+def test_new_subscribers_after_an_idle_period_get_diffs_from_their_snapshot(broadcaster, firestore_client):
+    users = firestore_client.db.collection(LeaderboardRepository.LEADERBOARD_USER_COLLECTION)
+
+    async def scenario():
+        first = await broadcaster.subscribe("bob", None)
+        broadcaster.unsubscribe(first)
+
+        # While nobody listens bob overtakes alice
+        users.document("bob").update({"score": 20})
+        second = await broadcaster.subscribe("bob", None)
+        snapshot = drain(second.queue)[0]
+        assert [entry.entry_id for entry in snapshot.top_users] == ["bob", "alice"]
+
+        # Then falls back to his old score: the change must reach the new subscriber
+        users.document("bob").update({"score": 5})
+        await asyncio.sleep(0.05)
+        diffs = drain(second.queue)
+        assert diffs and {rank.entry.entry_id: rank.rank for rank in diffs[-1].users}["bob"] == 2
+        await broadcaster.close()
+
+    asyncio.run(scenario())
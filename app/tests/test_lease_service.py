@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from domain.services.leaderboard_service import LeaderboardService
+from domain.services.lease_service import LeaseService
+from infrastructure.repositories.lease_repository import LeaseRepository
+
+
+class CountingRollups:
+    """Leaderboard repository of one worker, counting its group score rollups."""
+
+    def __init__(self):
+        self.rollups = 0
+
+    def rollup_group_scores(self) -> int:
+        self.rollups += 1
+        return 0
+
+
+def lease_services(firestore_client, count: int) -> list:
+    repository = LeaseRepository(firestore_client)
+    return [LeaseService(repository, owner=f"worker-{n}") for n in range(count)]
+
+
+def test_only_one_holder_until_the_lease_expires(firestore_client):
+    first, second = lease_services(firestore_client, 2)
+
+    async def scenario():
+        assert await first.holds("rollup", interval=0.02)
+        assert not await second.holds("rollup", interval=0.02)
+        assert await first.holds("rollup", interval=0.02)
+        # The holder stops renewing: the lease expires after 1.5 rounds
+        time.sleep(0.05)
+        assert await second.holds("rollup", interval=0.02)
+        assert not await first.holds("rollup", interval=0.02)
+
+    asyncio.run(scenario())
+
+
+def test_only_one_worker_runs_the_rollup_loop(firestore_client):
+    workers = [(CountingRollups(), lease_service) for lease_service in lease_services(firestore_client, 3)]
+
+    async def run_workers():
+        tasks = [
+            asyncio.create_task(LeaderboardService(repository).run_group_score_rollup(0.01, lease_service))
+            for repository, lease_service in workers
+        ]
+        await asyncio.sleep(0.3)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    for _, lease_service in workers:
+        # Long enough for the holder to renew it despite the scheduling delays of the test
+        lease_service.LEASE_ROUNDS = 50
+    asyncio.run(run_workers())
+
+    rollups = sorted(repository.rollups for repository, _ in workers)
+    assert rollups[:2] == [0, 0]
+    assert rollups[2] > 5
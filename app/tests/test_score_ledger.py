@@ -0,0 +1,117 @@
+import pytest
+
+from domain.entities.score_event import ScoreEvent
+from domain.entities.user import User
+from domain.services.leaderboard_service import LeaderboardService
+from infrastructure.caches.score_epoch_cache import ScoreEpochCache
+from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+
+
+@pytest.fixture
+def repository(firestore_client) -> LeaderboardRepository:
+    db = firestore_client.db
+    for uid in ("alice", "bob"):
+        db.collection(LeaderboardRepository.LEADERBOARD_USER_COLLECTION).document(uid).set({"score": 0})
+    db.collection(LeaderboardRepository.LEADERBOARD_GROUP_COLLECTION).document("red").set({"score": 0})
+    return LeaderboardRepository(firestore_client)
+
+
+def event(repository: LeaderboardRepository, uid: str, quiz_id: str, points: int) -> ScoreEvent:
+    return ScoreEvent(
+        event_id=ScoreEvent.quiz_event_id(uid, quiz_id), uid=uid, gid="red", points=points, created_at=0,
+        epoch=repository.read_score_epoch()
+    )
+
+
+def scores(repository: LeaderboardRepository) -> dict:
+    users = {entry.entry_id: entry.score for entry in repository.read_user_entries()}
+    groups = {entry.entry_id: entry.score for entry in repository.read_group_entries()}
+    return {"users": users, "groups": groups}
+
+
+def test_replay_of_previous_epoch_restores_scores_after_reset(repository):
+    assert repository.record_score_event(event(repository, "alice", "q1", 10))
+    assert repository.record_score_event(event(repository, "alice", "q2", 5))
+    assert repository.record_score_event(event(repository, "bob", "q1", 7))
+    before_reset = scores(repository)
+
+    summary = repository.reset_all_scores()
+
+    assert summary.epoch == 1
+    assert scores(repository) == {"users": {"alice": 0, "bob": 0}, "groups": {"red": 0}}
+
+    replay = repository.replay_score_ledger(epoch=0)
+
+    assert replay.ledger_entries == 3
+    assert scores(repository) == before_reset == {"users": {"alice": 15, "bob": 7}, "groups": {"red": 22}}
+    # The restored epoch still knows its events
+    assert not repository.record_score_event(event(repository, "alice", "q1", 10))
+
+
+def test_points_can_be_earned_again_after_reset(repository):
+    assert repository.record_score_event(event(repository, "alice", "q1", 10))
+    assert not repository.record_score_event(event(repository, "alice", "q1", 10))
+
+    repository.reset_all_scores()
+
+    assert repository.record_score_event(event(repository, "alice", "q1", 10))
+    assert not repository.record_score_event(event(repository, "alice", "q1", 10))
+    assert scores(repository)["users"]["alice"] == 10
+
+
+def test_reset_after_replay_starts_a_new_epoch(repository):
+    repository.record_score_event(event(repository, "alice", "q1", 10))
+    repository.reset_all_scores()
+    repository.record_score_event(event(repository, "alice", "q1", 3))
+    repository.replay_score_ledger(epoch=0)
+
+    assert repository.reset_all_scores().epoch == 2
+    assert repository.replay_score_ledger(epoch=1).ledger_entries == 1
+    assert scores(repository)["users"]["alice"] == 3
+
+
+def test_outbox_events_are_scoped_to_the_epoch(repository):
+    repository.reset_all_scores()
+
+    recorded = repository.create_score_event(event(repository, "bob", "q1", 4))
+
+    assert recorded.epoch == 1
+    assert repository.create_score_event(event(repository, "bob", "q1", 4)) is None
+    assert repository.apply_score_events([recorded.ledger_id()]) == 1
+    assert repository.apply_score_events([recorded.ledger_id()]) == 0
+    assert scores(repository) == {"users": {"alice": 0, "bob": 4}, "groups": {"red": 4}}
+
+
+def test_pending_ledger_entries_are_the_outbox(repository):
+    ledger = repository.firestore_client.db.collection(LeaderboardRepository.SCORE_LEDGER_COLLECTION)
+    recorded = [
+        repository.create_score_event(event(repository, "alice", "q1", 10)),
+        repository.create_score_event(event(repository, "carol", "q1", 5)),
+        repository.create_score_event(event(repository, "bob", "q1", 7)),
+    ]
+
+    # One ledger document per event, pending until applied
+    assert len(ledger.get()) == 3
+    assert sorted(repository.read_pending_score_event_ids(created_before=1, limit=10)) == sorted(e.ledger_id() for e in recorded)
+
+    # carol has no leaderboard entry: her points are dropped, the others are applied
+    assert repository.apply_score_events([e.ledger_id() for e in recorded]) == 3
+    assert scores(repository) == {"users": {"alice": 10, "bob": 7}, "groups": {"red": 22}}
+    assert repository.read_pending_score_event_ids(created_before=1, limit=10) == []
+    assert len(ledger.get()) == 3
+
+
+def test_service_stamps_the_cached_epoch_and_skips_zero_points(repository, monkeypatch):
+    repository.reset_all_scores()
+    service = LeaderboardService(repository, score_epoch_cache=ScoreEpochCache(repository, ttl=60, use_listener=False))
+    alice = User(email="alice@example.com", name="Alice", surname="A", nickname="alice", uid="alice", group={"gid": "red"})
+
+    assert service.add_points(alice, 10, ScoreEvent.quiz_event_id("alice", "q1"))
+    # The epoch is not read again for the next events
+    monkeypatch.setattr(repository, "read_score_epoch", lambda: pytest.fail("epoch read per event"))
+    assert not service.add_points(alice, 10, ScoreEvent.quiz_event_id("alice", "q1"))
+    assert not service.add_points(alice, 0, ScoreEvent.quiz_event_id("alice", "q2"))
+
+    ledger = repository.firestore_client.db.collection(LeaderboardRepository.SCORE_LEDGER_COLLECTION)
+    assert [doc.id for doc in ledger.stream()] == ["1:alice:quiz:q1"]
+    assert scores(repository)["users"]["alice"] == 10
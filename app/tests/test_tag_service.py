@@ -0,0 +1,57 @@
+import pytest
+
+from domain.entities.tag import Tag
+from domain.entities.user import User
+from domain.services.leaderboard_service import LeaderboardService
+from domain.services.tag_service import TagService
+from infrastructure.errors.tag_errors import AssignTagError
+from infrastructure.repositories.leaderboard_repository import LeaderboardRepository
+from infrastructure.repositories.tags_repository import TagsRepository
+
+
+class StubUserService:
+    """
+    Users with their tags, in memory.
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+
+    def read_user(self, uid: str) -> User:
+        return self.user
+
+    def add_tags(self, uid: str, tag_ids: list) -> User:
+        self.user.tags = (self.user.tags or []) + [Tag(tag_id=tag_id, points=0) for tag_id in tag_ids]
+        return self.user
+
+
+@pytest.fixture
+def leaderboard_repository(firestore_client) -> LeaderboardRepository:
+    db = firestore_client.db
+    db.collection(LeaderboardRepository.LEADERBOARD_USER_COLLECTION).document("alice").set({"score": 0})
+    db.collection(LeaderboardRepository.LEADERBOARD_GROUP_COLLECTION).document("red").set({"score": 0})
+    db.collection(TagsRepository.TAGS_COLLECTION).document("booth").set({"points": 10})
+    return LeaderboardRepository(firestore_client)
+
+
+def alice() -> User:
+    return User(email="alice@example.com", name="Alice", surname="A", nickname="alice", uid="alice", group={"gid": "red"})
+
+
+def test_retry_awards_the_points_of_a_tag_saved_before_a_failure(firestore_client, leaderboard_repository, monkeypatch):
+    leaderboard_service = LeaderboardService(leaderboard_repository)
+    tag_service = TagService(TagsRepository(firestore_client), StubUserService(alice()), leaderboard_service)
+
+    # The tag is saved, then the leaderboard write fails
+    monkeypatch.setattr(leaderboard_repository, "record_score_event", lambda event: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        tag_service.assign_tag_to_user("booth", "alice")
+    monkeypatch.undo()
+
+    assert tag_service.assign_tag_to_user("booth", "alice") == 10
+    with pytest.raises(AssignTagError) as error:
+        tag_service.assign_tag_to_user("booth", "alice")
+
+    assert error.value.status_code == 409
+    users = {entry.entry_id: entry.score for entry in leaderboard_repository.read_user_entries()}
+    assert users == {"alice": 10}
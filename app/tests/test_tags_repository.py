@@ -0,0 +1,44 @@
+import pytest
+
+from infrastructure.caches.tag_cache import TagCache
+from infrastructure.repositories.tags_repository import TagsRepository
+from tests.fake_firestore import FakeCollection
+
+
+@pytest.fixture
+def repository(firestore_client) -> TagsRepository:
+    firestore_client.db.collection(TagsRepository.TAGS_COLLECTION).document("booth").set({"points": 10})
+    return TagsRepository(firestore_client, TagCache(maxsize=16, ttl=300))
+
+
+def test_cached_tags_cannot_be_altered_by_callers(repository):
+    repository.read("booth").points = 1000
+    repository.read_many(["booth"])["booth"].points = 1000
+
+    assert repository.read("booth").points == 10
+
+
+def test_uncached_read_sees_changes_made_elsewhere(repository, firestore_client):
+    repository.read("booth")
+    # Updated by another instance, without going through this instance's cache
+    firestore_client.db.collection(TagsRepository.TAGS_COLLECTION).document("booth").update({"points": 20})
+
+    assert repository.read("booth", use_cache=False).points == 20
+
+
+class Change:
+    def __init__(self, doc_id: str):
+        self.document = type("Document", (), {"id": doc_id})()
+
+
+def test_listener_drops_the_tags_changed_elsewhere(firestore_client, monkeypatch):
+    listeners = []
+    monkeypatch.setattr(FakeCollection, "on_snapshot", lambda query, callback: listeners.append(callback), raising=False)
+    firestore_client.db.collection(TagsRepository.TAGS_COLLECTION).document("booth").set({"points": 10})
+    repository = TagsRepository(firestore_client, TagCache(maxsize=16, ttl=300, firestore_client=firestore_client))
+    repository.read("booth")
+
+    firestore_client.db.collection(TagsRepository.TAGS_COLLECTION).document("booth").update({"points": 20})
+    listeners[0]([], [Change("booth")], None)
+
+    assert repository.read("booth").points == 20
@@ -0,0 +1,76 @@
+import time
+from datetime import datetime, timezone
+
+from domain.entities.user import User
+from infrastructure.caches.token_cache import TokenCache
+from infrastructure.repositories.token_invalidation_repository import TokenInvalidationRepository
+
+
+class SharedInvalidations:
+    """Stands in for the token_invalidations collection watched by every instance."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def publish(self, uid: str) -> None:
+        for callback in self.callbacks:
+            callback(uid)
+
+    def watch(self, since: int, callback):
+        self.callbacks.append(callback)
+
+
+def user(uid: str) -> User:
+    return User(email=f"{uid}@example.com", name=uid, surname=uid, nickname=uid, uid=uid)
+
+
+def claims(expires_in: float = 3600) -> dict:
+    return {"exp": time.time() + expires_in}
+
+
+def test_evicted_tokens_are_forgotten_by_user():
+    cache = TokenCache(maxsize=2, ttl=300, revocation_check_interval=60)
+    for uid in ("alice", "bob", "carol"):
+        cache.put(f"token-{uid}", claims(), user(uid))
+
+    assert cache.get("token-alice") is None
+    assert set(cache._keys_by_uid) == {"bob", "carol"}
+
+    cache.discard("token-bob")
+    assert set(cache._keys_by_uid) == {"carol"}
+
+
+def test_expired_tokens_are_forgotten_by_user():
+    cache = TokenCache(maxsize=10, ttl=300, revocation_check_interval=60)
+    cache.put("token-alice", claims(expires_in=0.01), user("alice"))
+    time.sleep(0.02)
+    cache.put("token-bob", claims(), user("bob"))
+
+    assert set(cache._keys_by_uid) == {"bob"}
+
+
+def test_invalidation_reaches_the_other_instances():
+    invalidations = SharedInvalidations()
+    caches = [
+        TokenCache(maxsize=10, ttl=300, revocation_check_interval=60, token_invalidation_repository=invalidations)
+        for _ in range(2)
+    ]
+    for cache in caches:
+        cache.put("token-alice", claims(), user("alice"))
+        cache.put("token-bob", claims(), user("bob"))
+
+    caches[0].invalidate_user("alice")
+
+    for cache in caches:
+        assert cache.get("token-alice") is None
+        assert cache.get("token-bob") is not None
+
+
+def test_invalidations_expire_after_the_cached_tokens(firestore_client):
+    repository = TokenInvalidationRepository(firestore_client, retention=300)
+
+    repository.publish("alice")
+
+    entry = firestore_client.db.collection(TokenInvalidationRepository.TOKEN_INVALIDATIONS_COLLECTION).document("alice").get()
+    expires_in = (entry.get(TokenInvalidationRepository.EXPIRES_AT) - datetime.now(timezone.utc)).total_seconds()
+    assert 290 < expires_in <= 300